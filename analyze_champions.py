@@ -7,10 +7,17 @@ import pandas as pd
 import json
 from datetime import datetime
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from fighter_ids import UNRESOLVED, FighterIdIndex
+from ufc_data import UFCData
 
 def load_data():
     """Load all relevant UFC data files."""
     data = {}
+    ufc_data = UFCData('data')
     
     # Load large dataset with fight details
     if os.path.exists('data/large_dataset.csv'):
@@ -19,21 +26,21 @@ def load_data():
         print(f"Loaded {len(data['fights'])} fights from large dataset")
     
     # Load medium dataset as backup
-    if os.path.exists('data/medium_dataset.csv'):
+    if ufc_data.exists('medium_dataset'):
         print("Loading medium dataset...")
-        data['medium_fights'] = pd.read_csv('data/medium_dataset.csv')
+        data['medium_fights'] = ufc_data.medium_dataset
         print(f"Loaded {len(data['medium_fights'])} fights from medium dataset")
     
     # Load fighter info
-    if os.path.exists('data/fighters.csv'):
+    if ufc_data.exists('fighters'):
         print("Loading fighters data...")
-        data['fighters'] = pd.read_csv('data/fighters.csv')
+        data['fighters'] = ufc_data.fighters
         print(f"Loaded {len(data['fighters'])} fighters")
     
     # Load events
-    if os.path.exists('data/events.csv'):
+    if ufc_data.exists('events'):
         print("Loading events data...")
-        data['events'] = pd.read_csv('data/events.csv')
+        data['events'] = ufc_data.events
         print(f"Loaded {len(data['events'])} events")
     
     # Load existing champions records
@@ -44,6 +51,26 @@ def load_data():
     
     return data
 
+def with_fight_columns(fights_df):
+    """Add the event_name/winner columns the analysis reads, for datasets that name them differently.
+
+    medium_dataset.csv lists the winner in the red corner and gives the
+    result in ``status`` ('win', 'draw' or 'Fight was not properly finished').
+    """
+    columns = {}
+    if 'event_name' not in fights_df.columns and 'event' in fights_df.columns:
+        columns['event_name'] = fights_df['event'].astype(str)
+    if 'winner' not in fights_df.columns and 'status' in fights_df.columns:
+        status = fights_df['status'].astype(object)
+        columns['winner'] = status.map({'win': 'Red', 'draw': 'Draw'}).where(status.notna()).fillna('No Contest')
+    return fights_df.assign(**columns)
+
+def chronological(fights_df):
+    """Fights oldest first: by date when the dataset has one, else (approximately) by event name."""
+    if 'date' in fights_df.columns:
+        return fights_df.sort_values(['date', 'event_name'], kind='stable')
+    return fights_df.sort_values(['event_name'], kind='stable')
+
 def identify_title_fights(fights_df):
     """Identify title fights from the dataset."""
     title_fights = []
@@ -72,7 +99,32 @@ def parse_fight_date(fight_row):
         return None
     return None
 
-def find_champion_losses(fights_df):
+def attach_fighter_codes(fights_df, fighter_index):
+    """Add r_code/b_code columns holding each corner's resolved fighter (-1 if unresolved)."""
+    return fights_df.assign(
+        r_code=fighter_index.codes(fights_df['r_fighter']),
+        b_code=fighter_index.codes(fights_df['b_fighter'])
+    )
+
+def fighter_fights(fights_df, name, fighter_index=None):
+    """Return (fights, is_red, is_blue) for the fights of ``name``.
+    
+    Resolved fighters are matched on their integer code; names that do not
+    resolve fall back to a case-insensitive substring match.
+    """
+    code = UNRESOLVED
+    if fighter_index is not None and 'r_code' in fights_df.columns:
+        code = fighter_index.code(name)
+    if code != UNRESOLVED:
+        is_red = fights_df['r_code'] == code
+        is_blue = fights_df['b_code'] == code
+    else:
+        is_red = fights_df['r_fighter'].str.contains(name, case=False, na=False)
+        is_blue = fights_df['b_fighter'].str.contains(name, case=False, na=False)
+    mask = is_red | is_blue
+    return fights_df[mask].copy(), is_red[mask], is_blue[mask]
+
+def find_champion_losses(fights_df, fighter_index=None):
     """Find fights where champions lost their titles."""
     champion_losses = []
     
@@ -95,18 +147,15 @@ def find_champion_losses(fights_df):
     
     for champion in known_champions:
         # Find fights where this champion fought
-        champion_fights = fights_df[
-            (fights_df['r_fighter'].str.contains(champion, case=False, na=False)) |
-            (fights_df['b_fighter'].str.contains(champion, case=False, na=False))
-        ].copy()
+        champion_fights, red_corner, blue_corner = fighter_fights(fights_df, champion, fighter_index)
         
         # Sort by date/event order
-        champion_fights = champion_fights.sort_values(['event_name'])
+        champion_fights = chronological(champion_fights)
         
         # Look for losses that could be title losses
         for idx, fight in champion_fights.iterrows():
-            is_red = champion.lower() in str(fight['r_fighter']).lower()
-            is_blue = champion.lower() in str(fight['b_fighter']).lower()
+            is_red = red_corner[idx]
+            is_blue = blue_corner[idx]
             
             if is_red and fight['winner'] == 'Blue':
                 champion_losses.append({
@@ -129,38 +178,35 @@ def find_champion_losses(fights_df):
     
     return champion_losses
 
-def calculate_post_title_loss_record(champion_name, title_loss_event, fights_df):
+def calculate_post_title_loss_record(champion_name, title_loss_event, fights_df, fighter_index=None):
     """Calculate a champion's record after losing their title."""
     
     # Find all fights for this champion
-    champion_fights = fights_df[
-        (fights_df['r_fighter'].str.contains(champion_name, case=False, na=False)) |
-        (fights_df['b_fighter'].str.contains(champion_name, case=False, na=False))
-    ].copy()
-    
-    # Sort fights chronologically (this is approximate based on event names)
-    champion_fights = champion_fights.sort_values(['event_name'])
-    
-    # Find the title loss fight index
-    title_loss_idx = None
-    for idx, fight in champion_fights.iterrows():
-        if title_loss_event.lower() in fight['event_name'].lower():
-            title_loss_idx = idx
+    champion_fights, red_corner, blue_corner = fighter_fights(fights_df, champion_name, fighter_index)
+    
+    # Sort fights chronologically (approximate, by event name, when there are no dates)
+    champion_fights = chronological(champion_fights)
+    
+    # Find the title loss fight's position
+    title_loss_position = None
+    for position, event_name in enumerate(champion_fights['event_name']):
+        if title_loss_event.lower() in event_name.lower():
+            title_loss_position = position
             break
     
-    if title_loss_idx is None:
+    if title_loss_position is None:
         return None
     
     # Get fights after the title loss
-    post_loss_fights = champion_fights[champion_fights.index > title_loss_idx]
+    post_loss_fights = champion_fights.iloc[title_loss_position + 1:]
     
     wins = 0
     losses = 0
     draws = 0
     
     for idx, fight in post_loss_fights.iterrows():
-        is_red = champion_name.lower() in str(fight['r_fighter']).lower()
-        is_blue = champion_name.lower() in str(fight['b_fighter']).lower()
+        is_red = red_corner[idx]
+        is_blue = blue_corner[idx]
         
         if is_red:
             if fight['winner'] == 'Red':
@@ -185,7 +231,7 @@ def calculate_post_title_loss_record(champion_name, title_loss_event, fights_df)
         'record_string': f"{wins}-{losses}" + (f"-{draws}" if draws > 0 else "")
     }
 
-def analyze_known_champions(fights_df):
+def analyze_known_champions(fights_df, fighter_index=None):
     """Analyze known former champions and their post-title loss records."""
     
     # Known title loss events for major champions
@@ -211,7 +257,7 @@ def analyze_known_champions(fights_df):
     results = []
     
     for champion, title_loss_event in known_title_losses.items():
-        record = calculate_post_title_loss_record(champion, title_loss_event, fights_df)
+        record = calculate_post_title_loss_record(champion, title_loss_event, fights_df, fighter_index)
         if record:
             results.append({
                 'name': champion,
@@ -238,6 +284,16 @@ def main():
         print("No fight data found!")
         return
     
+    fights_df = with_fight_columns(fights_df)
+    
+    # Resolve both corners to fighters.csv rows once, so per-champion lookups are integer matches
+    fighter_index = None
+    if 'fighters' in data:
+        fighter_index = FighterIdIndex(data['fighters'])
+        fights_df = attach_fighter_codes(fights_df, fighter_index)
+        resolved = int(((fights_df['r_code'] != UNRESOLVED) & (fights_df['b_code'] != UNRESOLVED)).sum())
+        print(f"Resolved both fighters of {resolved} of {len(fights_df)} fights to fighters.csv")
+    
     print(f"\nAnalyzing {len(fights_df)} fights...")
     
     # Identify title fights
@@ -245,12 +301,12 @@ def main():
     print(f"Found {len(title_fights)} potential title fights")
     
     # Find champion losses
-    champion_losses = find_champion_losses(fights_df)
+    champion_losses = find_champion_losses(fights_df, fighter_index)
     print(f"Found {len(champion_losses)} potential champion losses")
     
     # Analyze known champions
     print("\n=== Former Champions' Records After Losing Title ===")
-    champion_records = analyze_known_champions(fights_df)
+    champion_records = analyze_known_champions(fights_df, fighter_index)
     
     # Save results
     output = {
@@ -0,0 +1,299 @@
+"""
+Precomputed fight and event aggregates.
+
+``FightOutcomeCube`` counts fights per (method, round, weight class, year)
+cell once per dataset version; any distribution or filtered slice of it is
+then a reduction over a few thousand cells instead of a pass over the raw
+fights frame. Both the cube and the event count aggregates can be extended
+with appended rows without recounting the full history.
+
+``FighterCube`` does the same for the fighters: record and metric sums per
+(country, weight class, weight band, sex, age band, activity) cell, from
+one groupby. Rolling it up to any subset of those dimensions, or drilling
+down by adding one, only touches the cells.
+"""
+
+import numpy as np
+import pandas as pd
+
+FIGHT_DIMENSIONS = ('method', 'round', 'weight_class', 'year')
+
+FIGHTER_DIMENSIONS = ('country', 'weight_class', 'weight_band', 'sex', 'age_band', 'activity')
+# Per-cell sums: fighters.csv rows and their wins/fights; the fighters in the
+# metrics table ("rated"), their win and finish rates, and those with a known age
+FIGHTER_MEASURES = ('fighters', 'wins', 'fights', 'rated', 'win_rate', 'finish_rate', 'aged', 'age')
+# Age (years) bands, both ends inclusive
+AGE_BANDS = {'20-25': (20, 25), '26-30': (26, 30), '31-35': (31, 35), '36+': (36, np.inf)}
+# Weight (lbs) bands, above the low end up to the high end, named after the division they roughly cover
+WEIGHT_BANDS = {
+    'Flyweight': (0, 130),
+    'Bantamweight': (130, 140),
+    'Featherweight': (140, 150),
+    'Lightweight': (150, 160),
+    'Welterweight': (160, 180),
+    'Middleweight': (180, 200),
+    'Light Heavyweight': (200, 220),
+    'Heavyweight': (220, 300),
+}
+# Career fights (wins + losses + draws), both ends inclusive
+ACTIVITY_BANDS = {'no_fights': (0, 0), 'novice': (1, 2), 'regular': (3, 9), 'veteran': (10, np.inf)}
+
+
+def _by_count(counts):
+    """``counts`` sorted by count (descending), ties by value, so merged and rebuilt counts agree."""
+    return counts.sort_index(kind='stable').sort_values(ascending=False, kind='stable')
+
+
+def _value_counts(series):
+    return _by_count(series.value_counts().astype('int64'))
+
+
+def _fight_years(fights_df, events_df):
+    """Calendar year of each fight's event (missing when the event is unknown)."""
+    if 'event_id' not in fights_df.columns or events_df.empty or 'date' not in events_df.columns:
+        return pd.Series(pd.NA, index=fights_df.index, dtype='Int64')
+    event_years = pd.Series(events_df['date'].dt.year.to_numpy(), index=events_df['event_id'].to_numpy())
+    event_years = event_years[~event_years.index.duplicated()]
+    return fights_df['event_id'].map(event_years).astype('Int64')
+
+
+def _band_codes(values, bands, include_low=True):
+    """Index of the band in ``bands`` holding each value (-1 for none or missing)."""
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.full(len(values), -1, dtype=np.int64)
+    for code, (low, high) in enumerate(bands.values()):
+        above = values >= low if include_low else values > low
+        codes[above & (values <= high) & (codes < 0)] = code
+    return codes
+
+
+def _level_codes(values):
+    """Sorted levels of ``values`` (as strings) and each value's code (-1 when missing)."""
+    codes, levels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), tuple(str(level) for level in levels)
+
+
+def _recode(codes, old_levels, new_levels):
+    """Map level codes from ``old_levels`` to ``new_levels``, keeping -1 as missing."""
+    mapping = np.append(new_levels.get_indexer(old_levels), -1)
+    return mapping[codes]
+
+
+class FightOutcomeCube:
+    """Fight counts over method x round x weight class x year.
+
+    Each dimension is factorized into sorted ``levels``; ``keys`` holds one
+    row of level codes per non-empty cell (-1 for a missing value) and
+    ``counts`` the number of fights in that cell. ``unmatched_events`` lists
+    the event ids of fights whose year could not be resolved.
+    """
+
+    def __init__(self, fights_df, events_df):
+        columns = {
+            dimension: fights_df[dimension]
+            for dimension in FIGHT_DIMENSIONS if dimension in fights_df.columns
+        }
+        self.unmatched_events = set()
+        if not fights_df.empty:
+            columns['year'] = _fight_years(fights_df, events_df)
+            if 'event_id' in fights_df.columns:
+                self.unmatched_events = set(fights_df['event_id'][columns['year'].isna()].dropna())
+        self.available = set(columns)
+
+        self.levels = {}
+        codes = []
+        for dimension in FIGHT_DIMENSIONS:
+            values = columns.get(dimension, pd.Series(np.nan, index=fights_df.index))
+            dimension_codes, levels = pd.factorize(values, sort=True)
+            if isinstance(levels, pd.Categorical):
+                levels = np.asarray(levels, dtype=object)
+            elif isinstance(levels.dtype, pd.Int64Dtype):
+                levels = levels.astype('int64')
+            self.levels[dimension] = pd.Index(levels)
+            codes.append(dimension_codes.astype(np.int64))
+
+        keys = np.column_stack(codes) if len(fights_df) else np.empty((0, len(FIGHT_DIMENSIONS)), dtype=np.int64)
+        self.keys, self.counts = np.unique(keys, axis=0, return_counts=True)
+
+    def extended(self, fights_df, events_df):
+        """Return a cube that also counts the appended fights in ``fights_df``."""
+        delta = FightOutcomeCube(fights_df, events_df)
+        cube = FightOutcomeCube.__new__(FightOutcomeCube)
+        cube.available = self.available | delta.available
+        cube.unmatched_events = self.unmatched_events | delta.unmatched_events
+        cube.levels = {}
+        keys = []
+        for position, dimension in enumerate(FIGHT_DIMENSIONS):
+            levels = self.levels[dimension].union(delta.levels[dimension])
+            cube.levels[dimension] = levels
+            keys.append(np.concatenate([
+                _recode(self.keys[:, position], self.levels[dimension], levels),
+                _recode(delta.keys[:, position], delta.levels[dimension], levels),
+            ]))
+        cube.keys, inverse = np.unique(np.column_stack(keys), axis=0, return_inverse=True)
+        cube.counts = np.bincount(inverse.ravel(), weights=np.concatenate([self.counts, delta.counts]),
+                                  minlength=len(cube.keys)).astype(np.int64)
+        return cube
+
+    def _mask(self, filters):
+        mask = np.ones(len(self.keys), dtype=bool)
+        for dimension, value in filters.items():
+            if value is None:
+                continue
+            code = self.levels[dimension].get_indexer([value])[0]
+            if code < 0:
+                # Unknown value: nothing matches (and -1 must not select missing cells)
+                return np.zeros(len(self.keys), dtype=bool)
+            mask &= self.keys[:, FIGHT_DIMENSIONS.index(dimension)] == code
+        return mask
+
+    def total(self, **filters):
+        """Number of fights matching ``filters`` (dimension=value, None to skip)."""
+        return int(self.counts[self._mask(filters)].sum())
+
+    def distribution(self, dimension, **filters):
+        """Fights per value of ``dimension`` among those matching ``filters``.
+
+        Sorted by count (descending), ties in value order; missing values and
+        empty cells are left out, like ``Series.value_counts``.
+        """
+        mask = self._mask(filters)
+        codes = self.keys[mask, FIGHT_DIMENSIONS.index(dimension)]
+        counts = self.counts[mask]
+        present = codes >= 0
+        totals = np.bincount(codes[present], weights=counts[present], minlength=len(self.levels[dimension]))
+        series = pd.Series(totals.astype(np.int64), index=self.levels[dimension], name='count')
+        series = series[series > 0]
+        return series.sort_values(ascending=False, kind='stable')
+
+
+class FighterCube:
+    """Fighter record and metric sums over FIGHTER_DIMENSIONS.
+
+    ``levels`` holds each dimension's values; ``keys`` has one row of level
+    codes per non-empty cell (-1 for a missing value) and ``measures`` the
+    FIGHTER_MEASURES sums of that cell. Metrics (rates, age) come from the
+    fighter metrics table, matched on fighter_id.
+    """
+
+    def __init__(self, fighters_df, metrics_df):
+        fighters = fighters_df if 'fighter_id' in fighters_df.columns else pd.DataFrame({'fighter_id': []})
+        metrics = metrics_df.drop_duplicates('fighter_id').set_index('fighter_id') if len(metrics_df) else None
+
+        def column(df, name):
+            if df is None or name not in df.columns:
+                return pd.Series(np.nan, index=fighters.index)
+            if df is metrics:
+                return metrics[name].reindex(fighters['fighter_id']).set_axis(fighters.index)
+            return df[name]
+
+        self.levels = {}
+        codes = {}
+        for dimension, source in (('country', 'country'), ('weight_class', 'class_weight'), ('sex', 'sex')):
+            codes[dimension], self.levels[dimension] = _level_codes(column(fighters, source))
+        totals = (column(fighters, 'wins') + column(fighters, 'losses') + column(fighters, 'draws')).fillna(0)
+        age = column(metrics, 'age').to_numpy(dtype=np.float64)
+        for dimension, bands, values, include_low in (
+                ('weight_band', WEIGHT_BANDS, column(fighters, 'weight (lbs)'), False),
+                ('age_band', AGE_BANDS, age, True),
+                ('activity', ACTIVITY_BANDS, totals, True)):
+            codes[dimension] = _band_codes(values, bands, include_low)
+            self.levels[dimension] = tuple(bands)
+
+        rated = column(metrics, 'win_rate').notna().to_numpy()
+        aged = rated & (age != 0) & ~np.isnan(age)
+        measures = {
+            'fighters': np.ones(len(fighters)),
+            'wins': column(fighters, 'wins').fillna(0).to_numpy(dtype=np.float64),
+            'fights': totals.to_numpy(dtype=np.float64),
+            'rated': rated.astype(np.float64),
+            'win_rate': column(metrics, 'win_rate').fillna(0).to_numpy(dtype=np.float64),
+            'finish_rate': column(metrics, 'finish_rate').fillna(0).to_numpy(dtype=np.float64),
+            'aged': aged.astype(np.float64),
+            'age': np.where(aged, age, 0.0),
+        }
+
+        cells = pd.DataFrame({**codes, **measures}).groupby(list(FIGHTER_DIMENSIONS), sort=True).sum()
+        self.keys = (cells.index.to_frame().to_numpy(dtype=np.int64) if len(cells)
+                     else np.empty((0, len(FIGHTER_DIMENSIONS)), dtype=np.int64))
+        self.measures = {measure: cells[measure].to_numpy(dtype=np.float64) for measure in FIGHTER_MEASURES}
+        self.codes = {dimension: {level: code for code, level in enumerate(levels)}
+                      for dimension, levels in self.levels.items()}
+
+    def _mask(self, filters):
+        """Cells matching ``filters`` (dimension -> a value or a list of values, None to skip)."""
+        mask = np.ones(len(self.keys), dtype=bool)
+        for dimension, values in filters.items():
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            # Unknown values match nothing (and never select missing cells)
+            codes = [self.codes[dimension].get(value, -2) for value in values]
+            mask &= np.isin(self.keys[:, FIGHTER_DIMENSIONS.index(dimension)], codes)
+        return mask
+
+    def rollup(self, by=(), **filters):
+        """Aggregate the cells matching ``filters`` to the dimensions in ``by``.
+
+        One record per non-empty combination, in level order (missing values,
+        as None, first), with the summed counts and the averages derived from
+        them: ``record_win_rate`` (total wins over total fights) and the
+        mean ``avg_win_rate``, ``avg_finish_rate`` and ``avg_age`` of the
+        rated fighters, rounded to one decimal (None without fighters).
+        """
+        mask = self._mask(filters)
+        keys = self.keys[mask][:, [FIGHTER_DIMENSIONS.index(dimension) for dimension in by]]
+        if by:
+            groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+            inverse = inverse.ravel()
+        else:
+            groups = np.empty((1 if mask.any() else 0, 0), dtype=np.int64)
+            inverse = np.zeros(len(keys), dtype=np.int64)
+        sums = {measure: np.bincount(inverse, weights=self.measures[measure][mask], minlength=len(groups))
+                for measure in FIGHTER_MEASURES}
+
+        def ratio(numerator, denominator, scale=1):
+            return round((numerator / denominator) * scale, 1) if denominator > 0 else None
+
+        records = []
+        for group, codes in enumerate(groups.tolist()):
+            wins, fights, rated, aged = (sums[measure][group] for measure in ('wins', 'fights', 'rated', 'aged'))
+            record = {dimension: self.levels[dimension][code] if code >= 0 else None
+                      for dimension, code in zip(by, codes)}
+            record.update({
+                'fighters': int(sums['fighters'][group]),
+                'wins': int(wins),
+                'fights': int(fights),
+                'rated_fighters': int(rated),
+                'record_win_rate': ratio(wins, fights, 100),
+                'avg_win_rate': ratio(sums['win_rate'][group], rated),
+                'avg_finish_rate': ratio(sums['finish_rate'][group], rated),
+                'avg_age': ratio(sums['age'][group], aged),
+            })
+            records.append(record)
+        return records
+
+
+def event_counts(events_df):
+    """Counts of events per calendar year and per location (last part of the address)."""
+    if events_df.empty or 'date' not in events_df.columns:
+        return {'year': pd.Series(dtype='int64')}
+    counts = {'year': events_df.groupby(events_df['date'].dt.year).size().astype('int64')}
+    if 'location' in events_df.columns:
+        counts['location'] = _value_counts(events_df['location'].str.extract(r'([^,]+)$')[0])
+    return counts
+
+
+def add_counts(previous, delta):
+    """Combine two count aggregates, keeping each Series sorted by count (ties by value)."""
+    combined = {}
+    for key in previous.keys() | delta.keys():
+        if key not in delta:
+            combined[key] = previous[key]
+        elif key not in previous:
+            combined[key] = delta[key]
+        else:
+            counts = previous[key].add(delta[key], fill_value=0).astype('int64')
+            combined[key] = _by_count(counts)
+    return combined
@@ -1,243 +1,303 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, has_request_context, jsonify, request, send_from_directory
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
 import json
+import hmac
+
+from fighter_metrics import add_fight_appearances, build_fighter_metrics
+from fighter_store import FighterStore
+from leaderboards import DIMENSIONS as LEADERBOARD_DIMENSIONS, Leaderboards
+from lineage import ChampionshipLineage
+from aggregates import FIGHTER_DIMENSIONS, FightOutcomeCube, FighterCube, add_counts, event_counts
+from dataset import DatasetManager
+from search import FighterSearchIndex
+from fighter_ids import FighterIdIndex
+from fighter_graph import MAX_HOPS, FighterGraph
+from ratings import EloRatings
+from predictions import INPUT_COLUMNS as UPCOMING_COLUMNS, load_outcome_model, predict_card
+from response_cache import ResponseCache
+from instrumentation import Instrumentation
+from asgi import ThreadPoolASGI, serve
+from json_provider import FastJSONProvider, frame_records, series_dict
+from pagination import PageRequestError, paginate, parse_page_request, project, ndjson_response
 
 app = Flask(__name__, static_folder='static', static_url_path='')
+# orjson-backed serialization that encodes numpy/pandas values directly
+app.json = FastJSONProvider(app)
 CORS(app)
 
-# Load the comprehensive datasets
-try:
-    # Try different paths for data files
-    data_paths = ['data/', '../data/']
-    data_loaded = False
-    
-    for data_path in data_paths:
-        try:
-            events_df = pd.read_csv(f'{data_path}events.csv')
-            fighters_df = pd.read_csv(f'{data_path}fighters.csv')
-            fights_df = pd.read_csv(f'{data_path}fights.csv')
-            ufc_master_df = pd.read_csv(f'{data_path}ufc-master.csv')
-            
-            with open(f'{data_path}champions_records.json', 'r') as f:
-                corrected_champions = json.load(f)
-            
-            data_loaded = True
-            print(f"Loaded data from {data_path}")
-            break
-        except FileNotFoundError:
-            continue
-    
-    if not data_loaded:
-        raise FileNotFoundError("Could not find data files in any expected location")
-    
-    # Convert dates only if data was loaded successfully
-    if not events_df.empty:
-        events_df['date'] = pd.to_datetime(events_df['date'])
-    if not fighters_df.empty and 'birthdate' in fighters_df.columns:
-        fighters_df['birthdate'] = pd.to_datetime(fighters_df['birthdate'], errors='coerce')
-    
-    print(f"Loaded {len(events_df)} events, {len(fighters_df)} fighters, {len(fights_df)} fights")
-    print(f"Loaded {len(ufc_master_df)} historical fights for championship analysis")
-    print(f"Loaded {len(corrected_champions)} corrected former champions records")
-    
-except Exception as e:
-    print(f"Error loading data: {e}")
-    # Create empty DataFrames as fallback
-    events_df = pd.DataFrame()
-    fighters_df = pd.DataFrame()
-    fights_df = pd.DataFrame()
-    ufc_master_df = pd.DataFrame()
-    corrected_champions = []
-
-# Calculate fighter ages
-current_date = datetime.now()
-if not fighters_df.empty and 'birthdate' in fighters_df.columns:
-    fighters_df['age'] = fighters_df['birthdate'].apply(
-        lambda x: (current_date - x).days // 365 if pd.notna(x) else None
-    )
+# The dataset (tables plus everything derived from them) is owned by the
+# manager and replaced atomically when data/ changes; see current_dataset()
+dataset_manager = DatasetManager(['data/', '../data/'])
+
+MAX_SEARCH_LIMIT = 50
+
+def current_dataset():
+    """Return the dataset for this request, pinned on first use so it stays consistent"""
+    if not has_request_context():
+        return dataset_manager.current
+    if 'dataset' not in g:
+        g.dataset = dataset_manager.current
+    return g.dataset
+
+def list_response(key, items, build_payload, default_limit=None):
+    """Respond with build_payload() plus a page of ``items`` under ``key``.
+
+    Honours ?offset=, ?limit=, ?cursor= and ?fields= (see pagination.py); with
+    ?format=ndjson only the items are streamed and the payload is never built.
+    Without paging arguments the first ``default_limit`` items are returned.
+    """
+    ds = current_dataset()
+    page_request = parse_page_request(ds.version)
+    page, pagination = paginate(items, page_request, ds.version, default_limit)
+    if page_request.ndjson:
+        return ndjson_response(page, pagination, page_request.fields)
+    
+    payload = build_payload()
+    payload[key] = project(page, page_request.fields)
+    if page_request.paged:
+        payload['pagination'] = pagination
+    return jsonify(payload)
+
+def is_admin_request():
+    """True if the request carries the configured ADMIN_TOKEN in X-Admin-Token"""
+    token = os.environ.get('ADMIN_TOKEN')
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token)
+
+# Route/helper timing histograms (served on /api/metrics), Server-Timing headers,
+# and ?profile=1 stack sampling for admin requests
+instrumentation = Instrumentation(authorize_profiling=is_admin_request)
+instrumentation.init_app(app)
+
+# Analytics responses only change with the data, so they are cached per dataset version
+# (profiled requests bypass the cache so the handler actually runs)
+response_cache = ResponseCache(lambda: current_dataset().version, lambda: current_dataset().last_modified,
+                               bypass=instrumentation.profiling_requested)
+instrumentation.register_counter('ufc_response_cache_hits_total', 'Responses served from the response cache.',
+                                 lambda: response_cache.hits)
+instrumentation.register_counter('ufc_response_cache_misses_total', 'Responses rendered and stored in the cache.',
+                                 lambda: response_cache.misses)
+
+# Derived data, computed once per dataset version before it is swapped in.
+# Values declare the tables they read; when new rows are only appended to
+# those tables (e.g. after a fight night) the update functions advance the
+# previous version's value from the new rows instead of rebuilding it.
+def update_fighter_metrics(table, ds, delta):
+    if 'fighters' in delta:
+        return derive_fighter_metrics(ds)
+    return add_fight_appearances(table, delta['fights'])
+
+@dataset_manager.derive('fighter_metrics_df', tables=['fighters', 'fights'], update=update_fighter_metrics)
+def derive_fighter_metrics(ds):
+    return build_fighter_metrics(ds.fighters_df, ds.fights_df, now=ds.loaded_at)
+
+@dataset_manager.derive('fighter_store', tables=['fighters', 'fights'])
+def derive_fighter_store(ds):
+    return FighterStore(ds.fighter_metrics_df)
+
+@dataset_manager.derive('leaderboards', tables=['fighters', 'fights'])
+def derive_leaderboards(ds):
+    weight_classes = None
+    if 'class_weight' in ds.fighters_df.columns:
+        by_id = ds.fighters_df.drop_duplicates('fighter_id').set_index('fighter_id')['class_weight']
+        weight_classes = by_id.reindex(ds.fighter_store.column('fighter_id')).to_numpy(dtype=object)
+    return Leaderboards(ds.fighter_store, weight_classes)
+
+@dataset_manager.derive('fighter_cube', tables=['fighters', 'fights'])
+def derive_fighter_cube(ds):
+    return FighterCube(ds.fighters_df, ds.fighter_metrics_df)
+
+@dataset_manager.derive('fighter_search_index', tables=['fighters'])
+def derive_fighter_search_index(ds):
+    return FighterSearchIndex(ds.fighters_df)
+
+@dataset_manager.derive('fighter_ids', tables=['fighters'])
+def derive_fighter_ids(ds):
+    return FighterIdIndex(ds.fighters_df)
+
+@dataset_manager.derive('fighter_graph', tables=['fighters', 'fights', 'events', 'ufc_master'])
+def derive_fighter_graph(ds):
+    return FighterGraph(ds.fighter_ids, ds.fights_df, ds.events_df, ds.ufc_master_df)
+
+@dataset_manager.derive('championship_lineage', tables=['ufc_master'],
+                        update=lambda lineage, ds, delta: lineage.extended(delta['ufc_master']))
+def derive_championship_lineage(ds):
+    return ChampionshipLineage(ds.ufc_master_df)
+
+@dataset_manager.derive('history_names', tables=['fighters', 'ufc_master'])
+def derive_history_names(ds):
+    """fighter_id -> every name the fighter appears under in ufc-master.csv (the fight history's keys)"""
+    fighters = ds.championship_lineage.fight_index.fighters
+    names = {}
+    for fighter_id, name in zip(ds.fighter_ids.ids(ds.fighter_ids.codes(fighters)), fighters):
+        if fighter_id is not None:
+            names.setdefault(fighter_id, []).append(name)
+    return names
+
+def update_fight_outcome_cube(cube, ds, delta):
+    # New events can give a year to fights that were counted without one
+    if 'events' in delta and cube.unmatched_events & set(delta['events']['event_id']):
+        return derive_fight_outcome_cube(ds)
+    if 'fights' not in delta:
+        return cube
+    return cube.extended(delta['fights'], ds.events_df)
+
+@dataset_manager.derive('fight_outcome_cube', tables=['fights', 'events'], update=update_fight_outcome_cube)
+def derive_fight_outcome_cube(ds):
+    return FightOutcomeCube(ds.fights_df, ds.events_df)
+
+def update_ratings(ratings, ds, delta):
+    # New events can date fights that were left unrated; back-dated fights change the replay order
+    if 'events' in delta and ratings.unmatched_events & set(delta['events']['event_id']):
+        return derive_ratings(ds)
+    if 'fights' not in delta:
+        return ratings
+    extended = ratings.extended(delta['fights'], ds.events_df)
+    return extended if extended is not None else derive_ratings(ds)
+
+@dataset_manager.derive('ratings', tables=['fights', 'events'], update=update_ratings)
+def derive_ratings(ds):
+    return EloRatings(ds.fights_df, ds.events_df)
 
-def calculate_fighter_age(birthdate):
-    """Calculate fighter age"""
-    if pd.isna(birthdate):
+@dataset_manager.derive('outcome_model', tables=[])
+def derive_outcome_model(ds):
+    try:
+        return load_outcome_model(ds.data_path)
+    except ValueError as e:
+        print(f"Ignoring outcome model: {e}")
         return None
-    return (datetime.now() - birthdate).days // 365
 
-def get_fighter_performance_metrics():
-    """Calculate comprehensive fighter performance metrics"""
-    if fighters_df.empty or fights_df.empty:
+@dataset_manager.derive('upcoming_predictions', tables=[])
+def derive_upcoming_predictions(ds):
+    """The whole upcoming card scored in one batch (empty without a model or a usable card)"""
+    if ds.outcome_model is None or not set(UPCOMING_COLUMNS) <= set(ds.upcoming_df.columns):
         return []
-    
-    # Check if required columns exist
-    required_cols = ['fighter_id', 'name', 'wins', 'losses', 'draws', 'country', 'weight (lbs)', 'height (cm)']
-    available_cols = ['fighter_id', 'name'] + [col for col in required_cols[2:] if col in fighters_df.columns]
-    
-    # Merge fights with fighter data
-    fights_with_winners = fights_df.merge(
-        fighters_df[available_cols],
-        left_on='winner', right_on='fighter_id', how='left'
-    )
-    
-    # Calculate win rates and performance metrics
-    fighter_stats = []
-    
-    for _, fighter in fighters_df.iterrows():
-        total_fights = fighter['wins'] + fighter['losses'] + fighter['draws']
-        if total_fights > 0:
-            win_rate = (fighter['wins'] / total_fights) * 100
-            
-            # Get fights for this fighter
-            fighter_fights = fights_df[
-                (fights_df['left_fighter_id'] == fighter['fighter_id']) |
-                (fights_df['right_fighter_id'] == fighter['fighter_id'])
-            ]
-            
-            # Calculate finish rate
-            ko_tko_rate = ((fighter['wins_by_ko_tko'] or 0) / fighter['wins']) * 100 if fighter['wins'] > 0 else 0
-            sub_rate = ((fighter['wins_by_submission'] or 0) / fighter['wins']) * 100 if fighter['wins'] > 0 else 0
-            finish_rate = ko_tko_rate + sub_rate
-            
-            # Age calculation
-            age = calculate_fighter_age(fighter['birthdate']) if pd.notna(fighter['birthdate']) else None
-            
-            # Performance category
-            if win_rate >= 80 and total_fights >= 10:
-                category = "Elite"
-            elif win_rate >= 70 and total_fights >= 8:
-                category = "High-Level"
-            elif win_rate >= 60 and total_fights >= 5:
-                category = "Solid"
-            elif win_rate >= 50:
-                category = "Developing"
-            else:
-                category = "Struggling"
-            
-            fighter_stats.append({
-                'fighter_id': fighter['fighter_id'],
-                'name': fighter['name'],
-                'wins': int(fighter['wins']) if pd.notna(fighter['wins']) else 0,
-                'losses': int(fighter['losses']) if pd.notna(fighter['losses']) else 0,
-                'draws': int(fighter['draws']) if pd.notna(fighter['draws']) else 0,
-                'total_fights': total_fights,
-                'win_rate': round(win_rate, 1),
-                'finish_rate': round(finish_rate, 1),
-                'ko_tko_wins': int(fighter['wins_by_ko_tko']) if pd.notna(fighter['wins_by_ko_tko']) else 0,
-                'submission_wins': int(fighter['wins_by_submission']) if pd.notna(fighter['wins_by_submission']) else 0,
-                'country': fighter['country'],
-                'weight_lbs': fighter['weight (lbs)'] if pd.notna(fighter['weight (lbs)']) else None,
-                'height_cm': fighter['height (cm)'] if pd.notna(fighter['height (cm)']) else None,
-                'age': age,
-                'category': category,
-                'recent_fights': len(fighter_fights)
-            })
-    
-    return sorted(fighter_stats, key=lambda x: x['win_rate'], reverse=True)
-
-def analyze_fight_outcomes():
-    """Analyze fight outcome patterns and methods"""
-    outcomes = {}
+    return predict_card(ds.outcome_model, ds.upcoming_df)
+
+@dataset_manager.derive('event_counts', tables=['events'],
+                        update=lambda counts, ds, delta: add_counts(counts, event_counts(delta['events'])))
+def derive_event_counts(ds):
+    return event_counts(ds.events_df)
+
+@dataset_manager.derive('recent_events', tables=['events'])
+def derive_recent_events(ds):
+    if ds.events_df.empty:
+        return []
+    recent_events = ds.events_df.sort_values('date', ascending=False)
+    return frame_records(pd.DataFrame({
+        'title': recent_events['title'],
+        'date': recent_events['date'].dt.strftime('%Y-%m-%d'),
+        'location': recent_events['location']
+    }))
+
+@instrumentation.timed
+def get_fighter_performance_metrics():
+    """Return the precomputed fighter performance metrics store (table order is by win rate)"""
+    return current_dataset().fighter_store
+
+@instrumentation.timed
+def analyze_fight_outcomes(**filters):
+    """Analyze fight outcome patterns and methods, optionally for one slice of the fight cube"""
+    cube = current_dataset().fight_outcome_cube
     
     # Count finish methods
-    method_counts = fights_df['method'].value_counts().head(10) if 'method' in fights_df.columns else pd.Series()
+    method_counts = cube.distribution('method', **filters).head(10) if 'method' in cube.available else pd.Series()
     
     # Round analysis
     round_analysis = {}
-    if 'round' in fights_df.columns:
-        round_counts = fights_df['round'].value_counts().sort_index()
+    if 'round' in cube.available:
+        round_counts = cube.distribution('round', **filters).sort_index()
         round_analysis = {
             'most_common_round': int(round_counts.index[0]) if len(round_counts) > 0 else 1,
-            'round_distribution': round_counts.to_dict()
+            'round_distribution': series_dict(round_counts)
         }
     
     # Weight class analysis
     weight_class_fights = {}
-    if 'weight_class' in fights_df.columns:
-        weight_class_fights = fights_df['weight_class'].value_counts().head(10).to_dict()
+    if 'weight_class' in cube.available:
+        weight_class_fights = series_dict(cube.distribution('weight_class', **filters).head(10))
     
     return {
-        'total_fights': len(fights_df),
-        'finish_methods': method_counts.to_dict(),
+        'total_fights': cube.total(**filters),
+        'finish_methods': series_dict(method_counts),
         'round_analysis': round_analysis,
         'weight_class_distribution': weight_class_fights
     }
 
+@instrumentation.timed
 def get_recent_events_analysis():
     """Analyze recent UFC events and trends"""
+    ds = current_dataset()
+    events_df, counts = ds.events_df, ds.event_counts
     if events_df.empty:
         return {}
     
-    # Sort by date and get recent events
-    recent_events = events_df.sort_values('date', ascending=False).head(20)
-    
     # Event frequency analysis
-    events_by_year = events_df.groupby(events_df['date'].dt.year).size().to_dict()
+    events_by_year = series_dict(counts['year'].sort_index())
     
     # Location analysis
-    locations = events_df['location'].str.extract(r'([^,]+)$')[0].value_counts().head(10) if 'location' in events_df.columns else pd.Series()
+    locations = counts['location'].head(10) if 'location' in counts else pd.Series()
     
     return {
         'total_events': len(events_df),
-        'recent_events': [
-            {
-                'title': event['title'],
-                'date': event['date'].strftime('%Y-%m-%d'),
-                'location': event['location']
-            } for _, event in recent_events.iterrows()
-        ],
+        'recent_events': ds.recent_events[:20],
         'events_by_year': events_by_year,
-        'top_locations': locations.to_dict()
+        'top_locations': series_dict(locations)
     }
 
+@instrumentation.timed
 def identify_rising_stars():
     """Identify rising stars and prospects in UFC"""
     fighter_stats = get_fighter_performance_metrics()
+    age = fighter_stats.column('age')
+    win_rate = fighter_stats.column('win_rate')
+    finish_rate = fighter_stats.column('finish_rate')
+    total_fights = fighter_stats.column('total_fights')
     
     # Filter for potential rising stars (young, high win rate, active)
-    rising_stars = [
-        fighter for fighter in fighter_stats
-        if fighter['age'] and fighter['age'] <= 28
-        and fighter['win_rate'] >= 75
-        and fighter['total_fights'] >= 5
-        and fighter['total_fights'] <= 15
-    ]
+    rising_stars = np.flatnonzero(
+        (age != 0) & (age <= 28)
+        & (win_rate >= 75)
+        & (total_fights >= 5)
+        & (total_fights <= 15)
+    )
     
-    return sorted(rising_stars, key=lambda x: (x['win_rate'], x['finish_rate']), reverse=True)[:10]
+    # Highest win rate first, then finish rate (ties keep table order)
+    order = np.lexsort((-finish_rate[rising_stars], -win_rate[rising_stars]))
+    return fighter_stats.rows(rising_stars[order])[:10]
 
+@instrumentation.timed
 def analyze_international_representation():
     """Analyze international representation in UFC"""
-    if fighters_df.empty or 'country' not in fighters_df.columns:
+    if 'country' not in current_dataset().fighters_df.columns:
         return {}
     
-    country_stats = fighters_df['country'].value_counts().head(15)
-    
-    # Calculate average performance by country (for countries with 10+ fighters)
-    country_performance = []
-    for country in country_stats.index:
-        if country_stats[country] >= 10:
-            country_fighters = fighters_df[fighters_df['country'] == country]
-            
-            # Calculate average stats
-            total_fights = country_fighters['wins'] + country_fighters['losses'] + country_fighters['draws']
-            avg_win_rate = (country_fighters['wins'].sum() / total_fights.sum()) * 100 if total_fights.sum() > 0 else 0
-            
-            country_performance.append({
-                'country': country,
-                'fighter_count': int(country_stats[country]),
-                'avg_win_rate': round(avg_win_rate, 1),
-                'total_wins': int(country_fighters['wins'].sum()),
-                'total_fights': int(total_fights.sum())
-            })
+    countries = [country for country in current_dataset().fighter_cube.rollup(['country'])
+                 if country['country'] is not None]
+    country_stats = sorted(countries, key=lambda x: x['fighters'], reverse=True)[:15]
+    
+    # Average performance by country (for countries with 10+ fighters)
+    country_performance = [{
+        'country': country['country'],
+        'fighter_count': country['fighters'],
+        'avg_win_rate': country['record_win_rate'] or 0,
+        'total_wins': country['wins'],
+        'total_fights': country['fights']
+    } for country in country_stats if country['fighters'] >= 10]
     
     return {
-        'country_distribution': country_stats.to_dict(),
+        'country_distribution': {country['country']: country['fighters'] for country in country_stats},
         'country_performance': sorted(country_performance, key=lambda x: x['avg_win_rate'], reverse=True)
     }
 
+@instrumentation.timed
 def get_database_stats():
     """Get basic database statistics"""
+    ds = current_dataset()
+    events_df, fighters_df, fights_df, ufc_master_df = ds.events_df, ds.fighters_df, ds.fights_df, ds.ufc_master_df
     return {
         'total_fighters': len(fighters_df),
         'total_events': len(events_df),
@@ -245,8 +305,10 @@ def get_database_stats():
         'historical_fights': len(ufc_master_df) if not ufc_master_df.empty else 0
     }
 
+@instrumentation.timed
 def get_performance_summary():
     """Get performance summary across all fighters"""
+    fighters_df = current_dataset().fighters_df
     if fighters_df.empty:
         return {}
     
@@ -255,14 +317,16 @@ def get_performance_summary():
     if not all(col in fighters_df.columns for col in required_cols):
         return {}
     
-    # Calculate win rates
-    fighters_df['total_fights'] = fighters_df['wins'] + fighters_df['losses'] + fighters_df['draws']
-    active_fighters = fighters_df[fighters_df['total_fights'] >= 3]
+    # Calculate win rates on a local frame; the shared fighters_df is read-only
+    total_fights = fighters_df['wins'] + fighters_df['losses'] + fighters_df['draws']
+    active = total_fights >= 3
     
-    if active_fighters.empty:
+    if not active.any():
         return {}
     
-    active_fighters['win_rate'] = (active_fighters['wins'] / active_fighters['total_fights'] * 100).round(1)
+    active_fighters = pd.DataFrame({
+        'win_rate': (fighters_df['wins'][active] / total_fights[active] * 100).round(1)
+    })
     
     # Categorize fighters
     categories = {
@@ -279,8 +343,10 @@ def get_performance_summary():
         'total_active_fighters': len(active_fighters)
     }
 
+@instrumentation.timed
 def get_data_coverage():
     """Get data coverage information"""
+    events_df = current_dataset().events_df
     if events_df.empty or 'date' not in events_df.columns:
         return {}
     
@@ -295,95 +361,30 @@ def get_data_coverage():
     }
 
 # Former Champions Analysis Functions (using ufc-master.csv)
-def identify_former_champions():
+def identify_former_champions(ds=None):
     """Identify former champions from the UFC master dataset"""
-    if ufc_master_df.empty:
-        return {}
-    
-    # Filter for title bouts
-    title_bouts = ufc_master_df[ufc_master_df['TitleBout'] == True].copy()
-    
-    if title_bouts.empty:
-        return {}
-    
-    # Convert date column
-    title_bouts['Date'] = pd.to_datetime(title_bouts['Date'])
-    title_bouts = title_bouts.sort_values('Date')
-    
-    # Track championship lineage by weight class
-    champions_by_weight = {}
-    former_champions = {}
-    
-    for _, fight in title_bouts.iterrows():
-        weight_class = fight['WeightClass']
-        red_fighter = fight['RedFighter']
-        blue_fighter = fight['BlueFighter']
-        winner = fight['Winner']
-        
-        # Determine winner name
-        if winner == 'Red':
-            winner_name = red_fighter
-            loser_name = blue_fighter
-        elif winner == 'Blue':
-            winner_name = blue_fighter
-            loser_name = red_fighter
-        else:
-            continue
-        
-        # Check if this is a title change
-        current_champion = champions_by_weight.get(weight_class)
-        
-        if current_champion and current_champion != winner_name:
-            # Previous champion lost their belt
-            if current_champion not in former_champions:
-                former_champions[current_champion] = {
-                    'name': current_champion,
-                    'weight_class': weight_class,
-                    'lost_belt_date': fight['Date'].strftime('%Y-%m-%d'),
-                    'lost_to': winner_name,
-                    'fights_after_loss': []
-                }
-        
-        # Update current champion
-        champions_by_weight[weight_class] = winner_name
-    
-    return former_champions
+    championship_lineage = (ds or current_dataset()).championship_lineage
+    return {
+        name: {
+            'name': name,
+            'weight_class': champion['weight_class'],
+            'lost_belt_date': champion['lost_belt_date'].strftime('%Y-%m-%d'),
+            'lost_to': champion['lost_to'],
+            'fights_after_loss': []
+        }
+        for name, champion in championship_lineage.former_champions.items()
+    }
 
-def calculate_post_belt_records():
-    """Calculate fight records after losing championship belt"""
-    former_champions = identify_former_champions()
-    
-    if not former_champions or ufc_master_df.empty:
-        return []
-    
-    ufc_master_df['Date'] = pd.to_datetime(ufc_master_df['Date'])
-    
-    for champion_name, champion_data in former_champions.items():
-        lost_belt_date = pd.to_datetime(champion_data['lost_belt_date'])
-        
-        # Find all fights after losing the belt
-        post_belt_fights = ufc_master_df[
-            (ufc_master_df['Date'] > lost_belt_date) &
-            ((ufc_master_df['RedFighter'] == champion_name) | 
-             (ufc_master_df['BlueFighter'] == champion_name))
-        ].copy()
-        
-        wins = 0
-        losses = 0
+def build_post_belt_records(ds):
+    """Build fight records after losing championship belt, sorted by win percentage"""
+    former_champions = identify_former_champions(ds)
+    champions_list = []
+    
+    for record in ds.championship_lineage.post_reign_records:
+        wins = record['wins_after_belt']
+        losses = record['losses_after_belt']
+        champion_data = former_champions[record['name']]
         
-        for _, fight in post_belt_fights.iterrows():
-            if fight['RedFighter'] == champion_name:
-                if fight['Winner'] == 'Red':
-                    wins += 1
-                elif fight['Winner'] == 'Blue':
-                    losses += 1
-            elif fight['BlueFighter'] == champion_name:
-                if fight['Winner'] == 'Blue':
-                    wins += 1
-                elif fight['Winner'] == 'Red':
-                    losses += 1
-        
-        # Update champion data
         champion_data['wins_after_belt_loss'] = wins
         champion_data['losses_after_belt_loss'] = losses
         champion_data['total_fights_after_belt_loss'] = wins + losses
@@ -393,13 +394,85 @@ def calculate_post_belt_records():
             champion_data['win_percentage_after_belt_loss'] = round((wins / (wins + losses)) * 100, 1)
         else:
             champion_data['win_percentage_after_belt_loss'] = 0
+        
+        champions_list.append(champion_data)
+    
+    return sorted(champions_list, key=lambda x: x['win_percentage_after_belt_loss'], reverse=True)
+
+dataset_manager.derive('post_belt_records', tables=['ufc_master'])(build_post_belt_records)
+
+@instrumentation.timed
+def calculate_post_belt_records():
+    """Return the precomputed fight records after losing championship belt"""
+    return current_dataset().post_belt_records
+
+# The corrected champions records only change on a full reload, never with appended rows
+@dataset_manager.derive('former_champions_analysis', tables=[])
+def build_former_champions_analysis(ds):
+    """Former champions from the corrected records, with their summary statistics"""
+    # Use the corrected champions data instead of calculating dynamically
+    champions = []
+    
+    for champion in ds.corrected_champions:
+        # Parse the record string (e.g., "5-4" -> wins=5, losses=4)
+        record_parts = champion['record_after_belt'].split('-')
+        wins = int(record_parts[0])
+        losses = int(record_parts[1])
+        total_fights = wins + losses
+        
+        champions.append({
+            'name': champion['name'],
+            'record_after_belt_loss': champion['record_after_belt'],
+            'wins_after_belt_loss': wins,
+            'losses_after_belt_loss': losses,
+            'total_fights_after_belt_loss': total_fights,
+            'win_percentage_after_belt_loss': champion['win_percentage'],
+            'weight_class': champion.get('weight_class', 'Unknown'),
+            'lost_to': champion.get('lost_to', 'Unknown'),
+            'lost_belt_date': champion.get('title_loss_details', '').split(' at ')[-1].split(' (')[-1].replace(')', '') if 'at' in champion.get('title_loss_details', '') else 'Unknown'
+        })
     
-    # Convert to list and sort by win percentage
-    champions_list = list(former_champions.values())
-    champions_list = sorted(champions_list, key=lambda x: x['win_percentage_after_belt_loss'], reverse=True)
+    # Calculate summary from corrected data
+    total_champions = len(champions)
+    total_wins = sum(c['wins_after_belt_loss'] for c in champions)
+    total_losses = sum(c['losses_after_belt_loss'] for c in champions)
+    total_fights = sum(c['total_fights_after_belt_loss'] for c in champions)
+    
+    overall_win_percentage = round((total_wins / total_fights) * 100, 1) if total_fights > 0 else 0
+    
+    # Performance breakdown
+    elite_performers = [c for c in champions if c['win_percentage_after_belt_loss'] >= 70]
+    good_performers = [c for c in champions if 50 <= c['win_percentage_after_belt_loss'] < 70]
+    struggling_performers = [c for c in champions if c['win_percentage_after_belt_loss'] < 50]
+    
+    summary = {
+        'total_former_champions': total_champions,
+        'total_wins_after_belt_loss': total_wins,
+        'total_losses_after_belt_loss': total_losses,
+        'overall_win_percentage_after_belt_loss': overall_win_percentage,
+        'average_fights_per_former_champion': round(total_fights / total_champions, 1) if total_champions > 0 else 0,
+        'performance_breakdown': {
+            'elite_performers': {
+                'count': len(elite_performers),
+                'percentage': round((len(elite_performers) / total_champions) * 100, 1),
+                'criteria': '70%+ win rate'
+            },
+            'good_performers': {
+                'count': len(good_performers),
+                'percentage': round((len(good_performers) / total_champions) * 100, 1),
+                'criteria': '50-69% win rate'
+            },
+            'struggling_performers': {
+                'count': len(struggling_performers),
+                'percentage': round((len(struggling_performers) / total_champions) * 100, 1),
+                'criteria': '<50% win rate'
+            }
+        }
+    }
     
-    return champions_list
+    return {'former_champions': champions, 'summary': summary}
 
+@instrumentation.timed
 def get_former_champions_summary():
     """Get summary statistics for former champions"""
     champions = calculate_post_belt_records()
@@ -445,23 +518,46 @@ def get_former_champions_summary():
         }
     }
 
+@instrumentation.timed
+def analyze_advanced_metrics(cube, leaderboards):
+    """Age, weight class and performance trend analytics, looked up in the fighter cube"""
+    # Age analysis
+    average_age = cube.rollup()[0]['avg_age'] if len(cube.keys) else None
+    age_performance = {
+        band['age_band']: {'count': band['rated_fighters'], 'avg_win_rate': band['avg_win_rate']}
+        for band in cube.rollup(['age_band']) if band['age_band'] is not None and band['rated_fighters']
+    }
+    
+    # Weight class performance (fighters with 3+ fights)
+    weight_performance = {
+        band['weight_band']: {
+            'fighter_count': band['rated_fighters'],
+            'avg_win_rate': band['avg_win_rate'],
+            'avg_finish_rate': band['avg_finish_rate']
+        }
+        for band in cube.rollup(['weight_band'], activity=['regular', 'veteran'])
+        if band['weight_band'] is not None and band['rated_fighters']
+    }
+    
+    return {
+        'age_analytics': {
+            'average_age': average_age,
+            'age_group_performance': age_performance if average_age is not None else {}
+        },
+        'weight_class_analytics': weight_performance,
+        'performance_trends': {
+            'high_finishers': leaderboards.top('finish_rate', 10),
+            'volume_fighters': leaderboards.top('total_fights', 10)
+        }
+    }
+
 @app.route('/api/overview', methods=['GET'])
+@response_cache.cached
 def get_overview():
     """Get comprehensive UFC database overview"""
     try:
-        fighter_stats = get_fighter_performance_metrics()
         fight_outcomes = analyze_fight_outcomes()
         
-        # Calculate summary statistics
-        total_fights_all = sum(f['total_fights'] for f in fighter_stats)
-        avg_win_rate = np.mean([f['win_rate'] for f in fighter_stats if f['total_fights'] >= 3])
-        
-        # Category distribution
-        category_dist = {}
-        for fighter in fighter_stats:
-            cat = fighter['category']
-            category_dist[cat] = category_dist.get(cat, 0) + 1
-        
         return jsonify({
             'database_stats': get_database_stats(),
             'performance_summary': get_performance_summary(),
@@ -472,24 +568,25 @@ def get_overview():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/fighters/top-performers', methods=['GET'])
+@response_cache.cached
 def get_top_performers():
     """Get top performing fighters across different metrics"""
     try:
-        fighter_stats = get_fighter_performance_metrics()
-        
-        # Filter for fighters with meaningful sample size
-        qualified_fighters = [f for f in fighter_stats if f['total_fights'] >= 5]
+        leaderboards = current_dataset().leaderboards
         
-        return jsonify({
-            'by_win_rate': qualified_fighters[:20],
-            'by_finish_rate': sorted(qualified_fighters, key=lambda x: x['finish_rate'], reverse=True)[:15],
-            'most_active': sorted(qualified_fighters, key=lambda x: x['total_fights'], reverse=True)[:15],
+        # Rank only fighters with a meaningful sample size
+        return list_response('by_win_rate', leaderboards.ranked('win_rate', min_fights=5), lambda: {
+            'by_finish_rate': leaderboards.top('finish_rate', 15, min_fights=5),
+            'most_active': leaderboards.top('total_fights', 15, min_fights=5),
             'rising_stars': identify_rising_stars()
-        })
+        }, default_limit=20)
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/analytics/international', methods=['GET'])
+@response_cache.cached
 def get_international_analytics():
     """Get international representation and performance analytics"""
     try:
@@ -497,121 +594,274 @@ def get_international_analytics():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/analytics/cube', methods=['GET'])
+@response_cache.cached
+def get_fighter_cube():
+    """Roll up or drill down the fighter cube (?by=country,sex plus dimension filters, repeatable)"""
+    try:
+        by = [dimension for dimension in request.args.get('by', '').split(',') if dimension]
+        unknown = [dimension for dimension in by if dimension not in FIGHTER_DIMENSIONS]
+        if unknown or len(set(by)) != len(by):
+            return jsonify({'error': f"Invalid 'by' dimensions: {', '.join(unknown) or 'duplicates'}",
+                           'dimensions': list(FIGHTER_DIMENSIONS)}), 400
+        filters = {dimension: request.args.getlist(dimension)
+                   for dimension in FIGHTER_DIMENSIONS if dimension in request.args}
+        min_fighters = max(request.args.get('min_fighters', 0, type=int), 0)
+        
+        cube = current_dataset().fighter_cube
+        cells = [cell for cell in cube.rollup(by, **filters) if cell['fighters'] >= min_fighters]
+        return list_response('cells', cells, lambda: {
+            'dimensions': {dimension: list(levels) for dimension, levels in cube.levels.items()},
+            'by': by,
+            'filters': filters,
+            'total': len(cells)
+        })
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/events/analysis', methods=['GET'])
+@response_cache.cached
 def get_events_analysis():
     """Get comprehensive events analysis"""
     try:
-        return jsonify(get_recent_events_analysis())
+        ds = current_dataset()
+        if ds.events_df.empty:
+            return jsonify({})
+        return list_response('recent_events', ds.recent_events, get_recent_events_analysis, default_limit=20)
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/fight-outcomes', methods=['GET'])
+@response_cache.cached
+def get_fight_outcomes():
+    """Get fight outcome distributions, optionally filtered by weight class, year, method or round"""
+    try:
+        filters = {
+            'weight_class': request.args.get('weight_class'),
+            'year': request.args.get('year', type=int),
+            'method': request.args.get('method'),
+            'round': request.args.get('round', type=int),
+        }
+        outcomes = analyze_fight_outcomes(**filters)
+        outcomes['fights_by_year'] = series_dict(current_dataset().fight_outcome_cube.distribution('year', **filters).sort_index())
+        outcomes['filters'] = {key: value for key, value in filters.items() if value is not None}
+        return jsonify(outcomes)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/fighters/search/<name>', methods=['GET'])
+@response_cache.cached
 def search_fighter(name):
-    """Search for fighters by name"""
+    """Search for fighters by name or nickname"""
     try:
-        if fighters_df.empty or 'name' not in fighters_df.columns:
-            return jsonify({
-                'query': name,
-                'total_found': 0,
-                'results': []
-            })
-        
-        # Case-insensitive search
-        matching_fighters = fighters_df[
-            fighters_df['name'].str.contains(name, case=False, na=False)
-        ].head(10)
-        
-        results = []
-        for _, fighter in matching_fighters.iterrows():
-            wins = fighter.get('wins', 0) or 0
-            losses = fighter.get('losses', 0) or 0
-            draws = fighter.get('draws', 0) or 0
-            total_fights = wins + losses + draws
-            win_rate = (wins / total_fights * 100) if total_fights > 0 else 0
-            
-            results.append({
-                'fighter_id': fighter.get('fighter_id', 'N/A'),
-                'name': fighter['name'],
-                'record': f"{wins}-{losses}-{draws}",
-                'win_rate': round(win_rate, 1),
-                'country': fighter.get('nationality', 'Unknown'),
-                'weight_lbs': fighter.get('weight_lbs', None)
-            })
+        limit = min(max(request.args.get('limit', 10, type=int), 1), MAX_SEARCH_LIMIT)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        total_matches, results = current_dataset().fighter_search_index.search(name, limit=limit, offset=offset)
         
         return jsonify({
             'query': name,
             'total_found': len(results),
+            'total_matches': total_matches,
+            'offset': offset,
+            'limit': limit,
             'results': results
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/analytics/advanced', methods=['GET'])
-def get_advanced_analytics():
-    """Get advanced UFC analytics and insights"""
+@app.route('/api/fighters/resolve', methods=['GET'])
+@response_cache.cached
+def resolve_fighter():
+    """Resolve a fighter name (as written in any dataset) to its fighter_id"""
     try:
-        fighter_stats = get_fighter_performance_metrics()
+        name = request.args.get('name', '').strip()
+        if not name:
+            return jsonify({'error': "Missing 'name' parameter"}), 400
+        birthdate = request.args.get('birthdate')
         
-        # Age analysis
-        fighters_with_age = [f for f in fighter_stats if f['age']]
-        if fighters_with_age:
-            avg_age = np.mean([f['age'] for f in fighters_with_age])
-            age_performance = {}
-            
-            for age_group in ['20-25', '26-30', '31-35', '36+']:
-                if age_group == '20-25':
-                    group_fighters = [f for f in fighters_with_age if 20 <= f['age'] <= 25]
-                elif age_group == '26-30':
-                    group_fighters = [f for f in fighters_with_age if 26 <= f['age'] <= 30]
-                elif age_group == '31-35':
-                    group_fighters = [f for f in fighters_with_age if 31 <= f['age'] <= 35]
-                else:
-                    group_fighters = [f for f in fighters_with_age if f['age'] >= 36]
-                
-                if group_fighters:
-                    age_performance[age_group] = {
-                        'count': len(group_fighters),
-                        'avg_win_rate': round(np.mean([f['win_rate'] for f in group_fighters]), 1)
-                    }
+        fighter_ids = current_dataset().fighter_ids
+        code, matched_by = fighter_ids.match(name, birthdate)
+        if code < 0:
+            return jsonify({'error': f"No single fighter matches '{name}'", 'query': name}), 404
+        return jsonify({
+            'query': name,
+            'fighter_id': fighter_ids.fighter_ids[code],
+            'name': fighter_ids.names[code],
+            'matched_by': matched_by
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/fighters/compare', methods=['GET'])
+@response_cache.cached
+def compare_fighters():
+    """Head-to-head, common opponents and chains of wins between two fighters (?a=&b=, ids or names)"""
+    try:
+        fighter_ids = current_dataset().fighter_ids
+        codes = {}
+        for arg in ('a', 'b'):
+            value = request.args.get(arg, '').strip()
+            if not value:
+                return jsonify({'error': f"Missing '{arg}' parameter"}), 400
+            codes[arg] = fighter_ids.by_id[value] if value in fighter_ids.by_id else fighter_ids.code(value)
+            if codes[arg] < 0:
+                return jsonify({'error': f"No single fighter matches '{value}'", 'query': value}), 404
+        if codes['a'] == codes['b']:
+            return jsonify({'error': "'a' and 'b' are the same fighter"}), 400
+        max_hops = min(max(request.args.get('max_hops', 3, type=int), 1), MAX_HOPS)
+        limit = min(max(request.args.get('limit', 5, type=int), 1), MAX_SEARCH_LIMIT)
         
-        # Weight class performance
-        weight_performance = {}
-        weight_ranges = {
-            'Flyweight': (0, 130),
-            'Bantamweight': (130, 140),
-            'Featherweight': (140, 150),
-            'Lightweight': (150, 160),
-            'Welterweight': (160, 180),
-            'Middleweight': (180, 200),
-            'Light Heavyweight': (200, 220),
-            'Heavyweight': (220, 300)
-        }
+        return jsonify(current_dataset().fighter_graph.compare(codes['a'], codes['b'], max_hops, limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/fighters/<fighter_id>/record', methods=['GET'])
+@response_cache.cached
+def get_fighter_record(fighter_id):
+    """A fighter's record, streak and fight timeline as of a date (?as_of=, optionally ?since=)"""
+    try:
+        try:
+            as_of, since = (pd.Timestamp(request.args[arg]) if request.args.get(arg) else None
+                            for arg in ('as_of', 'since'))
+        except ValueError as e:
+            return jsonify({'error': f"Invalid date: {e}"}), 400
         
-        for weight_class, (min_w, max_w) in weight_ranges.items():
-            class_fighters = [
-                f for f in fighter_stats 
-                if f['weight_lbs'] and min_w < f['weight_lbs'] <= max_w and f['total_fights'] >= 3
-            ]
-            
-            if class_fighters:
-                weight_performance[weight_class] = {
-                    'fighter_count': len(class_fighters),
-                    'avg_win_rate': round(np.mean([f['win_rate'] for f in class_fighters]), 1),
-                    'avg_finish_rate': round(np.mean([f['finish_rate'] for f in class_fighters]), 1)
-                }
+        ds = current_dataset()
+        code = ds.fighter_ids.by_id.get(fighter_id)
+        if code is None:
+            return jsonify({'error': f"Unknown fighter_id '{fighter_id}'"}), 404
         
-        return jsonify({
-            'age_analytics': {
-                'average_age': round(avg_age, 1) if fighters_with_age else None,
-                'age_group_performance': age_performance if fighters_with_age else {}
+        fight_index = ds.championship_lineage.fight_index
+        names = ds.history_names.get(fighter_id, [])
+        wins, losses, draws = fight_index.record_between(names, since, as_of)
+        streak, streak_length = fight_index.streak_as_of(names, as_of)
+        fights = fight_index.history(names, since, as_of)
+        return list_response('fights', fights, lambda: {
+            'fighter_id': fighter_id,
+            'name': ds.fighter_ids.names[code],
+            'as_of': as_of.strftime('%Y-%m-%d') if as_of is not None else None,
+            'since': since.strftime('%Y-%m-%d') if since is not None else None,
+            'record': {
+                'wins': wins,
+                'losses': losses,
+                'draws': draws,
+                'total_fights': wins + losses + draws,
+                'record': f"{wins}-{losses}-{draws}"
             },
-            'weight_class_analytics': weight_performance,
-            'elite_fighters': [f for f in fighter_stats if f['category'] == 'Elite'][:10],
-            'performance_trends': {
-                'high_finishers': sorted(fighter_stats, key=lambda x: x['finish_rate'], reverse=True)[:10],
-                'volume_fighters': sorted(fighter_stats, key=lambda x: x['total_fights'], reverse=True)[:10]
-            }
+            'streak': {'result': streak, 'length': streak_length}
         })
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ratings', methods=['GET'])
+@response_cache.cached
+def get_ratings():
+    """Fighters ranked by Elo rating (?min_fights=, ?active_since=YYYY-MM-DD)"""
+    try:
+        try:
+            active_since = pd.Timestamp(request.args['active_since']) if request.args.get('active_since') else None
+        except ValueError as e:
+            return jsonify({'error': f"Invalid date: {e}"}), 400
+        min_fights = max(request.args.get('min_fights', 0, type=int), 0)
+        
+        ratings = current_dataset().ratings
+        leaders = ratings.ranked(min_fights=min_fights, active_since=active_since)
+        filters = {}
+        if min_fights:
+            filters['min_fights'] = min_fights
+        if active_since is not None:
+            filters['active_since'] = active_since.strftime('%Y-%m-%d')
+        return list_response('ratings', leaders, lambda: {
+            'system': 'elo',
+            'k_factor': ratings.k_factor,
+            'initial_rating': ratings.initial_rating,
+            'rated_fights': len(ratings),
+            'filters': filters,
+            'total': len(leaders)
+        }, default_limit=10)
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/ratings/<fighter_id>', methods=['GET'])
+@response_cache.cached
+def get_fighter_rating(fighter_id):
+    """A fighter's current Elo rating and its history, one entry per rated fight"""
+    try:
+        ratings = current_dataset().ratings
+        code = ratings.code(fighter_id)
+        if code is None:
+            return jsonify({'error': f"No rated fights for fighter_id '{fighter_id}'"}), 404
+        return list_response('history', ratings.history(code), lambda: ratings.fighter(code))
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/predictions/upcoming', methods=['GET'])
+@response_cache.cached
+def get_upcoming_predictions():
+    """Win probabilities for every bout in upcoming.csv from the trained outcome model"""
+    try:
+        ds = current_dataset()
+        if ds.outcome_model is None:
+            return jsonify({'error': 'No outcome model trained; run train_outcome_model.py'}), 503
+        predictions = ds.upcoming_predictions
+        return list_response('predictions', predictions, lambda: {
+            'model': ds.outcome_model.summary(),
+            'total': len(predictions)
+        })
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/advanced', methods=['GET'])
+@response_cache.cached
+def get_advanced_analytics():
+    """Get advanced UFC analytics and insights"""
+    try:
+        leaderboards = current_dataset().leaderboards
+        elite_fighters = leaderboards.ranked('win_rate', category='Elite')
+        return list_response('elite_fighters', elite_fighters,
+                             lambda: analyze_advanced_metrics(current_dataset().fighter_cube, leaderboards),
+                             default_limit=10)
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leaderboards', methods=['GET'])
+@response_cache.cached
+def get_leaderboard():
+    """Get fighters ranked by a metric, optionally filtered by weight class, country, category and minimum fights"""
+    try:
+        leaderboards = current_dataset().leaderboards
+        metric = request.args.get('metric', 'win_rate')
+        if metric not in leaderboards.metrics:
+            return jsonify({'error': f"Unknown metric '{metric}'", 'metrics': list(leaderboards.metrics)}), 400
+        
+        filters = {dimension: request.args.get(dimension) for dimension in LEADERBOARD_DIMENSIONS}
+        min_fights = max(request.args.get('min_fights', 0, type=int), 0)
+        leaders = leaderboards.ranked(metric, min_fights=min_fights, **filters)
+        
+        applied = {dimension: value for dimension, value in filters.items() if value is not None}
+        if min_fights:
+            applied['min_fights'] = min_fights
+        return list_response('leaders', leaders, lambda: {
+            'metric': metric,
+            'filters': applied,
+            'total': len(leaders)
+        }, default_limit=10)
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -620,84 +870,29 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'data_loaded': not (events_df.empty or fighters_df.empty or fights_df.empty or ufc_master_df.empty),
+        'data_loaded': current_dataset().loaded,
+        'dataset_version': current_dataset().version,
         'timestamp': datetime.now().isoformat()
     })
 
 @app.route('/api/former-champions/analysis', methods=['GET'])
+@response_cache.cached
 def get_former_champions_analysis():
     """Get complete former champions analysis using corrected data"""
     try:
-        # Use the corrected champions data instead of calculating dynamically
-        champions = []
-        
-        for champion in corrected_champions:
-            # Parse the record string (e.g., "5-4" -> wins=5, losses=4)
-            record_parts = champion['record_after_belt'].split('-')
-            wins = int(record_parts[0])
-            losses = int(record_parts[1])
-            total_fights = wins + losses
-            
-            champions.append({
-                'name': champion['name'],
-                'record_after_belt_loss': champion['record_after_belt'],
-                'wins_after_belt_loss': wins,
-                'losses_after_belt_loss': losses,
-                'total_fights_after_belt_loss': total_fights,
-                'win_percentage_after_belt_loss': champion['win_percentage'],
-                'weight_class': champion.get('weight_class', 'Unknown'),
-                'lost_to': champion.get('lost_to', 'Unknown'),
-                'lost_belt_date': champion.get('title_loss_details', '').split(' at ')[-1].split(' (')[-1].replace(')', '') if 'at' in champion.get('title_loss_details', '') else 'Unknown'
-            })
-        
-        # Calculate summary from corrected data
-        total_champions = len(champions)
-        total_wins = sum(c['wins_after_belt_loss'] for c in champions)
-        total_losses = sum(c['losses_after_belt_loss'] for c in champions)
-        total_fights = sum(c['total_fights_after_belt_loss'] for c in champions)
-        
-        overall_win_percentage = round((total_wins / total_fights) * 100, 1) if total_fights > 0 else 0
-        
-        # Performance breakdown
-        elite_performers = [c for c in champions if c['win_percentage_after_belt_loss'] >= 70]
-        good_performers = [c for c in champions if 50 <= c['win_percentage_after_belt_loss'] < 70]
-        struggling_performers = [c for c in champions if c['win_percentage_after_belt_loss'] < 50]
-        
-        summary = {
-            'total_former_champions': total_champions,
-            'total_wins_after_belt_loss': total_wins,
-            'total_losses_after_belt_loss': total_losses,
-            'overall_win_percentage_after_belt_loss': overall_win_percentage,
-            'average_fights_per_former_champion': round(total_fights / total_champions, 1) if total_champions > 0 else 0,
-            'performance_breakdown': {
-                'elite_performers': {
-                    'count': len(elite_performers),
-                    'percentage': round((len(elite_performers) / total_champions) * 100, 1),
-                    'criteria': '70%+ win rate'
-                },
-                'good_performers': {
-                    'count': len(good_performers),
-                    'percentage': round((len(good_performers) / total_champions) * 100, 1),
-                    'criteria': '50-69% win rate'
-                },
-                'struggling_performers': {
-                    'count': len(struggling_performers),
-                    'percentage': round((len(struggling_performers) / total_champions) * 100, 1),
-                    'criteria': '<50% win rate'
-                }
-            }
-        }
-        
-        return jsonify({
-            'former_champions': champions,
-            'summary': summary,
+        analysis = current_dataset().former_champions_analysis
+        return list_response('former_champions', analysis['former_champions'], lambda: {
+            'summary': analysis['summary'],
             'analysis_note': 'Corrected analysis of UFC champions performance after losing their championship belt',
             'data_source': 'Manually verified and corrected UFC historical records'
         })
+    except PageRequestError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/former-champions/summary', methods=['GET'])
+@response_cache.cached
 def get_former_champions_summary_endpoint():
     """Get summary statistics for former champions"""
     try:
@@ -706,6 +901,7 @@ def get_former_champions_summary_endpoint():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/former-champions/top-performers', methods=['GET'])
+@response_cache.cached
 def get_former_champions_top_performers():
     """Get top performing former champions"""
     try:
@@ -722,16 +918,18 @@ def get_former_champions_top_performers():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/dataset/info', methods=['GET'])
+@response_cache.cached
 def get_dataset_info():
     """Get information about the datasets"""
     try:
+        ds = current_dataset()
+        events_df, fighters_df, fights_df, ufc_master_df = ds.events_df, ds.fighters_df, ds.fights_df, ds.ufc_master_df
         title_bouts = 0
         if not ufc_master_df.empty:
             title_bouts = len(ufc_master_df[ufc_master_df['TitleBout'] == True])
         
         date_range = {}
         if not ufc_master_df.empty:
-            ufc_master_df['Date'] = pd.to_datetime(ufc_master_df['Date'])
             date_range = {
                 'earliest': ufc_master_df['Date'].min().strftime('%Y-%m-%d'),
                 'latest': ufc_master_df['Date'].max().strftime('%Y-%m-%d')
@@ -751,6 +949,23 @@ def get_dataset_info():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics (request and helper latency histograms) for this worker process"""
+    return Response(instrumentation.render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_dataset():
+    """Rebuild the dataset from data/ in the background and swap it in when ready"""
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    dataset_manager.reload_in_background(force=request.args.get('force') == 'true')
+    return jsonify({
+        'status': 'reloading',
+        'current_version': current_dataset().version
+    }), 202
+
 @app.route('/')
 def serve_frontend():
     """Serve the frontend application"""
@@ -765,6 +980,24 @@ def serve_static_files(path):
         # If file not found, serve index.html for client-side routing
         return send_from_directory(app.static_folder, 'index.html')
 
+# Load the data (and build every derived index) once at import time
+dataset_manager.load()
+DATA_WATCH_INTERVAL = float(os.environ.get('DATA_WATCH_INTERVAL', 0))
+
+def is_inline_request(method, path, query_string):
+    """Requests cheap enough to answer on the ASGI event loop: health checks,
+    metrics, static assets and responses already in the response cache"""
+    if method not in ('GET', 'HEAD'):
+        return False
+    if path in ('/api/health', '/api/metrics') or not path.startswith('/api/'):
+        return True
+    return response_cache.contains(path, query_string)
+
+# ASGI entry point: analytics run on a thread pool (ANALYTICS_THREADS) while the
+# event loop keeps answering inline requests. Production:
+#   gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker app:asgi_app
+asgi_app = ThreadPoolASGI(app, inline=is_inline_request,
+                          on_startup=[lambda: dataset_manager.start_watching(DATA_WATCH_INTERVAL)])
+
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5001))
-    app.run(debug=False, host='0.0.0.0', port=port)
+    serve(asgi_app, port=int(os.environ.get('PORT', 5001)))
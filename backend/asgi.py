@@ -0,0 +1,187 @@
+"""
+ASGI serving mode for the Flask app.
+
+``ThreadPoolASGI`` wraps the (synchronous, WSGI) Flask app so it can run
+under an ASGI server such as uvicorn. Cheap requests, chosen by the
+``inline`` callback, are answered directly on the event loop: in the app
+these are health checks, static assets and responses already in the
+response cache. Every other request runs on a bounded thread pool, so a
+slow analytics request occupies one pool thread instead of the whole
+server. The pool threads stream the response body back to the event loop
+as it is produced, which keeps NDJSON responses streaming.
+
+The production entry point is ``app:asgi_app``; see the README.
+"""
+
+import asyncio
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_THREADS = 4
+
+
+def build_environ(scope, body):
+    """The WSGI environ for an ASGI HTTP ``scope`` and its request ``body``."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name == 'CONTENT_LENGTH':
+            continue
+        else:
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    # The body is fully buffered, so its length is known even for chunked uploads
+    environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+def run_wsgi(wsgi_app, environ, send_start, send_body):
+    """Call a WSGI app, passing its status/headers and body chunks to the callbacks.
+
+    ``send_start(status_code, headers)`` is called once, before the first
+    non-empty body chunk (or at the end for an empty body).
+    """
+    response = {}
+    written = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info is not None and response.get('started'):
+            raise exc_info[1].with_traceback(exc_info[2])
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        return written.append
+
+    def start():
+        if not response.get('started'):
+            response['started'] = True
+            send_start(response['status'], response['headers'])
+
+    iterable = wsgi_app(environ, start_response)
+    try:
+        for chunk in written:
+            start()
+            send_body(chunk)
+        for chunk in iterable:
+            if chunk:
+                start()
+                send_body(chunk)
+        start()
+    finally:
+        if hasattr(iterable, 'close'):
+            iterable.close()
+
+
+class ThreadPoolASGI:
+    """Serve a WSGI app over ASGI, running slow requests on a thread pool.
+
+    ``inline(method, path, query_string)`` returns True for requests cheap
+    enough to answer on the event loop. ``on_startup`` callbacks run when
+    the server starts (the ASGI lifespan startup event).
+    """
+
+    def __init__(self, wsgi_app, max_threads=None, inline=lambda method, path, query_string: False,
+                 on_startup=()):
+        self.wsgi_app = wsgi_app
+        self.max_threads = max_threads or int(os.environ.get('ANALYTICS_THREADS', DEFAULT_THREADS))
+        self.inline = inline
+        self.on_startup = list(on_startup)
+        self.executor = None
+
+    def _executor(self):
+        # Created lazily so a pool is never inherited across a fork
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.max_threads, thread_name_prefix='analytics')
+        return self.executor
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                for callback in self.on_startup:
+                    callback()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False)
+                    self.executor = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        environ = build_environ(scope, bytes(body))
+
+        if self.inline(scope['method'], scope['path'], scope.get('query_string', b'')):
+            messages = []
+            run_wsgi(
+                self.wsgi_app, environ,
+                lambda status, headers: messages.append(
+                    {'type': 'http.response.start', 'status': status, 'headers': headers}),
+                lambda chunk: messages.append({'type': 'http.response.body', 'body': chunk, 'more_body': True}),
+            )
+            for message in messages:
+                await send(message)
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def send_from_thread(message):
+            # Blocks the pool thread until the event loop has sent the message
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def handle():
+            run_wsgi(
+                self.wsgi_app, environ,
+                lambda status, headers: send_from_thread(
+                    {'type': 'http.response.start', 'status': status, 'headers': headers}),
+                lambda chunk: send_from_thread({'type': 'http.response.body', 'body': chunk, 'more_body': True}),
+            )
+
+        await loop.run_in_executor(self._executor(), handle)
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+def serve(asgi_app, host='0.0.0.0', port=5001):
+    """Run ``asgi_app`` under uvicorn (single process; use gunicorn for several workers)."""
+    import uvicorn
+    uvicorn.run(asgi_app, host=host, port=port, lifespan='on')
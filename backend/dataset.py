@@ -0,0 +1,413 @@
+"""
+Read-only access to the loaded UFC tables.
+
+The tables are loaded once (in the gunicorn master when preloading) and
+shared by every request and forked worker. Freezing their backing arrays
+makes any accidental in-place write fail loudly instead of silently
+dirtying copy-on-write pages in each worker.
+
+A ``Dataset`` bundles one version of the tables with everything derived
+from them. ``DatasetManager`` builds new versions (on demand or when the
+data directory changes) off the request path and publishes each one with a
+single reference swap, so in-flight requests finish on the version they
+started with.
+
+When the only change to data/ is rows appended to the table CSVs (the
+normal case after a fight night), ``reload`` parses just the new rows and
+derived values registered with an ``update`` function are advanced from
+the previous version instead of being rebuilt from the full history.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from predictions import INPUT_COLUMNS as UPCOMING_COLUMNS, MODEL_FILE
+from snapshot import TABLE_FILES, append_rows, load_tables, read_appended_rows
+from ufc_data import UFCData
+
+REQUIRED_DATA_FILES = ['events.csv', 'fighters.csv', 'fights.csv', 'ufc-master.csv', 'champions_records.json']
+# The upcoming card and the outcome model trained for it are versioned with the data when present
+DATA_FILES = REQUIRED_DATA_FILES + ['upcoming.csv', MODEL_FILE]
+
+# Bytes remembered from the end of each file, used to tell an append from a rewrite
+TAIL_BYTES = 64
+
+
+def _backing_ndarray(array):
+    """Return the NumPy buffer behind a pandas block array, if any."""
+    if isinstance(array, np.ndarray):
+        return array
+    # DatetimeArray/NumpyExtensionArray keep _ndarray, Categorical keeps _codes
+    for attr in ('_ndarray', '_codes'):
+        values = getattr(array, attr, None)
+        if isinstance(values, np.ndarray):
+            return values
+    return None
+
+
+def freeze_frame(df):
+    """Mark the numeric NumPy buffers backing ``df`` as read-only and return it.
+
+    Object columns are left alone: they only hold pointers to Python objects
+    (whose refcounts are touched regardless), and several pandas Cython paths
+    reject read-only object buffers.
+    """
+    for array in df._mgr.arrays:
+        values = _backing_ndarray(array)
+        if values is not None and values.dtype != object:
+            values.flags.writeable = False
+    return df
+
+
+def freeze_tables(*tables):
+    """Freeze several DataFrames in place."""
+    for df in tables:
+        freeze_frame(df)
+
+
+def scan_data_files(data_path, files=DATA_FILES):
+    """Hash every data file, returning ``{name: (digest, size, tail)}``.
+
+    ``digest`` is a live hashlib object, so appended bytes can extend it
+    without re-reading the file; ``tail`` holds the last bytes hashed.
+    """
+    states = {}
+    for name in files:
+        path = os.path.join(data_path, name)
+        if not os.path.exists(path):
+            continue
+        digest = hashlib.blake2b(digest_size=12)
+        size, tail = 0, b''
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+                size += len(chunk)
+                tail = (tail + chunk)[-TAIL_BYTES:]
+        states[name] = (digest, size, tail)
+    return states
+
+
+def combine_digests(file_states, files=DATA_FILES):
+    """Fold the per-file content hashes into a short version string."""
+    digest = hashlib.blake2b(digest_size=12)
+    for name in files:
+        if name in file_states:
+            digest.update(name.encode())
+            digest.update(file_states[name][0].digest())
+    return digest.hexdigest()
+
+
+def compute_dataset_version(data_path, files=DATA_FILES):
+    """Hash the contents of the data files into a short version string."""
+    return combine_digests(scan_data_files(data_path, files), files)
+
+
+def dataset_modified_time(data_path, files=DATA_FILES):
+    """Latest modification time of the data files, as an aware datetime."""
+    mtimes = [os.path.getmtime(os.path.join(data_path, name))
+              for name in files if os.path.exists(os.path.join(data_path, name))]
+    if not mtimes:
+        return None
+    return datetime.fromtimestamp(int(max(mtimes)), tz=timezone.utc)
+
+
+def data_signature(data_path, files=DATA_FILES):
+    """Cheap (size, mtime) fingerprint of the data files used to detect changes."""
+    signature = {}
+    for name in files:
+        try:
+            stat = os.stat(os.path.join(data_path, name))
+        except FileNotFoundError:
+            continue
+        signature[name] = (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+def load_upcoming(data_path):
+    """The upcoming card in ``data_path``, or None when there is none or it cannot be parsed.
+
+    upcoming.csv is optional, so a malformed card only leaves the
+    predictions empty instead of failing the whole dataset.
+    """
+    data = UFCData(data_path)
+    if not data.exists('upcoming'):
+        return None
+    try:
+        return data.table('upcoming', [column for column in UPCOMING_COLUMNS if column in data.columns('upcoming')])
+    except Exception as e:
+        print(f"Ignoring upcoming card: {e}")
+        return None
+
+
+class Dataset:
+    """One immutable version of the UFC tables and everything derived from them.
+
+    Derived values registered with ``DatasetManager.derive`` are available
+    as attributes (``dataset.fighter_search_index``).
+    """
+
+    def __init__(self, tables=None, corrected_champions=None, data_path=None,
+                 version='unloaded', last_modified=None, signature=None, file_states=None):
+        tables = tables or {}
+        self.events_df = tables.get('events', pd.DataFrame())
+        self.fighters_df = tables.get('fighters', pd.DataFrame())
+        self.fights_df = tables.get('fights', pd.DataFrame())
+        self.ufc_master_df = tables.get('ufc_master', pd.DataFrame())
+        self.upcoming_df = tables.get('upcoming', pd.DataFrame())
+        self.corrected_champions = corrected_champions or []
+        self.data_path = data_path
+        self.version = version
+        self.last_modified = last_modified
+        self.signature = signature or {}
+        # Per-file hash state; empty when the files changed while loading
+        self.file_states = file_states or {}
+        self.loaded_at = datetime.now()
+        self.derived = {}
+
+        # Shared read-only by every request and, under preload, every worker
+        freeze_tables(self.events_df, self.fighters_df, self.fights_df, self.ufc_master_df, self.upcoming_df)
+
+    def __getattr__(self, name):
+        derived = self.__dict__.get('derived', {})
+        if name in derived:
+            return derived[name]
+        raise AttributeError(name)
+
+    @property
+    def loaded(self):
+        return not (self.events_df.empty or self.fighters_df.empty
+                    or self.fights_df.empty or self.ufc_master_df.empty)
+
+    @classmethod
+    def load(cls, data_path):
+        """Load the tables from ``data_path`` (snapshot or CSV)."""
+        signature = data_signature(data_path)
+        tables = load_tables(data_path)
+        upcoming = load_upcoming(data_path)
+        if upcoming is not None:
+            tables['upcoming'] = upcoming
+        with open(os.path.join(data_path, 'champions_records.json'), 'r') as f:
+            corrected_champions = json.load(f)
+        file_states = scan_data_files(data_path)
+
+        # Only trust the byte offsets if nothing was written while we read
+        consistent = data_signature(data_path) == signature and all(
+            file_states[name][1] == size for name, (size, _) in signature.items()
+        )
+        return cls(
+            tables, corrected_champions, data_path=data_path,
+            version=combine_digests(file_states),
+            last_modified=dataset_modified_time(data_path),
+            signature=signature,
+            file_states=file_states if consistent else None
+        )
+
+    def tables(self):
+        return {
+            'events': self.events_df,
+            'fighters': self.fighters_df,
+            'fights': self.fights_df,
+            'ufc_master': self.ufc_master_df,
+            'upcoming': self.upcoming_df,
+        }
+
+    def extended(self, delta, signature, file_states):
+        """A new dataset with the rows in ``delta`` (table -> DataFrame) appended."""
+        tables = {
+            table: append_rows(df, delta[table]) if table in delta else df
+            for table, df in self.tables().items()
+        }
+        return Dataset(
+            tables, self.corrected_champions, data_path=self.data_path,
+            version=combine_digests(file_states),
+            last_modified=dataset_modified_time(self.data_path),
+            signature=signature,
+            file_states=file_states
+        )
+
+
+class DatasetManager:
+    """Owns the current Dataset and replaces it atomically on reload."""
+
+    def __init__(self, data_paths):
+        self.data_paths = list(data_paths)
+        self.builders = OrderedDict()
+        self.dependencies = {}
+        self.updaters = {}
+        self.current = Dataset()
+        self.build_lock = threading.Lock()
+        self.watcher = None
+        self.last_error = None
+
+    def derive(self, name, tables=None, update=None):
+        """Register ``builder(dataset)`` to compute a derived value for every version.
+
+        Builders run in registration order, so later ones may use earlier ones.
+        ``tables`` names the tables the value is computed from; when rows are
+        only appended to other tables the previous value is reused. If
+        ``update(previous, dataset, delta)`` is given it is used instead of a
+        full rebuild when those tables received appended rows.
+        """
+        def register(builder):
+            self.builders[name] = builder
+            self.dependencies[name] = set(tables) if tables is not None else None
+            self.updaters[name] = update
+            return builder
+        return register
+
+    def _find_data_path(self):
+        for data_path in self.data_paths:
+            if all(os.path.exists(os.path.join(data_path, name)) for name in REQUIRED_DATA_FILES):
+                return data_path
+        raise FileNotFoundError("Could not find data files in any expected location")
+
+    def build(self, data_path):
+        """Load a dataset and compute every registered derived value for it."""
+        dataset = Dataset.load(data_path)
+        for name, builder in self.builders.items():
+            value = builder(dataset)
+            if isinstance(value, pd.DataFrame):
+                freeze_frame(value)
+            dataset.derived[name] = value
+        return dataset
+
+    def build_empty(self):
+        """An empty dataset (with derived values) used when no data can be loaded."""
+        dataset = Dataset()
+        for name, builder in self.builders.items():
+            dataset.derived[name] = builder(dataset)
+        return dataset
+
+    def build_incremental(self, data_path, signature):
+        """Build the next dataset from rows appended since the current one.
+
+        Returns None when the change is not a pure append to the table CSVs
+        (a rewritten file, a new data path, an edited champions file), in
+        which case the caller falls back to a full build.
+        """
+        current = self.current
+        if not current.loaded or current.data_path != data_path or not current.file_states:
+            return None
+        if signature.keys() != current.signature.keys():
+            return None
+
+        file_tables = {name: table for table, name in TABLE_FILES.items()}
+        changed = [name for name in signature if signature[name] != current.signature[name]]
+        if any(name not in file_tables for name in changed):
+            return None
+
+        delta = {}
+        file_states = dict(current.file_states)
+        for name in changed:
+            digest, size, tail = current.file_states[name]
+            result = read_appended_rows(data_path, file_tables[name], size, tail)
+            if result is None:
+                return None
+            rows, appended = result
+            digest = digest.copy()
+            digest.update(appended)
+            file_states[name] = (digest, size + len(appended), (tail + appended)[-TAIL_BYTES:])
+            if not rows.empty:
+                delta[file_tables[name]] = rows
+
+        # A half-written row keeps its file's signature stale so the next poll retries
+        signature = {
+            name: stat if file_states[name][1] == stat[0] else (file_states[name][1], None)
+            for name, stat in signature.items()
+        }
+        return self.ingest(delta, signature, file_states)
+
+    def ingest(self, delta, signature, file_states):
+        """Append ``delta`` to the current dataset and advance its derived values."""
+        previous = self.current
+        dataset = previous.extended(delta, signature, file_states)
+        changed_tables = set(delta)
+        for name, builder in self.builders.items():
+            tables = self.dependencies[name]
+            update = self.updaters[name]
+            if tables is not None and not tables & changed_tables:
+                value = previous.derived[name]
+            elif tables is not None and update is not None:
+                value = update(previous.derived[name], dataset, delta)
+            else:
+                value = builder(dataset)
+            if isinstance(value, pd.DataFrame):
+                freeze_frame(value)
+            dataset.derived[name] = value
+        return dataset
+
+    def load(self):
+        """Initial load; falls back to an empty dataset if the data is unavailable."""
+        try:
+            dataset = self.build(self._find_data_path())
+            print(f"Loaded data from {dataset.data_path} (version {dataset.version})")
+            print(f"Loaded {len(dataset.events_df)} events, {len(dataset.fighters_df)} fighters, "
+                  f"{len(dataset.fights_df)} fights")
+            print(f"Loaded {len(dataset.ufc_master_df)} historical fights for championship analysis")
+            print(f"Loaded {len(dataset.corrected_champions)} corrected former champions records")
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            self.last_error = str(e)
+            dataset = self.build_empty()
+        self.current = dataset
+        return dataset
+
+    def reload(self, force=False):
+        """Build a new dataset and swap it in; returns True if a new version was published.
+
+        The previous dataset stays in place if loading fails or (unless
+        ``force``) if the data files are unchanged.
+        """
+        with self.build_lock:
+            try:
+                data_path = self._find_data_path()
+                signature = data_signature(data_path)
+                if not force and signature == self.current.signature:
+                    return False
+                dataset = None if force else self.build_incremental(data_path, signature)
+                if dataset is None:
+                    dataset = self.build(data_path)
+            except Exception as e:
+                print(f"Dataset reload failed, keeping version {self.current.version}: {e}")
+                self.last_error = str(e)
+                return False
+
+            if not force and dataset.version == self.current.version:
+                # Touched but identical files: remember them so polling stops rebuilding
+                self.current.signature = dataset.signature
+                return False
+            # A single reference assignment: requests that already hold the old
+            # dataset keep using it, new requests see the new one
+            self.current = dataset
+            self.last_error = None
+            print(f"Swapped in dataset version {dataset.version}")
+            return True
+
+    def reload_in_background(self, force=False):
+        """Run ``reload`` on a daemon thread and return the thread."""
+        thread = threading.Thread(target=self.reload, kwargs={'force': force},
+                                  name='dataset-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def start_watching(self, interval):
+        """Poll the data directory every ``interval`` seconds and reload on change."""
+        if interval <= 0 or (self.watcher is not None and self.watcher.is_alive()):
+            return self.watcher
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                self.reload()
+
+        self.watcher = threading.Thread(target=watch, name='dataset-watcher', daemon=True)
+        self.watcher.start()
+        return self.watcher
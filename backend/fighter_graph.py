@@ -0,0 +1,209 @@
+"""
+Graph of who fought whom, for head-to-head and common-opponent queries.
+
+Every fight in fights.csv (dated through events.csv) and every ufc-master.csv
+fight missing from it becomes an edge between two fighters.csv rows (the
+codes of ``FighterIdIndex``). Edges are stored in CSR layout: a fighter's
+fights are a contiguous, date-ordered slice of the ``opponents``,
+``results`` and ``dates`` arrays. The wins alone form a second, directed
+adjacency (``beaten``). "MMA math" chains (A beat X, who beat B) are then
+a breadth-first search over it, bounded by ``max_hops``, that expands a
+whole frontier per NumPy step.
+"""
+
+import numpy as np
+import pandas as pd
+
+from lineage import LOSS, OTHER, RESULT_NAMES, WIN
+from ratings import fight_dates, no_contests
+
+MAX_HOPS = 4
+# Days between a ufc-master.csv fight and a fights.csv fight of the same pair counted as the same bout
+SAME_FIGHT_DAYS = 7
+
+# A fight ruled a no contest; the same result from both sides
+NO_CONTEST = 2
+FIGHT_RESULT_NAMES = {**RESULT_NAMES, NO_CONTEST: 'no_contest'}
+
+# fights.csv ``winner`` / ufc-master.csv ``Winner`` -> result for the left / red fighter
+LEFT_RESULTS = {'L': WIN, 'R': LOSS, 'D': OTHER}
+RED_RESULTS = {'Red': WIN, 'Blue': LOSS, 'Draw': OTHER}
+
+
+def _fights_edges(fighter_ids, fights_df, events_df):
+    """(first, second, date, result for first) for the decided fights in fights.csv.
+
+    fights.csv gives no contests ``winner == 'D'``; their ``method`` marks them as NO_CONTEST.
+    """
+    columns = ['left_fighter_id', 'right_fighter_id', 'winner']
+    if fights_df.empty or any(column not in fights_df.columns for column in columns):
+        return pd.DataFrame({'first': [], 'second': [], 'date': pd.Series(dtype='datetime64[ns]'), 'result': []})
+    return pd.DataFrame({
+        'first': fights_df['left_fighter_id'].map(fighter_ids.by_id),
+        'second': fights_df['right_fighter_id'].map(fighter_ids.by_id),
+        'date': fight_dates(fights_df, events_df),
+        'result': fights_df['winner'].astype(object).map(LEFT_RESULTS).mask(no_contests(fights_df), NO_CONTEST),
+    })
+
+
+def _master_edges(fighter_ids, master_df):
+    """(first, second, date, result for first) for ufc-master.csv fights whose names resolve."""
+    if master_df is None or master_df.empty:
+        return pd.DataFrame({'first': [], 'second': [], 'date': pd.Series(dtype='datetime64[ns]'), 'result': []})
+    first = fighter_ids.codes(master_df['RedFighter'])
+    second = fighter_ids.codes(master_df['BlueFighter'])
+    return pd.DataFrame({
+        'first': np.where(first >= 0, first, np.nan),
+        'second': np.where(second >= 0, second, np.nan),
+        'date': pd.to_datetime(master_df['Date']).to_numpy(),
+        'result': master_df['Winner'].astype(object).map(RED_RESULTS).to_numpy(),
+    })
+
+
+def _missing_from(edges, other):
+    """The rows of ``other`` with no fight between the same pair in ``edges`` within SAME_FIGHT_DAYS."""
+    def pairs(df):
+        return pd.DataFrame({'low': np.minimum(df['first'], df['second']),
+                             'high': np.maximum(df['first'], df['second']), 'date': df['date']})
+    candidates = pairs(other).reset_index()
+    matches = candidates.merge(pairs(edges), on=['low', 'high'], suffixes=('', '_known'))
+    close = (matches['date'] - matches['date_known']).abs() <= pd.Timedelta(days=SAME_FIGHT_DAYS)
+    return other[~candidates['index'].isin(matches['index'][close]).to_numpy()]
+
+
+class FighterGraph:
+    """Fights between fighters.csv rows, as CSR adjacency lists."""
+
+    def __init__(self, fighter_ids, fights_df, events_df, master_df=None):
+        self.fighter_ids = fighter_ids
+        n_fighters = len(fighter_ids)
+
+        edges = _fights_edges(fighter_ids, fights_df, events_df).dropna()
+        edges = pd.concat([edges, _missing_from(edges, _master_edges(fighter_ids, master_df).dropna())],
+                          ignore_index=True)
+        edges = edges[edges['first'] != edges['second']]
+        first = edges['first'].to_numpy(dtype=np.int32)
+        second = edges['second'].to_numpy(dtype=np.int32)
+        results = edges['result'].to_numpy(dtype=np.int8)
+        dates = edges['date'].to_numpy(dtype='datetime64[D]')
+
+        # Each fight appears once from each side
+        sources = np.concatenate([first, second])
+        order = np.lexsort((np.concatenate([dates, dates]), sources))
+        self.opponents = np.concatenate([second, first])[order]
+        self.results = np.concatenate([results, np.where(results == NO_CONTEST, NO_CONTEST, -results)])[order].astype(np.int8)
+        self.dates = np.concatenate([dates, dates])[order]
+        self.offsets = np.searchsorted(sources[order], np.arange(n_fighters + 1))
+
+        # Directed winner -> loser adjacency; ``win_positions`` point back into the arrays above
+        self.win_positions = np.flatnonzero(self.results == WIN)
+        self.beaten = self.opponents[self.win_positions]
+        self.win_offsets = np.searchsorted(sources[order][self.win_positions], np.arange(n_fighters + 1))
+        for array in (self.opponents, self.results, self.dates, self.offsets,
+                      self.win_positions, self.beaten, self.win_offsets):
+            array.setflags(write=False)
+
+    def __len__(self):
+        """Number of fights in the graph."""
+        return len(self.opponents) // 2
+
+    def fights_of(self, code):
+        """Positions of one fighter's fights, oldest first."""
+        return np.arange(self.offsets[code], self.offsets[code + 1])
+
+    def fighter(self, code):
+        return {'fighter_id': self.fighter_ids.fighter_ids[code], 'name': self.fighter_ids.names[code]}
+
+    def _fights(self, positions):
+        return [{'date': str(date), 'result': FIGHT_RESULT_NAMES[result]}
+                for date, result in zip(np.datetime_as_string(self.dates[positions]), self.results[positions].tolist())]
+
+    def head_to_head(self, a, b):
+        """Fights between ``a`` and ``b``, oldest first, with ``a``'s result."""
+        positions = self.fights_of(a)
+        return self._fights(positions[self.opponents[positions] == b])
+
+    def common_opponents(self, a, b):
+        """Fighters both ``a`` and ``b`` have fought, by name, with each side's results against them."""
+        positions_a, positions_b = self.fights_of(a), self.fights_of(b)
+        common = np.intersect1d(self.opponents[positions_a], self.opponents[positions_b])
+        common = common[(common != a) & (common != b)]
+        opponents = [{
+            **self.fighter(opponent),
+            'a': self._fights(positions_a[self.opponents[positions_a] == opponent]),
+            'b': self._fights(positions_b[self.opponents[positions_b] == opponent]),
+        } for opponent in common.tolist()]
+        return sorted(opponents, key=lambda opponent: opponent['name'])
+
+    def win_chains(self, a, b, max_hops=3, limit=5):
+        """Up to ``limit`` shortest chains of wins leading from ``a`` to ``b`` in at most ``max_hops`` fights.
+
+        Each chain is a list of links ``{winner, loser, date}``; ``[]`` when
+        there is none within ``max_hops``.
+        """
+        if a == b:
+            return []
+        depth = np.full(len(self.offsets) - 1, -1, dtype=np.int16)
+        depth[a] = 0
+        frontier = np.array([a], dtype=np.int64)
+        # Per hop: the win edges (as indexes into ``beaten``) reaching newly discovered fighters
+        levels = []
+        for hop in range(1, max_hops + 1):
+            starts, ends = self.win_offsets[frontier], self.win_offsets[frontier + 1]
+            counts = ends - starts
+            if not counts.sum():
+                break
+            edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            children = self.beaten[edges]
+            new = depth[children] == -1
+            edges, children = edges[new], children[new]
+            depth[children] = hop
+            levels.append(edges)
+            if depth[b] == hop:
+                break
+            frontier = np.unique(children)
+        if depth[b] < 0:
+            return []
+
+        # Win-edge index -> winner code, for walking the levels backwards
+        winners = np.repeat(np.arange(len(self.win_offsets) - 1), np.diff(self.win_offsets))
+        chains = []
+
+        def walk(code, hop, links):
+            if len(chains) >= limit:
+                return
+            if hop == 0:
+                chains.append(links)
+                return
+            edges = levels[hop - 1]
+            edges = edges[self.beaten[edges] == code]
+            # One link per distinct winner: their latest win over ``code``
+            for winner in np.unique(winners[edges]).tolist():
+                edge = edges[winners[edges] == winner][-1]
+                link = {'winner': self.fighter(winner), 'loser': self.fighter(code),
+                        'date': str(self.dates[self.win_positions[edge]])}
+                walk(winner, hop - 1, [link] + links)
+
+        walk(b, int(depth[b]), [])
+        return chains
+
+    def compare(self, a, b, max_hops=3, limit=5):
+        """Everything the graph says about ``a`` versus ``b``."""
+        head_to_head = self.head_to_head(a, b)
+        return {
+            'a': self.fighter(a),
+            'b': self.fighter(b),
+            'head_to_head': {
+                'a_wins': sum(fight['result'] == 'win' for fight in head_to_head),
+                'b_wins': sum(fight['result'] == 'loss' for fight in head_to_head),
+                'draws': sum(fight['result'] == 'draw' for fight in head_to_head),
+                'no_contests': sum(fight['result'] == 'no_contest' for fight in head_to_head),
+                'fights': head_to_head,
+            },
+            'common_opponents': self.common_opponents(a, b),
+            'max_hops': max_hops,
+            'chains': {
+                'a_over_b': self.win_chains(a, b, max_hops, limit),
+                'b_over_a': self.win_chains(b, a, max_hops, limit),
+            },
+        }
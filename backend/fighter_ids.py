@@ -0,0 +1,137 @@
+"""
+Fighter identity resolution across the data files.
+
+fighters.csv and fights.csv identify fighters by ``fighter_id``, while
+ufc-master.csv, medium_dataset.csv and fighter_stats.csv only carry names.
+``FighterIdIndex`` is built once per dataset from fighters.csv. It maps
+every normalized name (see search.normalize), nickname and (name, birthdate)
+pair to the fighter's row in the table, its integer "code".
+
+``codes(names)`` resolves a whole column at once: the distinct names are
+factorized and each is looked up once in the hash maps. Joining another
+dataset to the fighters is then integer-array indexing rather than a string
+scan per fighter.
+"""
+
+import numpy as np
+import pandas as pd
+
+from search import normalize
+
+UNRESOLVED = -1
+# Key shared by more than one fighter; never returned as a code
+AMBIGUOUS = -2
+
+# How a name was resolved, most specific first
+BY_BIRTHDATE, BY_NAME, BY_REORDERED_NAME, BY_AKA = 'birthdate', 'name', 'reordered_name', 'aka'
+
+
+def _reordered(name):
+    """``name`` with its words sorted, so "Weili Zhang" matches "Zhang Weili"."""
+    return ' '.join(sorted(name.split()))
+
+
+def _day(value):
+    """A birthdate as a ``datetime64[D]`` key (None when missing or unparseable)."""
+    if value is None or value is pd.NaT:
+        return None
+    try:
+        day = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    if pd.isna(day):
+        return None
+    return day.to_datetime64().astype('datetime64[D]')
+
+
+def _add(mapping, key, code):
+    if key:
+        mapping[key] = code if mapping.get(key, code) == code else AMBIGUOUS
+
+
+class FighterIdIndex:
+    """Resolve fighter names (and optional birthdates) to fighters.csv rows."""
+
+    def __init__(self, fighters_df):
+        if fighters_df.empty or 'fighter_id' not in fighters_df.columns:
+            fighters_df = pd.DataFrame(columns=['fighter_id', 'name'])
+        self.fighter_ids = fighters_df['fighter_id'].to_numpy(dtype=object)
+        self.names = fighters_df['name'].to_numpy(dtype=object)
+        self.by_id = {}
+        for code, fighter_id in enumerate(self.fighter_ids):
+            self.by_id.setdefault(fighter_id, code)
+
+        akas = fighters_df['aka'] if 'aka' in fighters_df.columns else pd.Series(None, index=fighters_df.index)
+        birthdates = (fighters_df['birthdate'] if 'birthdate' in fighters_df.columns
+                      else pd.Series(pd.NaT, index=fighters_df.index))
+
+        self.by_name = {}
+        self.by_reordered_name = {}
+        self.by_aka = {}
+        self.by_name_birthdate = {}
+        for code, (name, aka, birthdate) in enumerate(zip(self.names, akas, birthdates)):
+            name = normalize(name)
+            _add(self.by_name, name, code)
+            _add(self.by_reordered_name, _reordered(name), code)
+            _add(self.by_aka, normalize(aka), code)
+            day = _day(birthdate)
+            if name and day is not None:
+                _add(self.by_name_birthdate, (name, day), code)
+
+    def __len__(self):
+        return len(self.fighter_ids)
+
+    def match(self, name, birthdate=None):
+        """Return ``(code, matched_by)`` for one fighter; ``(UNRESOLVED, None)`` if unknown.
+
+        An exact (normalized) name wins, then the same words in another
+        order, then a nickname. A birthdate picks between fighters sharing a
+        name. Keys shared by several fighters never resolve.
+        """
+        name = normalize(name)
+        if not name:
+            return UNRESOLVED, None
+        day = _day(birthdate)
+        if day is not None:
+            code = self.by_name_birthdate.get((name, day), UNRESOLVED)
+            if code >= 0:
+                return code, BY_BIRTHDATE
+        code = self.by_name.get(name, UNRESOLVED)
+        if code != UNRESOLVED:
+            return (code, BY_NAME) if code >= 0 else (UNRESOLVED, None)
+        for matched_by, mapping, key in ((BY_REORDERED_NAME, self.by_reordered_name, _reordered(name)),
+                                         (BY_AKA, self.by_aka, name)):
+            code = mapping.get(key, UNRESOLVED)
+            if code != UNRESOLVED:
+                return (code, matched_by) if code >= 0 else (UNRESOLVED, None)
+        return UNRESOLVED, None
+
+    def code(self, name, birthdate=None):
+        """The fighters.csv row for ``name`` (UNRESOLVED if unknown or ambiguous)."""
+        return self.match(name, birthdate)[0]
+
+    def codes(self, names, birthdates=None):
+        """Resolve a column of names (and birthdates) to an int32 array of codes."""
+        if birthdates is None:
+            inverse, uniques = pd.factorize(pd.Series(names, dtype=object))
+            resolved = [self.code(name) for name in uniques]
+        else:
+            keys = pd.MultiIndex.from_arrays([pd.Series(names, dtype=object), pd.to_datetime(birthdates, errors='coerce')])
+            inverse, uniques = pd.factorize(keys)
+            resolved = [self.code(name, birthdate) for name, birthdate in uniques]
+        codes = np.append(np.asarray(resolved, dtype=np.int32), np.int32(UNRESOLVED))
+        # factorize marks missing names with -1, which picks the trailing UNRESOLVED
+        return codes[inverse]
+
+    def fighter_id(self, name, birthdate=None):
+        """The fighter_id for ``name``, or None."""
+        code = self.code(name, birthdate)
+        return self.fighter_ids[code] if code >= 0 else None
+
+    def ids(self, codes):
+        """fighter_ids for an array of codes (None where unresolved)."""
+        codes = np.asarray(codes)
+        ids = np.full(len(codes), None, dtype=object)
+        resolved = codes >= 0
+        ids[resolved] = self.fighter_ids[codes[resolved]]
+        return ids
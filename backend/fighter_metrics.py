@@ -0,0 +1,114 @@
+"""
+Vectorized per-fighter performance metrics.
+
+The table is built once from fighters.csv and fights.csv and shared by every
+endpoint that needs win rates, finish rates, ages or performance categories.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = [
+    'fighter_id', 'name', 'wins', 'losses', 'draws', 'total_fights',
+    'win_rate', 'finish_rate', 'ko_tko_wins', 'submission_wins', 'country',
+    'weight_lbs', 'height_cm', 'age', 'category', 'recent_fights'
+]
+
+# (category, minimum win rate, minimum total fights), checked in order
+CATEGORY_RULES = [
+    ('Elite', 80, 10),
+    ('High-Level', 70, 8),
+    ('Solid', 60, 5),
+    ('Developing', 50, 0),
+]
+DEFAULT_CATEGORY = 'Struggling'
+
+
+def count_fighter_appearances(fights_df):
+    """Count the fights each fighter_id appears in (either corner)."""
+    if fights_df.empty:
+        return pd.Series(dtype='int64')
+
+    left = fights_df['left_fighter_id']
+    right = fights_df['right_fighter_id']
+    # A fighter listed in both corners of the same bout still counts once
+    appearances = pd.concat([left, right[right != left]], ignore_index=True)
+    return appearances.value_counts()
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series(np.nan, index=df.index)
+
+
+def build_fighter_metrics(fighters_df, fights_df, now=None):
+    """Build the per-fighter metrics table, sorted by win rate (descending)."""
+    if fighters_df.empty or fights_df.empty:
+        return pd.DataFrame(columns=METRIC_COLUMNS)
+
+    wins = fighters_df['wins']
+    losses = fighters_df['losses']
+    draws = fighters_df['draws']
+    total_fights = wins + losses + draws
+    keep = (total_fights > 0).to_numpy()
+
+    fighters = fighters_df[keep]
+    wins = wins[keep].to_numpy(dtype='float64')
+    total_fights = total_fights[keep].to_numpy(dtype='float64')
+
+    ko_tko = _column(fighters, 'wins_by_ko_tko')
+    submissions = _column(fighters, 'wins_by_submission')
+
+    win_rate = wins / total_fights * 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ko_tko_rate = np.where(wins > 0, ko_tko.fillna(0).to_numpy() / wins * 100, 0)
+        sub_rate = np.where(wins > 0, submissions.fillna(0).to_numpy() / wins * 100, 0)
+    finish_rate = ko_tko_rate + sub_rate
+
+    now = now or datetime.now()
+    if 'birthdate' in fighters.columns:
+        age = (pd.Timestamp(now) - fighters['birthdate']).dt.days // 365
+    else:
+        age = pd.Series(np.nan, index=fighters.index)
+
+    conditions = [(win_rate >= rate) & (total_fights >= bouts) for _, rate, bouts in CATEGORY_RULES]
+    category = np.select(conditions, [name for name, _, _ in CATEGORY_RULES], default=DEFAULT_CATEGORY)
+
+    appearances = count_fighter_appearances(fights_df)
+    recent_fights = fighters['fighter_id'].map(appearances).fillna(0).astype('int64')
+
+    table = pd.DataFrame({
+        'fighter_id': fighters['fighter_id'].to_numpy(),
+        'name': fighters['name'].to_numpy(),
+        'wins': wins.astype('int64'),
+        'losses': fighters['losses'].fillna(0).to_numpy(dtype='int64'),
+        'draws': fighters['draws'].fillna(0).to_numpy(dtype='int64'),
+        'total_fights': total_fights,
+        'win_rate': np.round(win_rate, 1),
+        'finish_rate': np.round(finish_rate, 1),
+        'ko_tko_wins': ko_tko.fillna(0).to_numpy(dtype='int64'),
+        'submission_wins': submissions.fillna(0).to_numpy(dtype='int64'),
+        'country': _column(fighters, 'country').to_numpy(),
+        'weight_lbs': _column(fighters, 'weight (lbs)').to_numpy(dtype='float64'),
+        'height_cm': _column(fighters, 'height (cm)').to_numpy(dtype='float64'),
+        'age': age.to_numpy(dtype='float64'),
+        'category': category,
+        'recent_fights': recent_fights.to_numpy(),
+    })
+
+    return table.sort_values('win_rate', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def add_fight_appearances(table, fights_df):
+    """Return a copy of ``table`` with ``recent_fights`` advanced by ``fights_df``.
+
+    Used when fights are appended: only the new fights are counted.
+    """
+    appearances = count_fighter_appearances(fights_df)
+    if appearances.empty:
+        return table
+    added = table['fighter_id'].map(appearances).fillna(0).astype('int64')
+    return table.assign(recent_fights=table['recent_fights'] + added)
@@ -0,0 +1,111 @@
+"""
+Compact, array-backed store of the per-fighter metrics.
+
+The metrics table is kept as one numpy array per column: numeric fields as
+int64/float64 arrays and the low-cardinality strings (country, category) as
+int32 codes into a tuple of interned levels. Rows only become Python values
+when a fighter is returned, through a ``FighterView`` with ``__slots__``.
+Rankings over the store live in leaderboards.py.
+"""
+
+import sys
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+CODED_COLUMNS = ('country', 'category')
+# Float columns (NaN when missing) whose values are whole numbers
+INTEGER_COLUMNS = ('age',)
+
+
+class FighterView(Mapping):
+    """Read-only dict-like view of one fighter in a FighterStore."""
+
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, field):
+        return self.store.value(field, self.row)
+
+    def __iter__(self):
+        return iter(self.store.fields)
+
+    def __len__(self):
+        return len(self.store.fields)
+
+    def to_dict(self):
+        return self.store.record(self.row)
+
+    def __repr__(self):
+        return f"FighterView({self.to_dict()!r})"
+
+
+class FighterRows(Sequence):
+    """An ordered selection of fighters; indexing and slicing return FighterViews."""
+
+    __slots__ = ('store', 'rows')
+
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [FighterView(self.store, row) for row in self.rows[index].tolist()]
+        return FighterView(self.store, int(self.rows[index]))
+
+
+class FighterStore:
+    """Struct-of-arrays form of the fighter metrics table.
+
+    ``fields`` keeps the table's column order (the keys of every view).
+    All arrays are read-only, so the store can be shared across requests.
+    """
+
+    def __init__(self, table):
+        self.fields = tuple(table.columns)
+        self.size = len(table)
+        self.columns = {}
+        self.levels = {}
+        for field in self.fields:
+            if field in CODED_COLUMNS:
+                codes, levels = pd.factorize(table[field])
+                values = codes.astype(np.int32)
+                self.levels[field] = tuple(sys.intern(str(level)) for level in levels)
+            else:
+                values = table[field].to_numpy()
+            values.setflags(write=False)
+            self.columns[field] = values
+
+    def __len__(self):
+        return self.size
+
+    def column(self, field):
+        """The raw array behind ``field`` (level codes for coded columns)."""
+        return self.columns[field]
+
+    def value(self, field, row):
+        """One fighter's ``field`` as a JSON-ready Python value (None when missing)."""
+        value = self.columns[field].item(row)
+        if field in self.levels:
+            return self.levels[field][value] if value >= 0 else None
+        if value != value:
+            return None
+        if field in INTEGER_COLUMNS:
+            return int(value)
+        return value
+
+    def record(self, row):
+        """One fighter as a plain dict (what ``dict(view)`` returns, built in one pass)."""
+        return {field: self.value(field, row) for field in self.fields}
+
+    def rows(self, rows):
+        """The fighters at positions ``rows``, in that order."""
+        return FighterRows(self, np.asarray(rows, dtype=np.int64))
@@ -0,0 +1,25 @@
+"""
+Gunicorn settings for the UFC Nerd backend.
+
+The app (and all of its DataFrames and derived tables) is preloaded once in
+the master process and shared copy-on-write with the forked workers.
+"""
+
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5001)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything allocated while loading the data into the permanent
+    # generation so the workers' garbage collector never writes to those pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Threads do not survive fork, so each worker starts its own data watcher
+    import app
+    app.dataset_manager.start_watching(app.DATA_WATCH_INTERVAL)
@@ -0,0 +1,203 @@
+"""
+Request and helper timing for the Flask backend.
+
+Every request is timed into a per-route latency histogram, and helpers
+decorated with ``Instrumentation.timed`` into per-helper histograms; both are
+exported in the Prometheus text format. Each response carries a
+Server-Timing header listing the helpers that ran and their durations.
+Recording is a perf_counter pair, a bisect and a locked increment.
+
+A single request can also be profiled: with the profile flag (``?profile=1``
+or an ``X-Profile: 1`` header) and an authorized caller, a background thread
+samples the request thread's stack every millisecond. The response is then
+replaced with the samples in the folded-stack format that flamegraph.pl and
+speedscope read. Requests without the flag never start the sampler.
+"""
+
+import bisect
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from flask import Response, g, has_request_context, request
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_INTERVAL = 0.001
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout."""
+
+    __slots__ = ('counts', 'total', 'count', 'lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self.lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.total, self.count
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread."""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self.running = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def _run(self):
+        while self.running.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+            time.sleep(self.interval)
+
+    def start(self):
+        self.running.set()
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+        self.thread.join()
+
+    def folded(self):
+        """Samples as 'frame;frame;frame count' lines, most frequent first."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Instrumentation:
+    """Per-route and per-helper timing, Server-Timing headers and opt-in profiling.
+
+    ``authorize_profiling`` is called per request and must return True before
+    a profile flag is honoured.
+    """
+
+    def __init__(self, authorize_profiling=lambda: False):
+        self.authorize_profiling = authorize_profiling
+        self.routes = {}
+        self.helpers = {}
+        self.lock = threading.Lock()
+        self.counters = {}
+
+    def _histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = table.setdefault(key, Histogram())
+        return histogram
+
+    def record(self, name, seconds):
+        """Record a helper duration and add it to this request's Server-Timing."""
+        self._histogram(self.helpers, name).observe(seconds)
+        if has_request_context():
+            g.setdefault('server_timing', []).append((name, seconds))
+
+    def timed(self, func=None, name=None):
+        """Decorate a helper so its calls are timed (``@timed`` or ``@timed(name=...)``)."""
+        if func is None:
+            return lambda f: self.timed(f, name)
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(label, time.perf_counter() - start)
+        return wrapper
+
+    def register_counter(self, name, description, read):
+        """Export ``read()`` as a Prometheus counter."""
+        self.counters[name] = (description, read)
+
+    def profiling_requested(self):
+        if not has_request_context():
+            return False
+        # Cheap pre-check so unflagged requests never parse the query string
+        if b'profile' not in request.query_string and 'X-Profile' not in request.headers:
+            return False
+        flag = request.args.get('profile') or request.headers.get('X-Profile')
+        return flag in ('1', 'true') and self.authorize_profiling()
+
+    def init_app(self, app):
+        """Install the request hooks and time JSON serialization."""
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.json.dumps = self.timed(app.json.dumps, name='json')
+
+    def _before_request(self):
+        g.request_start = time.perf_counter()
+        if self.profiling_requested():
+            g.profiler = StackSampler(threading.get_ident())
+            g.profiler.start()
+
+    def _after_request(self, response):
+        elapsed = time.perf_counter() - g.pop('request_start', time.perf_counter())
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        self._histogram(self.routes, (route, request.method, response.status_code)).observe(elapsed)
+
+        timings = [f'app;dur={elapsed * 1000:.2f}']
+        timings += [f'{name};dur={seconds * 1000:.2f}' for name, seconds in g.pop('server_timing', [])]
+        response.headers['Server-Timing'] = ', '.join(timings)
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            profile = Response(profiler.folded(), mimetype='text/plain')
+            profile.headers['Server-Timing'] = response.headers['Server-Timing']
+            profile.headers['X-Profile-Samples'] = str(sum(profiler.samples.values()))
+            profile.cache_control.no_store = True
+            return profile
+        return response
+
+    def _write_histograms(self, lines, metric, description, table, labels):
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} histogram')
+        for key, histogram in sorted(table.items(), key=lambda item: str(item[0])):
+            counts, total, count = histogram.snapshot()
+            base = ','.join(f'{label}="{_label(value)}"' for label, value in zip(labels, key))
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{base}}} {total:.6f}')
+            lines.append(f'{metric}_count{{{base}}} {count}')
+
+    def render_metrics(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        self._write_histograms(lines, 'ufc_request_duration_seconds', 'Request latency by route.',
+                               dict(self.routes), ('route', 'method', 'status'))
+        self._write_histograms(lines, 'ufc_helper_duration_seconds', 'Time spent in instrumented helpers.',
+                               {(name,): histogram for name, histogram in self.helpers.items()}, ('helper',))
+        for name, (description, read) in sorted(self.counters.items()):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} counter')
+            lines.append(f'{name} {read()}')
+        return '\n'.join(lines) + '\n'
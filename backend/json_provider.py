@@ -0,0 +1,110 @@
+"""
+Fast JSON encoding for Flask responses.
+
+``FastJSONProvider`` serializes with orjson when it is installed (falling back
+to the standard library otherwise) and understands the numpy and pandas
+values the analytics helpers produce: numpy scalars and arrays, Series (as
+an index -> value object), DataFrames (as a list of records), Timestamps,
+record views (any Mapping) and missing values (NaN, NaT and NA become
+null). Keys are sorted like Flask's default provider, so response bodies
+stay stable across versions.
+
+``frame_records`` turns a DataFrame into JSON-ready dicts column by column
+instead of boxing every cell through ``DataFrame.to_dict``.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _column_values(series):
+    """A column as a list of Python values, with None for missing entries."""
+    values = series.to_numpy()
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iub':
+        return values.tolist()
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind == 'f':
+        missing = np.isnan(values)
+        if not missing.any():
+            return values.tolist()
+        values = values.astype(object)
+        values[missing] = None
+        return values.tolist()
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind == 'M':
+        # datetime64[us] converts to datetime objects (NaT to None)
+        return values.astype('datetime64[us]').tolist()
+    return series.to_numpy(dtype=object, na_value=None).tolist()
+
+
+def frame_records(df):
+    """A DataFrame as a list of ``{column: value}`` dicts of Python values."""
+    columns = [str(column) for column in df.columns]
+    return [dict(zip(columns, row)) for row in zip(*(_column_values(df[column]) for column in df.columns))]
+
+
+def series_dict(series):
+    """A Series as an ``{index: value}`` dict of Python values."""
+    return dict(zip(series.index.tolist(), _column_values(series)))
+
+
+def _default(o):
+    """Encode the numpy/pandas values orjson and json do not handle themselves."""
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, pd.DataFrame):
+        return frame_records(o)
+    if isinstance(o, pd.Series):
+        return series_dict(o)
+    if isinstance(o, pd.Index):
+        return o.tolist()
+    if o is pd.NaT or o is pd.NA:
+        return None
+    if isinstance(o, pd.Timestamp):
+        return o.isoformat()
+    if isinstance(o, Mapping):
+        # Read-only record views such as fighter_store.FighterView
+        return o.to_dict() if hasattr(o, 'to_dict') else dict(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, with numpy/pandas-native encoding."""
+
+    default = staticmethod(_default)
+
+    def _orjson_options(self):
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # Callers passing json.dumps options (indent, cls, ...) get the stdlib encoder
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.dumps(obj, default=_default, option=self._orjson_options()).decode()
+            except orjson.JSONEncodeError:
+                # e.g. integers wider than 64 bits, which only the stdlib encoder handles
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # The default implementation passes separators/indent, which would force the stdlib path
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(f"{self.dumps(obj)}\n", mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
@@ -0,0 +1,115 @@
+"""
+Precomputed rank indexes for top-N fighter leaderboards.
+
+For every leaderboard metric the fighters are ranked once per dataset
+version (descending, ties in the metric table's win-rate order). For every
+filter dimension (weight class, country, category) that ranking is also
+split into one posting list per value, in CSR layout: the fighters of one
+weight class, already in rank order, are a contiguous slice. A request with
+a single dimension filter is therefore a slice of a precomputed array and
+the first ``k`` results cost O(k). Additional filters (a second dimension
+or a minimum number of fights) are a vectorized mask over the smallest
+matching posting list.
+"""
+
+import numpy as np
+import pandas as pd
+
+from fighter_store import FighterRows
+
+METRICS = ('win_rate', 'finish_rate', 'total_fights', 'wins', 'ko_tko_wins', 'submission_wins', 'recent_fights')
+DIMENSIONS = ('weight_class', 'country', 'category')
+
+
+class Leaderboards:
+    """Rank indexes over a FighterStore.
+
+    ``weight_classes`` holds each store row's weight class (None when
+    unknown); country and category come from the store's coded columns.
+    """
+
+    def __init__(self, store, weight_classes=None):
+        self.store = store
+        # dimension -> (levels, per-row codes); codes index levels, -1 when missing
+        self.dimensions = {}
+        for dimension in DIMENSIONS:
+            if dimension in store.levels:
+                self.dimensions[dimension] = (store.levels[dimension], store.column(dimension))
+        if weight_classes is not None:
+            codes, levels = pd.factorize(pd.Series(weight_classes, dtype=object))
+            self.dimensions['weight_class'] = (tuple(str(level) for level in levels), codes.astype(np.int32))
+        self.codes = {
+            dimension: {level: code for code, level in enumerate(levels)}
+            for dimension, (levels, _) in self.dimensions.items()
+        }
+
+        self.orders = {}
+        self.postings = {}
+        for metric in METRICS:
+            if metric not in store.columns:
+                continue
+            order = np.argsort(-store.column(metric).astype('float64'), kind='stable')
+            order.setflags(write=False)
+            self.orders[metric] = order
+            for dimension, (levels, codes) in self.dimensions.items():
+                ranked_codes = codes[order]
+                # Stable sort by value keeps each value's fighters in rank order
+                grouped = np.argsort(ranked_codes, kind='stable')
+                grouped = grouped[ranked_codes[grouped] >= 0]
+                offsets = np.searchsorted(ranked_codes[grouped], np.arange(len(levels) + 1))
+                rows = order[grouped]
+                rows.setflags(write=False)
+                self.postings[metric, dimension] = (offsets, rows)
+
+    @property
+    def metrics(self):
+        return tuple(self.orders)
+
+    def values(self, dimension):
+        """The values ``dimension`` can be filtered on."""
+        return sorted(self.dimensions[dimension][0])
+
+    def _posting(self, metric, dimension, value):
+        code = self.codes[dimension].get(value)
+        if code is None:
+            return self.orders[metric][:0]
+        offsets, rows = self.postings[metric, dimension]
+        return rows[offsets[code]:offsets[code + 1]]
+
+    def ranked(self, metric, min_fights=0, **filters):
+        """Fighters ranked by ``metric`` among those matching every filter.
+
+        ``filters`` maps a dimension to the required value (None to skip).
+        Raises KeyError for an unknown metric or dimension.
+        """
+        order = self.orders[metric]
+        filters = {dimension: value for dimension, value in filters.items() if value is not None}
+        for dimension in filters:
+            if dimension not in self.dimensions:
+                raise KeyError(dimension)
+
+        # Start from the smallest posting list; the other filters mask it
+        candidates, chosen = order, None
+        for dimension, value in filters.items():
+            posting = self._posting(metric, dimension, value)
+            if chosen is None or len(posting) < len(candidates):
+                candidates, chosen = posting, dimension
+
+        mask = None
+        for dimension, value in filters.items():
+            if dimension == chosen:
+                continue
+            # -2 matches no row (missing values are coded -1)
+            code = self.codes[dimension].get(value, -2)
+            matches = self.dimensions[dimension][1][candidates] == code
+            mask = matches if mask is None else mask & matches
+        if min_fights:
+            matches = self.store.column('total_fights')[candidates] >= min_fights
+            mask = matches if mask is None else mask & matches
+        if mask is not None:
+            candidates = candidates[mask]
+        return FighterRows(self.store, candidates)
+
+    def top(self, metric, limit, **filters):
+        """The first ``limit`` fighters of ``ranked(metric, **filters)``."""
+        return self.ranked(metric, **filters)[:limit]
@@ -0,0 +1,415 @@
+"""
+Championship lineage engine built on ufc-master.csv.
+
+Title reigns are derived per weight class in one date-sorted pass over the
+title bouts, and post-reign records are answered from a per-fighter index of
+fight positions, so "fights after date X" is a binary search and a slice
+rather than a mask over the whole master frame. Running win/loss counts and
+streak lengths are kept alongside every posting, so a fighter's record or
+streak as of any date (or between two dates) also costs one binary search.
+
+Large batches of record queries (many what-if lineage variants at once) can
+be spread over a process pool with ``batch_records_after``. The workers are
+forked after the index is built, so they share one read-only copy of it.
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+# The ufc-master.csv columns the lineage reads
+MASTER_COLUMNS = ['RedFighter', 'BlueFighter', 'Date', 'Winner', 'TitleBout', 'WeightClass']
+
+# Per-posting fight result, from the fighter's point of view
+WIN, LOSS, OTHER = 1, -1, 0
+RESULT_NAMES = {WIN: 'win', LOSS: 'loss', OTHER: 'draw'}
+
+# Below this many queries a process pool costs more than it saves; only consulted
+# when the worker count is left to batch_records_after
+MIN_PARALLEL_QUERIES = 2000
+
+
+class FightIndex:
+    """Date-sorted view of ufc-master.csv with per-fighter posting lists.
+
+    Fights are stored as parallel arrays sorted by date. Every fighter maps
+    to a contiguous slice of ``positions`` (CSR layout) listing the rows they
+    fought in, in date order. Parallel to ``positions``, ``results`` holds
+    the fighter's result in each fight, ``cumulative_wins``/``_losses`` the
+    running totals (with a leading zero) and ``streaks`` the length of the
+    run of equal results ending at each fight.
+    """
+
+    def __init__(self, master_df):
+        if master_df.empty:
+            master_df = pd.DataFrame(columns=['RedFighter', 'BlueFighter', 'Date', 'Winner'])
+
+        dates = pd.to_datetime(master_df['Date'])
+        order = np.argsort(dates.to_numpy(), kind='stable')
+
+        self.dates = dates.to_numpy()[order]
+        self.red = master_df['RedFighter'].to_numpy(dtype=object)[order]
+        self.blue = master_df['BlueFighter'].to_numpy(dtype=object)[order]
+        self.winner = master_df['Winner'].to_numpy(dtype=object)[order]
+        self.source_rows = master_df.index.to_numpy()[order]
+
+        n_fights = len(order)
+        names = np.concatenate([self.red, self.blue])
+        rows = np.concatenate([np.arange(n_fights), np.arange(n_fights)])
+        codes, self.fighters = pd.factorize(names)
+
+        # Group positions by fighter, keeping date order inside each group
+        by_fighter = np.lexsort((rows, codes))
+        self.positions = rows[by_fighter]
+        self.offsets = np.searchsorted(codes[by_fighter], np.arange(len(self.fighters) + 1))
+        self.fighter_codes = {name: code for code, name in enumerate(self.fighters)}
+        self._index_results()
+
+    def _index_results(self):
+        """Compute the per-posting results, running totals and streak lengths."""
+        counts = np.diff(self.offsets)
+        posting_names = np.repeat(np.asarray(self.fighters, dtype=object), counts)
+        is_red = self.red[self.positions] == posting_names
+        winner = self.winner[self.positions]
+        won = np.where(is_red, winner == 'Red', winner == 'Blue')
+        lost = np.where(is_red, winner == 'Blue', winner == 'Red')
+        self.results = np.where(won, WIN, np.where(lost, LOSS, OTHER)).astype(np.int8)
+        self.cumulative_wins = np.concatenate([[0], np.cumsum(won)]).astype(np.int32)
+        self.cumulative_losses = np.concatenate([[0], np.cumsum(lost)]).astype(np.int32)
+
+        # A run starts at each fighter's first fight and wherever the result changes
+        entries = np.arange(len(self.positions))
+        run_start = np.ones(len(entries), dtype=bool)
+        run_start[1:] = self.results[1:] != self.results[:-1]
+        run_start[self.offsets[:-1][counts > 0]] = True
+        self.streaks = (entries - np.maximum.accumulate(np.where(run_start, entries, 0)) + 1).astype(np.int32)
+
+    def extended(self, delta_df):
+        """Return a new index with the fights in ``delta_df`` added.
+
+        When every new fight is dated on or after the latest indexed fight
+        (the normal append-only case) only the new fights are sorted and
+        factorized, and they are spliced onto the end of each fighter's
+        posting list. Back-dated fights fall back to a full rebuild.
+        """
+        delta = FightIndex(delta_df)
+        if not len(delta):
+            return self
+        if len(self) and delta.dates[0] < self.dates[-1]:
+            return FightIndex(pd.concat([self.to_frame(), delta.to_frame()], ignore_index=True))
+
+        index = FightIndex.__new__(FightIndex)
+        index.dates = np.concatenate([self.dates, delta.dates])
+        index.red = np.concatenate([self.red, delta.red])
+        index.blue = np.concatenate([self.blue, delta.blue])
+        index.winner = np.concatenate([self.winner, delta.winner])
+        index.source_rows = np.concatenate([self.source_rows, delta.source_rows + len(self)])
+
+        # Map the delta's fighters onto existing codes, appending unseen fighters
+        index.fighter_codes = dict(self.fighter_codes)
+        new_names = []
+        codes = np.empty(len(delta.fighters), dtype=np.int64)
+        for delta_code, name in enumerate(delta.fighters):
+            code = index.fighter_codes.get(name)
+            if code is None:
+                code = index.fighter_codes[name] = len(self.fighters) + len(new_names)
+                new_names.append(name)
+            codes[delta_code] = code
+        index.fighters = np.concatenate([self.fighters, np.array(new_names, dtype=object)])
+
+        # Delta postings as (code, position) pairs sorted by fighter then date
+        delta_counts = np.diff(delta.offsets)
+        entry_codes = np.repeat(codes, delta_counts)
+        entry_positions = delta.positions + len(self)
+        order = np.lexsort((entry_positions, entry_codes))
+        entry_codes, entry_positions = entry_codes[order], entry_positions[order]
+
+        n_fighters = len(index.fighters)
+        old_offsets = np.concatenate([self.offsets, np.full(len(new_names), self.offsets[-1])])
+        index.positions = np.insert(self.positions, old_offsets[entry_codes + 1], entry_positions)
+        index.offsets = old_offsets + np.searchsorted(entry_codes, np.arange(n_fighters + 1))
+        index._index_results()
+        return index
+
+    def to_frame(self):
+        """The indexed fights as a date-sorted master-style frame."""
+        return pd.DataFrame({
+            'RedFighter': self.red, 'BlueFighter': self.blue,
+            'Date': self.dates, 'Winner': self.winner,
+        })
+
+    def __len__(self):
+        return len(self.dates)
+
+    def fights_for(self, name):
+        """Date-ordered fight positions for a fighter (empty if unknown)."""
+        code = self.fighter_codes.get(name)
+        if code is None:
+            return self.positions[:0]
+        return self.positions[self.offsets[code]:self.offsets[code + 1]]
+
+    def fights_after(self, name, date):
+        """Fight positions strictly after ``date`` for a fighter."""
+        positions = self.fights_for(name)
+        start = np.searchsorted(self.dates[positions], np.datetime64(pd.Timestamp(date)), side='right')
+        return positions[start:]
+
+    def posting_range(self, name, after=None, through=None):
+        """The slice of ``positions`` for a fighter's fights after ``after`` and up to ``through``.
+
+        Both bounds are optional; ``through`` is inclusive and ``after`` is
+        exclusive. An unknown fighter gives an empty slice.
+        """
+        code = self.fighter_codes.get(name)
+        if code is None:
+            return slice(0, 0)
+        start, end = int(self.offsets[code]), int(self.offsets[code + 1])
+        dates = self.dates[self.positions[start:end]]
+        first, last = start, end
+        if after is not None:
+            first = start + int(np.searchsorted(dates, np.datetime64(pd.Timestamp(after)), side='right'))
+        if through is not None:
+            last = start + int(np.searchsorted(dates, np.datetime64(pd.Timestamp(through)), side='right'))
+        return slice(first, max(first, last))
+
+    def _postings(self, name, after=None, through=None):
+        """Indexer into ``positions``/``results`` for a fighter's fights after ``after`` and up to ``through``.
+
+        ``name`` is one name (giving a slice) or a list of spellings of one
+        fighter, whose postings are merged in date order (giving an array).
+        """
+        if isinstance(name, str):
+            return self.posting_range(name, after, through)
+        ranges = [self.posting_range(spelling, after, through) for spelling in name]
+        entries = np.concatenate([np.arange(postings.start, postings.stop) for postings in ranges] or [[]]).astype(np.int64)
+        return entries[np.argsort(self.positions[entries], kind='stable')]
+
+    def record_between(self, name, after=None, through=None):
+        """Return (wins, losses, draws) for a fighter's fights after ``after`` and up to ``through``.
+
+        ``name`` may also be a list of spellings of one fighter.
+        """
+        if not isinstance(name, str):
+            records = [self.record_between(spelling, after, through) for spelling in name]
+            return tuple(sum(counts) for counts in zip(*records)) if records else (0, 0, 0)
+        postings = self.posting_range(name, after, through)
+        wins = int(self.cumulative_wins[postings.stop] - self.cumulative_wins[postings.start])
+        losses = int(self.cumulative_losses[postings.stop] - self.cumulative_losses[postings.start])
+        return wins, losses, postings.stop - postings.start - wins - losses
+
+    def record_as_of(self, name, date=None):
+        """Return (wins, losses, draws) for a fighter's fights on or before ``date``."""
+        return self.record_between(name, through=date)
+
+    def streak_as_of(self, name, date=None):
+        """The fighter's current run as of ``date``: (result name, length), or (None, 0) before any fight."""
+        postings = self._postings(name, through=date)
+        if isinstance(postings, slice):
+            if postings.stop == postings.start:
+                return None, 0
+            last = postings.stop - 1
+            return RESULT_NAMES[int(self.results[last])], int(self.streaks[last])
+        # Merged spellings: the stored streaks are per name, so count the final run directly
+        results = self.results[postings]
+        if not len(results):
+            return None, 0
+        changes = np.flatnonzero(results != results[-1])
+        return RESULT_NAMES[int(results[-1])], int(len(results) - (changes[-1] + 1 if len(changes) else 0))
+
+    def history(self, name, after=None, through=None):
+        """A fighter's fights after ``after`` and up to ``through`` as dicts, oldest first."""
+        postings = self._postings(name, after, through)
+        positions = self.positions[postings]
+        is_red = self.red[positions] == name if isinstance(name, str) else np.isin(self.red[positions], list(name))
+        opponents = np.where(is_red, self.blue[positions], self.red[positions])
+        return [
+            {'date': date, 'opponent': opponent, 'corner': 'red' if red else 'blue', 'result': RESULT_NAMES[result]}
+            for date, opponent, red, result in zip(
+                np.datetime_as_string(self.dates[positions], unit='D').tolist(), opponents.tolist(),
+                is_red.tolist(), self.results[postings].tolist())
+        ]
+
+    def opponents_before(self, name, date):
+        """Names of everyone the fighter fought strictly before ``date``, oldest first."""
+        return [fight['opponent'] for fight in self.history(name, through=pd.Timestamp(date) - pd.Timedelta(1))]
+
+    def outcomes(self, name, positions):
+        """Return (wins, losses, draws) for a fighter over the given positions."""
+        is_red = self.red[positions] == name
+        winner = self.winner[positions]
+        won = np.where(is_red, winner == 'Red', winner == 'Blue')
+        lost = np.where(is_red, winner == 'Blue', winner == 'Red')
+        wins = int(won.sum())
+        losses = int(lost.sum())
+        return wins, losses, len(positions) - wins - losses
+
+    def record_after(self, name, date):
+        """Return (wins, losses, draws) for a fighter's fights after ``date``."""
+        return self.record_between(name, after=date)
+
+
+# The FightIndex of a pool worker, set once by the pool initializer
+_worker_index = None
+
+
+def _init_worker(fight_index):
+    global _worker_index
+    _worker_index = fight_index
+
+
+def _records_after_chunk(queries):
+    records = np.empty((len(queries), 3), dtype=np.int64)
+    for i, (name, date) in enumerate(queries):
+        records[i] = _worker_index.record_after(name, date)
+    return records
+
+
+def batch_records_after(fight_index, queries, workers=1):
+    """(wins, losses, draws) for every ``(name, date)`` query, in query order.
+
+    With ``workers`` > 1 the queries are split into contiguous chunks and
+    answered by a process pool of that size. Where the platform can fork,
+    the workers inherit ``fight_index`` instead of receiving a pickled copy.
+    Chunks are merged in order, so the result does not depend on the number
+    of workers. With ``workers`` None (or 0) every core is used, but only
+    for batches of at least MIN_PARALLEL_QUERIES; smaller ones are answered
+    in-process, where a query costs microseconds.
+    """
+    queries = list(queries)
+    if not workers:
+        workers = (os.cpu_count() or 1) if len(queries) >= MIN_PARALLEL_QUERIES else 1
+    workers = min(workers, len(queries))
+    if workers <= 1:
+        return [fight_index.record_after(name, date) for name, date in queries]
+
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+    context = multiprocessing.get_context(method)
+    chunk_size = -(-len(queries) // (workers * 4))
+    chunks = [queries[start:start + chunk_size] for start in range(0, len(queries), chunk_size)]
+    with context.Pool(workers, initializer=_init_worker, initargs=(fight_index,)) as pool:
+        records = np.concatenate(pool.map(_records_after_chunk, chunks))
+    return [tuple(record) for record in records.tolist()]
+
+
+def _title_bout_rows(master_df):
+    columns = ['RedFighter', 'BlueFighter', 'Date', 'Winner', 'WeightClass', 'TitleBout']
+    if master_df.empty or 'TitleBout' not in master_df.columns:
+        return pd.DataFrame(columns=columns)
+    title_bouts = master_df[(master_df['TitleBout'] == True) & master_df['Winner'].isin(['Red', 'Blue'])]
+    return title_bouts.reindex(columns=columns).reset_index(drop=True)
+
+
+def build_title_reigns(master_df):
+    """Build per-weight-class title reigns from the title bouts.
+
+    Returns one row per reign with the champion, the weight class, the date
+    the reign started, the number of successful title bouts after winning
+    it, and (for reigns that ended in the cage) the date and opponent of the
+    loss.
+    """
+    columns = ['weight_class', 'champion', 'won_date', 'title_defenses', 'lost_date', 'lost_to']
+    if master_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    title_bouts = master_df[(master_df['TitleBout'] == True) & master_df['Winner'].isin(['Red', 'Blue'])]
+    if title_bouts.empty:
+        return pd.DataFrame(columns=columns)
+
+    dates = pd.to_datetime(title_bouts['Date'])
+    order = np.argsort(dates.to_numpy(), kind='stable')
+    bouts = pd.DataFrame({
+        'weight_class': title_bouts['WeightClass'].to_numpy()[order],
+        'date': dates.to_numpy()[order],
+        'winner': np.where(
+            title_bouts['Winner'].to_numpy()[order] == 'Red',
+            title_bouts['RedFighter'].to_numpy()[order],
+            title_bouts['BlueFighter'].to_numpy()[order]
+        ),
+    })
+
+    previous = bouts.groupby('weight_class', sort=False)['winner'].shift()
+    bouts['new_reign'] = previous.isna() | (previous != bouts['winner'])
+    bouts['reign_id'] = bouts.groupby('weight_class', sort=False)['new_reign'].cumsum()
+
+    reigns = bouts.groupby(['weight_class', 'reign_id'], sort=False).agg(
+        champion=('winner', 'first'),
+        won_date=('date', 'first'),
+        title_bouts=('date', 'size'),
+    ).reset_index()
+    reigns['title_defenses'] = reigns.pop('title_bouts') - 1
+
+    # The start of the next reign in a weight class is the end of the previous one
+    next_reign = reigns.groupby('weight_class', sort=False)[['champion', 'won_date']].shift(-1)
+    reigns['lost_date'] = next_reign['won_date']
+    reigns['lost_to'] = next_reign['champion']
+
+    return reigns.sort_values('won_date', kind='stable').reset_index(drop=True)[columns]
+
+
+def identify_former_champions(reigns):
+    """Map each champion who lost a belt to their first title loss.
+
+    Champions are returned in the order of that first loss.
+    """
+    lost = reigns[reigns['lost_date'].notna()].sort_values('lost_date', kind='stable')
+    lost = lost.drop_duplicates('champion', keep='first')
+    return {
+        reign.champion: {
+            'name': reign.champion,
+            'weight_class': reign.weight_class,
+            'lost_belt_date': reign.lost_date,
+            'lost_to': reign.lost_to,
+        }
+        for reign in lost.itertuples(index=False)
+    }
+
+
+def calculate_post_reign_records(fight_index, former_champions, workers=1):
+    """Attach wins/losses/draws after the title loss to each former champion.
+
+    ``former_champions`` is an iterable of dicts with ``name`` and
+    ``lost_belt_date``; new dicts are returned and the input is left as-is.
+    ``workers`` is passed to ``batch_records_after``.
+    """
+    former_champions = list(former_champions)
+    outcomes = batch_records_after(
+        fight_index, [(champion['name'], champion['lost_belt_date']) for champion in former_champions], workers
+    )
+    records = []
+    for champion, (wins, losses, draws) in zip(former_champions, outcomes):
+        records.append({
+            **champion,
+            'wins_after_belt': wins,
+            'losses_after_belt': losses,
+            'draws_after_belt': draws,
+            'total_fights_after_belt': wins + losses + draws,
+        })
+    return records
+
+
+class ChampionshipLineage:
+    """Title reigns, former champions and post-reign records for one dataset."""
+
+    def __init__(self, master_df, fight_index=None):
+        self.fight_index = FightIndex(master_df) if fight_index is None else fight_index
+        self.title_bouts = _title_bout_rows(master_df)
+        self.reigns = build_title_reigns(self.title_bouts)
+        self.former_champions = identify_former_champions(self.reigns)
+        self.post_reign_records = calculate_post_reign_records(
+            self.fight_index, self.former_champions.values()
+        )
+
+    def extended(self, delta_df):
+        """Return the lineage with the master rows in ``delta_df`` added.
+
+        Only the new fights are indexed; reigns are re-derived from the
+        (small) set of title bouts rather than the whole master frame.
+        """
+        title_bouts = _title_bout_rows(delta_df)
+        if not title_bouts.empty:
+            title_bouts = pd.concat([self.title_bouts, title_bouts], ignore_index=True)
+        else:
+            title_bouts = self.title_bouts
+        return ChampionshipLineage(title_bouts, fight_index=self.fight_index.extended(delta_df))
@@ -0,0 +1,225 @@
+"""
+Fight outcome predictions for the bouts in upcoming.csv.
+
+The model is a logistic regression on the corner differences that
+ufc-master.csv and upcoming.csv share (streaks, record, size, age, striking
+and grappling averages) plus the betting market's view from the moneyline
+odds. It is trained offline with ``train_outcome_model.py`` and saved as
+a small JSON artifact (data/outcome_model.json) holding the feature names,
+their standardization and the coefficients. Scoring a card is then one
+matrix-vector product over the card's feature matrix.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+MODEL_FILE = 'outcome_model.json'
+MODEL_VERSION = 1
+
+# Blue-minus-red differences, as published in both files
+DIFFERENCE_FEATURES = [
+    'WinStreakDif', 'LoseStreakDif', 'LongestWinStreakDif', 'WinDif', 'LossDif', 'TotalRoundDif',
+    'TotalTitleBoutDif', 'KODif', 'SubDif', 'HeightDif', 'ReachDif', 'AgeDif', 'SigStrDif',
+    'AvgSubAttDif', 'AvgTDDif',
+]
+# Log-odds of the red corner winning, implied by the moneylines with the bookmaker margin removed
+ODDS_FEATURE = 'OddsLogit'
+FEATURES = DIFFERENCE_FEATURES + [ODDS_FEATURE]
+
+# Columns read from ufc-master.csv/upcoming.csv: the bout, its odds and the differences
+INPUT_COLUMNS = ['RedFighter', 'BlueFighter', 'Date', 'WeightClass', 'TitleBout', 'RedOdds', 'BlueOdds',
+                 *DIFFERENCE_FEATURES]
+TRAINING_COLUMNS = INPUT_COLUMNS + ['Winner']
+
+L2_PENALTY = 1.0
+HOLDOUT_FRACTION = 0.2
+
+
+def implied_probability(odds):
+    """Win probability implied by American moneyline odds (NaN where missing or invalid)."""
+    odds = np.asarray(odds, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        probability = np.where(odds < 0, -odds / (100.0 - odds), 100.0 / (odds + 100.0))
+    return np.where(np.abs(odds) >= 100, probability, np.nan)
+
+
+def market_probability(df):
+    """The market's probability of a red win, normalized so both corners sum to one."""
+    red = implied_probability(df['RedOdds'])
+    blue = implied_probability(df['BlueOdds'])
+    return red / (red + blue)
+
+
+def feature_matrix(df):
+    """The bouts in ``df`` as a float64 matrix with one column per name in FEATURES (NaN = missing)."""
+    matrix = np.empty((len(df), len(FEATURES)), dtype=np.float64)
+    for position, column in enumerate(DIFFERENCE_FEATURES):
+        matrix[:, position] = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    probability = np.clip(market_probability(df), 1e-4, 1 - 1e-4)
+    matrix[:, -1] = np.log(probability / (1 - probability))
+    return matrix
+
+
+def _sigmoid(values):
+    return 1.0 / (1.0 + np.exp(-values))
+
+
+def _standardized(matrix, mean, scale):
+    """Standardize columns; missing values become 0, i.e. the training mean."""
+    standardized = (matrix - mean) / scale
+    standardized[np.isnan(standardized)] = 0.0
+    return standardized
+
+
+def fit_logistic(matrix, outcomes, l2=L2_PENALTY, iterations=50):
+    """Fit an L2-regularized logistic regression by Newton's method.
+
+    Returns ``(mean, scale, coef, intercept)``; the coefficients apply to the
+    standardized features and the intercept is not penalized.
+    """
+    mean = np.nanmean(matrix, axis=0)
+    scale = np.nanstd(matrix, axis=0)
+    mean[np.isnan(mean)] = 0.0
+    scale[~(scale > 0)] = 1.0
+    design = np.column_stack([np.ones(len(matrix)), _standardized(matrix, mean, scale)])
+    penalty = np.full(design.shape[1], l2)
+    penalty[0] = 0.0
+
+    weights = np.zeros(design.shape[1])
+    for _ in range(iterations):
+        probability = _sigmoid(design @ weights)
+        gradient = design.T @ (probability - outcomes) + penalty * weights
+        hessian = (design * (probability * (1 - probability))[:, None]).T @ design + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        weights -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return mean, scale, weights[1:], weights[0]
+
+
+def _metrics(probability, outcomes):
+    probability = np.clip(probability, 1e-12, 1 - 1e-12)
+    return {
+        'accuracy': round(float(((probability >= 0.5) == outcomes).mean()), 4),
+        'log_loss': round(float(-np.mean(outcomes * np.log(probability) + (1 - outcomes) * np.log(1 - probability))), 4),
+    }
+
+
+class OutcomeModel:
+    """Logistic regression over FEATURES giving the probability of a red corner win."""
+
+    def __init__(self, features, mean, scale, coef, intercept, metrics=None, trained_at=None, training_fights=0):
+        self.features = list(features)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.metrics = metrics or {}
+        self.trained_at = trained_at
+        self.training_fights = training_fights
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != MODEL_VERSION or data.get('features') != FEATURES:
+            raise ValueError('outcome model was trained for a different feature set; retrain it')
+        return cls(data['features'], data['mean'], data['scale'], data['coef'], data['intercept'],
+                   data.get('metrics'), data.get('trained_at'), data.get('training_fights', 0))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        return {
+            'version': MODEL_VERSION,
+            'features': self.features,
+            'mean': self.mean.tolist(),
+            'scale': self.scale.tolist(),
+            'coef': self.coef.tolist(),
+            'intercept': self.intercept,
+            'metrics': self.metrics,
+            'trained_at': self.trained_at,
+            'training_fights': self.training_fights,
+        }
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary(self):
+        """What the API reports about the model."""
+        return {
+            'type': 'logistic_regression',
+            'features': self.features,
+            'trained_at': self.trained_at,
+            'training_fights': self.training_fights,
+            'metrics': self.metrics,
+        }
+
+    def predict(self, df):
+        """Probability of a red corner win for every bout in ``df``."""
+        return _sigmoid(_standardized(feature_matrix(df), self.mean, self.scale) @ self.coef + self.intercept)
+
+
+def train_outcome_model(master_df, holdout_fraction=HOLDOUT_FRACTION, l2=L2_PENALTY):
+    """Train on the decided fights in ``master_df`` (TRAINING_COLUMNS).
+
+    The most recent ``holdout_fraction`` of fights is held out to measure
+    the model (and the odds favourite, for comparison); the returned model
+    is then refitted on every fight.
+    """
+    fights = master_df[master_df['Winner'].isin(['Red', 'Blue'])].sort_values('Date', kind='stable')
+    matrix = feature_matrix(fights)
+    outcomes = (fights['Winner'] == 'Red').to_numpy(dtype=np.float64)
+
+    metrics = {}
+    n_train = int(len(fights) * (1 - holdout_fraction))
+    if 0 < n_train < len(fights):
+        held_out = OutcomeModel(FEATURES, *fit_logistic(matrix[:n_train], outcomes[:n_train], l2))
+        holdout = fights.iloc[n_train:]
+        market = market_probability(holdout)
+        has_odds = ~np.isnan(market)
+        metrics = {
+            'holdout_fights': len(holdout),
+            'holdout_from': holdout['Date'].iloc[0].strftime('%Y-%m-%d'),
+            **_metrics(held_out.predict(holdout), outcomes[n_train:]),
+            'odds_favourite_accuracy': round(float(((market[has_odds] >= 0.5) == outcomes[n_train:][has_odds]).mean()), 4),
+        }
+
+    return OutcomeModel(FEATURES, *fit_logistic(matrix, outcomes, l2), metrics=metrics,
+                        trained_at=datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                        training_fights=len(fights))
+
+
+def load_outcome_model(data_path):
+    """The model saved in ``data_path``, or None if there is none."""
+    path = os.path.join(data_path, MODEL_FILE) if data_path else None
+    if path is None or not os.path.exists(path):
+        return None
+    return OutcomeModel.load(path)
+
+
+def predict_card(model, upcoming_df):
+    """Score every bout in ``upcoming_df`` at once; one record per bout, in card order."""
+    if upcoming_df.empty:
+        return []
+    red = model.predict(upcoming_df)
+    market = market_probability(upcoming_df)
+    return [{
+        'red_fighter': red_fighter,
+        'blue_fighter': blue_fighter,
+        'date': date.strftime('%Y-%m-%d') if not pd.isna(date) else None,
+        'weight_class': weight_class if not pd.isna(weight_class) else None,
+        'title_bout': bool(title_bout) if not pd.isna(title_bout) else None,
+        'red_win_probability': round(probability, 4),
+        'blue_win_probability': round(1 - probability, 4),
+        'predicted_winner': red_fighter if probability >= 0.5 else blue_fighter,
+        'market_red_probability': round(implied, 4) if implied == implied else None,
+    } for red_fighter, blue_fighter, date, weight_class, title_bout, probability, implied in zip(
+        upcoming_df['RedFighter'], upcoming_df['BlueFighter'], upcoming_df['Date'], upcoming_df['WeightClass'],
+        upcoming_df['TitleBout'], red.tolist(), market.tolist())]
@@ -0,0 +1,270 @@
+"""
+Elo ratings replayed over the fight history in fights.csv.
+
+Fights are rated in date order: events.csv gives each fight its date and
+the card's match number orders the fights of one night. An Elo update only
+depends on the two fighters' current ratings, so the replay groups fights
+into waves. A fight's wave is one more than the latest wave either fighter
+has fought in. No fighter appears twice in a wave, so each wave is applied
+as one vectorized NumPy update. Applying the waves in order gives exactly
+the ratings of a fight-by-fight replay.
+
+Every rated fight keeps both fighters' ratings before and after it, which
+makes up each fighter's rating history. Fights appended after the last
+rated date continue from the stored ratings and waves (``extended``), so a
+fight night is rated without replaying the history.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+# fights.csv ``winner`` value -> the left fighter's score; missing values are not rated
+LEFT_SCORES = {'L': 1.0, 'R': 0.0, 'D': 0.5}
+RESULT_NAMES = {1.0: 'win', 0.0: 'loss', 0.5: 'draw'}
+# fights.csv records no contests as ``winner == 'D'``; their ``method`` tells them apart from draws
+NO_CONTEST_METHODS = ('No Contest', 'Overturned')
+
+
+def no_contests(fights_df):
+    """Boolean mask of the fights in ``fights_df`` ruled a no contest (or overturned to one)."""
+    if 'method' not in fights_df.columns:
+        return pd.Series(False, index=fights_df.index)
+    return fights_df['method'].astype(object).fillna('').astype(str).str.startswith(NO_CONTEST_METHODS)
+
+
+def fight_dates(fights_df, events_df):
+    """Date of each fight's event (NaT when the event is unknown)."""
+    if 'event_id' not in fights_df.columns or events_df.empty or 'date' not in events_df.columns:
+        return pd.Series(pd.NaT, index=fights_df.index, dtype='datetime64[ns]')
+    event_dates = pd.Series(events_df['date'].to_numpy(), index=events_df['event_id'].to_numpy())
+    event_dates = event_dates[~event_dates.index.duplicated()]
+    return pd.to_datetime(fights_df['event_id'].map(event_dates))
+
+
+def _rated_fights(fights_df, events_df):
+    """The ratable fights in replay order, with their dates and left-corner scores.
+
+    ``unmatched_events`` are the event ids of fights left out for lack of a date.
+    """
+    columns = ['fight_id', 'left_fighter_id', 'left_fighter_name', 'right_fighter_id', 'right_fighter_name']
+    if fights_df.empty or any(column not in fights_df.columns for column in columns + ['winner']):
+        empty = pd.DataFrame({column: pd.Series(dtype=object) for column in columns})
+        empty['date'] = pd.Series(dtype='datetime64[ns]')
+        empty['score'] = pd.Series(dtype='float64')
+        return empty, set()
+
+    fights = fights_df[columns].copy()
+    fights['date'] = fight_dates(fights_df, events_df)
+    fights['score'] = fights_df['winner'].astype(object).map(LEFT_SCORES).mask(no_contests(fights_df))
+    fights['event_id'] = fights_df['event_id'] if 'event_id' in fights_df.columns else None
+    fights['match'] = fights_df['match'] if 'match' in fights_df.columns else 0
+    unmatched_events = set(fights['event_id'][fights['date'].isna()].dropna())
+
+    ratable = (fights['date'].notna() & fights['score'].notna()
+               & fights['left_fighter_id'].notna() & fights['right_fighter_id'].notna()
+               & (fights['left_fighter_id'] != fights['right_fighter_id']))
+    fights = fights[ratable].sort_values(['date', 'event_id', 'match'], kind='stable')
+    return fights.drop(columns=['event_id', 'match']), unmatched_events
+
+
+class RatedFighters(Sequence):
+    """A ranked selection of fighters; items are rating summaries with their ``rank``."""
+
+    __slots__ = ('ratings', 'codes')
+
+    def __init__(self, ratings, codes):
+        self.ratings = ratings
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start = index.indices(len(self.codes))[0]
+            return [{'rank': start + position + 1, **self.ratings.fighter(code)}
+                    for position, code in enumerate(self.codes[index].tolist())]
+        position = range(len(self.codes))[index]
+        return {'rank': position + 1, **self.ratings.fighter(int(self.codes[position]))}
+
+
+class EloRatings:
+    """Elo ratings of every fighter in fights.csv, with their history.
+
+    Fighters are identified by ``fighter_id`` and mapped to integer codes
+    (``codes``); ``ratings``, ``peaks``, ``fight_counts`` and ``last_dates``
+    are per-code arrays. Rated fights are stored as parallel arrays in
+    replay order: ``left``/``right`` codes, the left fighter's ``scores``
+    and both fighters' ratings before each fight.
+    """
+
+    def __init__(self, fights_df, events_df, k_factor=K_FACTOR, initial_rating=INITIAL_RATING):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        fights, self.unmatched_events = _rated_fights(fights_df, events_df)
+
+        self.fighter_ids = np.empty(0, dtype=object)
+        self.names = np.empty(0, dtype=object)
+        self.codes = {}
+        self.ratings = np.empty(0, dtype=np.float64)
+        self.peaks = np.empty(0, dtype=np.float64)
+        self.fight_counts = np.empty(0, dtype=np.int32)
+        self.last_dates = np.empty(0, dtype='datetime64[ns]')
+        self.last_waves = np.empty(0, dtype=np.int64)
+
+        self.fight_ids = np.empty(0, dtype=object)
+        self.dates = np.empty(0, dtype='datetime64[ns]')
+        self.left = np.empty(0, dtype=np.int32)
+        self.right = np.empty(0, dtype=np.int32)
+        self.scores = np.empty(0, dtype=np.float64)
+        self.left_before = np.empty(0, dtype=np.float64)
+        self.right_before = np.empty(0, dtype=np.float64)
+        self.changes = np.empty(0, dtype=np.float64)
+        self._rate(fights)
+
+    def __len__(self):
+        return len(self.fight_ids)
+
+    def _fighter_codes(self, fighter_ids, names):
+        """Codes for ``fighter_ids``, adding unseen fighters (named by their first fight)."""
+        codes = np.empty(len(fighter_ids), dtype=np.int32)
+        new_ids, new_names = [], []
+        for position, (fighter_id, name) in enumerate(zip(fighter_ids, names)):
+            code = self.codes.get(fighter_id)
+            if code is None:
+                code = self.codes[fighter_id] = len(self.fighter_ids) + len(new_ids)
+                new_ids.append(fighter_id)
+                new_names.append(name)
+            codes[position] = code
+        if new_ids:
+            n_new = len(new_ids)
+            self.fighter_ids = np.concatenate([self.fighter_ids, np.asarray(new_ids, dtype=object)])
+            self.names = np.concatenate([self.names, np.asarray(new_names, dtype=object)])
+            self.ratings = np.concatenate([self.ratings, np.full(n_new, self.initial_rating)])
+            self.peaks = np.concatenate([self.peaks, np.full(n_new, self.initial_rating)])
+            self.fight_counts = np.concatenate([self.fight_counts, np.zeros(n_new, dtype=np.int32)])
+            self.last_dates = np.concatenate([self.last_dates, np.full(n_new, np.datetime64('NaT'), dtype='datetime64[ns]')])
+            self.last_waves = np.concatenate([self.last_waves, np.zeros(n_new, dtype=np.int64)])
+        return codes
+
+    def _rate(self, fights):
+        """Apply the date-sorted ``fights`` on top of the current ratings."""
+        if fights.empty:
+            return
+        n_fights = len(fights)
+        left_ids = fights['left_fighter_id'].to_numpy(dtype=object)
+        right_ids = fights['right_fighter_id'].to_numpy(dtype=object)
+        left_names = fights['left_fighter_name'].to_numpy(dtype=object)
+        right_names = fights['right_fighter_name'].to_numpy(dtype=object)
+        codes = self._fighter_codes(np.concatenate([left_ids, right_ids]), np.concatenate([left_names, right_names]))
+        left, right = codes[:n_fights], codes[n_fights:]
+        scores = fights['score'].to_numpy(dtype=np.float64)
+        dates = fights['date'].to_numpy(dtype='datetime64[ns]')
+
+        # Each fight goes in the wave after both fighters' previous fights
+        last_waves = self.last_waves.tolist()
+        waves = np.empty(n_fights, dtype=np.int64)
+        for position, (a, b) in enumerate(zip(left.tolist(), right.tolist())):
+            wave = max(last_waves[a], last_waves[b]) + 1
+            last_waves[a] = last_waves[b] = waves[position] = wave
+        self.last_waves = np.asarray(last_waves, dtype=np.int64)
+
+        order = np.argsort(waves, kind='stable')
+        bounds = np.flatnonzero(np.diff(waves[order])) + 1
+        ratings = self.ratings.copy()
+        left_before = np.empty(n_fights)
+        right_before = np.empty(n_fights)
+        changes = np.empty(n_fights)
+        for wave in np.split(order, bounds):
+            a, b = left[wave], right[wave]
+            rating_a, rating_b = ratings[a], ratings[b]
+            expected = 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / 400.0))
+            change = self.k_factor * (scores[wave] - expected)
+            ratings[a] = rating_a + change
+            ratings[b] = rating_b - change
+            left_before[wave], right_before[wave], changes[wave] = rating_a, rating_b, change
+
+        self.ratings = ratings
+        self.peaks = self.peaks.copy()
+        np.maximum.at(self.peaks, left, left_before + changes)
+        np.maximum.at(self.peaks, right, right_before - changes)
+        self.fight_counts = self.fight_counts + np.bincount(codes, minlength=len(ratings)).astype(np.int32)
+        # NaT is the smallest datetime64, so a maximum over the int64 view keeps the latest date
+        self.last_dates = self.last_dates.copy()
+        np.maximum.at(self.last_dates.view(np.int64), codes, np.concatenate([dates, dates]).view(np.int64))
+
+        self.fight_ids = np.concatenate([self.fight_ids, fights['fight_id'].to_numpy(dtype=object)])
+        self.dates = np.concatenate([self.dates, dates])
+        self.left = np.concatenate([self.left, left])
+        self.right = np.concatenate([self.right, right])
+        self.scores = np.concatenate([self.scores, scores])
+        self.left_before = np.concatenate([self.left_before, left_before])
+        self.right_before = np.concatenate([self.right_before, right_before])
+        self.changes = np.concatenate([self.changes, changes])
+
+    def extended(self, fights_df, events_df):
+        """Return ratings that also include the appended fights in ``fights_df``.
+
+        ``events_df`` must cover the new fights' events. Returns None when a
+        new fight is dated on or before the last rated fight, since rating it
+        would change the replay order; the caller then rebuilds.
+        """
+        fights, unmatched_events = _rated_fights(fights_df, events_df)
+        if len(self) and len(fights) and fights['date'].iloc[0] <= self.dates[-1]:
+            return None
+        ratings = EloRatings.__new__(EloRatings)
+        ratings.__dict__.update(self.__dict__)
+        ratings.codes = dict(self.codes)
+        ratings.unmatched_events = self.unmatched_events | unmatched_events
+        ratings._rate(fights)
+        return ratings
+
+    def code(self, fighter_id):
+        """The code of ``fighter_id`` (None if they have no rated fight)."""
+        return self.codes.get(fighter_id)
+
+    def fighter(self, code):
+        """One fighter's current rating summary."""
+        last_date = self.last_dates[code]
+        return {
+            'fighter_id': self.fighter_ids[code],
+            'name': self.names[code],
+            'rating': round(float(self.ratings[code]), 1),
+            'peak_rating': round(float(self.peaks[code]), 1),
+            'fights': int(self.fight_counts[code]),
+            'last_fight': None if np.isnat(last_date) else str(np.datetime_as_string(last_date, unit='D')),
+        }
+
+    def ranked(self, min_fights=0, active_since=None):
+        """Fighters by current rating, highest first, with ``min_fights`` and a fight since ``active_since``."""
+        order = np.argsort(-self.ratings, kind='stable')
+        mask = self.fight_counts[order] >= min_fights
+        if active_since is not None:
+            mask &= self.last_dates[order] >= np.datetime64(pd.Timestamp(active_since), 'ns')
+        return RatedFighters(self, order[mask])
+
+    def history(self, code):
+        """Every rated fight of one fighter, oldest first, with their rating before and after."""
+        positions = np.flatnonzero((self.left == code) | (self.right == code))
+        is_left = self.left[positions] == code
+        opponents = np.where(is_left, self.right[positions], self.left[positions])
+        before = np.where(is_left, self.left_before[positions], self.right_before[positions])
+        changes = np.where(is_left, self.changes[positions], -self.changes[positions])
+        scores = np.where(is_left, self.scores[positions], 1.0 - self.scores[positions])
+        dates = np.datetime_as_string(self.dates[positions], unit='D')
+        return [{
+            'date': str(date),
+            'fight_id': self.fight_ids[position],
+            'opponent_id': self.fighter_ids[opponent],
+            'opponent': self.names[opponent],
+            'result': RESULT_NAMES[score],
+            'rating_before': round(rating, 1),
+            'rating': round(rating + change, 1),
+            'change': round(change, 1),
+        } for position, date, opponent, score, rating, change in zip(
+            positions.tolist(), dates, opponents.tolist(), scores.tolist(), before.tolist(), changes.tolist())]
@@ -0,0 +1,132 @@
+"""
+Response cache for the read-only analytics endpoints.
+
+Responses are keyed by path, query arguments and the dataset version (a
+hash of the data files), and stored pre-serialized and pre-gzipped. Every
+cached response carries an ETag and Last-Modified so clients can revalidate
+with conditional requests and receive 304s. When the dataset version
+changes, all entries for the old version are dropped.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import parse_qsl
+
+from flask import Response, make_response, request
+
+MAX_ENTRIES = 1024
+MIN_COMPRESS_BYTES = 512
+
+
+class CachedBody:
+    """One pre-serialized response body and its gzip-compressed variant."""
+
+    __slots__ = ('body', 'gzipped', 'etag', 'mimetype')
+
+    def __init__(self, body, etag, mimetype):
+        self.body = body
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) >= MIN_COMPRESS_BYTES else None
+        self.etag = etag
+        self.mimetype = mimetype
+
+
+class ResponseCache:
+    """LRU cache of successful GET responses, scoped to one dataset version.
+
+    ``get_version`` returns the current dataset version and
+    ``get_last_modified`` the datetime sent as Last-Modified; both are
+    called per request so a reloaded dataset is picked up immediately.
+    Requests for which ``bypass()`` returns True skip the cache entirely.
+    """
+
+    def __init__(self, get_version, get_last_modified=lambda: None, max_entries=MAX_ENTRIES,
+                 bypass=lambda: False):
+        self.get_version = get_version
+        self.get_last_modified = get_last_modified
+        self.bypass = bypass
+        self.max_entries = max_entries
+        self.version = None
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self):
+        return (request.path, tuple(sorted(request.args.items(multi=True))))
+
+    def lookup(self, version, key):
+        """The cached entry for ``key``, counting the hit or miss."""
+        with self.lock:
+            entry = self.entries.get(key) if version == self.version else None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+            return entry
+
+    def contains(self, path, query_string):
+        """True if a GET for ``path`` and the raw ``query_string`` is cached for the current version.
+
+        Usable outside a request context (the ASGI layer asks before dispatching).
+        """
+        query = query_string.decode('utf-8', 'replace') if isinstance(query_string, bytes) else query_string
+        key = (path, tuple(sorted(parse_qsl(query, keep_blank_values=True))))
+        with self.lock:
+            return self.version is not None and key in self.entries and self.version == self.get_version()
+
+    def store(self, version, key, entry):
+        # A request that started before a reload finishes with the old version:
+        # its response is stale and must not evict the new version's entries
+        if version != self.get_version():
+            return
+        with self.lock:
+            if version != self.version:
+                # New dataset: everything cached for the previous one is stale
+                self.entries.clear()
+                self.version = version
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.version = None
+
+    def _respond(self, entry):
+        use_gzip = entry.gzipped is not None and 'gzip' in request.accept_encodings
+        response = Response(entry.gzipped if use_gzip else entry.body, mimetype=entry.mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.set_etag(f'{entry.etag}-gz' if use_gzip else entry.etag)
+        response.last_modified = self.get_last_modified()
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def cached(self, view):
+        """Decorate a view so its successful responses are cached."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if self.bypass():
+                return view(*args, **kwargs)
+            version = self.get_version()
+            key = self._key()
+            entry = self.lookup(version, key)
+
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+                    return response
+                body = response.get_data()
+                etag = hashlib.blake2b(version.encode() + body, digest_size=12).hexdigest()
+                entry = CachedBody(body, etag, response.mimetype)
+                self.store(version, key, entry)
+
+            return self._respond(entry)
+        return wrapper
@@ -0,0 +1,169 @@
+"""
+Prebuilt fighter search index over fighters.csv names and nicknames.
+
+Names are normalized (accent-folded, lowercased, punctuation stripped) and
+indexed by every 1-, 2- and 3-gram, so substring lookups are a posting-list
+intersection instead of a scan, and the query is never interpreted as a
+regex. Padded-trigram similarity appends typo-tolerant suggestions after
+the substring matches.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+MAX_GRAM = 3
+MIN_SIMILARITY = 0.3
+RANK_CACHE_SIZE = 4096
+
+# Ranking tiers for substring matches, best first; fuzzy matches rank after all of them
+EXACT, NAME_PREFIX, WORD_PREFIX, NAME_SUBSTRING, AKA_SUBSTRING = range(5)
+
+
+def normalize(text):
+    """Accent-fold, lowercase and collapse everything but letters and digits."""
+    if not isinstance(text, str):
+        return ''
+    folded = unicodedata.normalize('NFKD', text)
+    folded = ''.join(ch for ch in folded if not unicodedata.combining(ch))
+    return ' '.join(re.findall(r'[a-z0-9]+', folded.lower()))
+
+
+def substring_grams(text):
+    """Every 1..MAX_GRAM character substring of ``text``."""
+    return {text[i:i + n] for n in range(1, MAX_GRAM + 1) for i in range(len(text) - n + 1)}
+
+
+def padded_trigrams(text):
+    """Word-boundary padded trigrams used for similarity scoring."""
+    grams = set()
+    for word in text.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _to_postings(index):
+    return {gram: np.array(sorted(ids), dtype=np.int32) for gram, ids in index.items()}
+
+
+def _search_result(fighter):
+    wins = fighter.get('wins', 0) or 0
+    losses = fighter.get('losses', 0) or 0
+    draws = fighter.get('draws', 0) or 0
+    total_fights = wins + losses + draws
+    win_rate = (wins / total_fights * 100) if total_fights > 0 else 0
+
+    return {
+        'fighter_id': fighter.get('fighter_id', 'N/A'),
+        'name': fighter['name'],
+        'record': f"{wins}-{losses}-{draws}",
+        'win_rate': round(win_rate, 1),
+        'country': fighter.get('nationality', 'Unknown'),
+        'weight_lbs': fighter.get('weight_lbs', None)
+    }
+
+
+class FighterSearchIndex:
+    """Ranked name/nickname search over the fighters table."""
+
+    def __init__(self, fighters_df):
+        if fighters_df.empty or 'name' not in fighters_df.columns:
+            fighters_df = pd.DataFrame(columns=['name'])
+
+        akas = fighters_df['aka'] if 'aka' in fighters_df.columns else pd.Series('', index=fighters_df.index)
+        self.names = [normalize(name) for name in fighters_df['name']]
+        self.akas = [normalize(aka) for aka in akas]
+        self.results = [_search_result(fighter) for fighter in fighters_df.to_dict('records')]
+
+        grams = defaultdict(set)
+        trigrams = defaultdict(set)
+        self.trigram_counts = np.zeros(len(self.names), dtype=np.int32)
+        for position, (name, aka) in enumerate(zip(self.names, self.akas)):
+            for gram in substring_grams(name) | substring_grams(aka):
+                grams[gram].add(position)
+            name_trigrams = padded_trigrams(name)
+            for gram in name_trigrams:
+                trigrams[gram].add(position)
+            self.trigram_counts[position] = len(name_trigrams)
+
+        self.grams = _to_postings(grams)
+        self.trigrams = _to_postings(trigrams)
+        self.empty = np.array([], dtype=np.int32)
+        # Search-as-you-type repeats the same short prefixes constantly
+        self._ranked_matches = lru_cache(maxsize=RANK_CACHE_SIZE)(self._rank)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _substring_candidates(self, query):
+        """Positions whose name or aka contains every n-gram of the query."""
+        if len(query) <= MAX_GRAM:
+            return self.grams.get(query, self.empty)
+        trigrams = [gram for gram in substring_grams(query) if len(gram) == MAX_GRAM]
+        postings = sorted((self.grams.get(gram, self.empty) for gram in trigrams), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        return candidates
+
+    def _tier(self, position, query):
+        name = self.names[position]
+        if name == query:
+            return EXACT
+        if name.startswith(query):
+            return NAME_PREFIX
+        if f' {query}' in f' {name}':
+            return WORD_PREFIX
+        if query in name:
+            return NAME_SUBSTRING
+        if query in self.akas[position]:
+            return AKA_SUBSTRING
+        return None
+
+    def _fuzzy_matches(self, query, exclude):
+        """Positions ranked by padded-trigram Jaccard similarity to the query."""
+        query_trigrams = padded_trigrams(query)
+        postings = [self.trigrams[gram] for gram in query_trigrams if gram in self.trigrams]
+        if not postings:
+            return []
+
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        candidates = np.flatnonzero(shared)
+        similarity = shared[candidates] / (len(query_trigrams) + self.trigram_counts[candidates] - shared[candidates])
+        keep = similarity >= MIN_SIMILARITY
+        candidates, similarity = candidates[keep], similarity[keep]
+
+        order = np.lexsort((candidates, -similarity))
+        return [int(position) for position in candidates[order] if position not in exclude]
+
+    def _rank(self, query, fuzzy):
+        ranked = []
+        for position in self._substring_candidates(query):
+            position = int(position)
+            tier = self._tier(position, query)
+            if tier is not None:
+                ranked.append((tier, position))
+        ranked.sort()
+        matches = [position for _, position in ranked]
+
+        if fuzzy:
+            matches.extend(self._fuzzy_matches(query, set(matches)))
+        return tuple(matches)
+
+    def search(self, query, limit=10, offset=0, fuzzy=True):
+        """Return (total matches, ranked result dicts for the requested page)."""
+        query = normalize(query)
+        if not query:
+            return 0, []
+
+        matches = self._ranked_matches(query, fuzzy)
+
+        page = matches[offset:offset + limit]
+        return len(matches), [self.results[position] for position in page]
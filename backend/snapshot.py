@@ -0,0 +1,139 @@
+"""
+Binary snapshot of the data/ CSVs for fast startup.
+
+``python snapshot.py [data_dir]`` compiles the CSV tables into a single typed
+pickle (the dtypes declared in ufc_data.SCHEMAS, preparsed datetimes).
+``load_tables`` serves the snapshot while it is fresh and falls back to the
+CSVs (through ufc_data and its column cache) otherwise, so a stale or
+missing snapshot never changes what the app sees.
+"""
+
+import io
+import os
+import pickle
+import sys
+
+import pandas as pd
+
+import ufc_data
+from lineage import MASTER_COLUMNS
+from ufc_data import UFCData, parse_table
+
+SNAPSHOT_FILE = 'snapshot.pkl'
+SNAPSHOT_VERSION = 3
+
+# The tables the app loads, and their source files in data/
+TABLE_FILES = {table: ufc_data.TABLE_FILES[table] for table in ('events', 'fighters', 'fights', 'ufc_master')}
+
+# Columns the app reads, for tables it does not need in full
+TABLE_COLUMNS = {'ufc_master': MASTER_COLUMNS}
+
+def _source_path(data_path, table):
+    return os.path.join(data_path, TABLE_FILES[table])
+
+
+def source_signature(data_path):
+    """Size and modification time of every source file, used for freshness checks."""
+    signature = {}
+    for table in TABLE_FILES:
+        stat = os.stat(_source_path(data_path, table))
+        signature[TABLE_FILES[table]] = (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+def table_columns(table, header):
+    """The columns of ``table`` the app loads, given the columns in its file."""
+    if table not in TABLE_COLUMNS:
+        return list(header)
+    return [column for column in TABLE_COLUMNS[table] if column in header]
+
+
+def read_csv_tables(data_path):
+    """Load the tables through ufc_data (its column cache, else the CSVs) with declared dtypes."""
+    data = UFCData(data_path)
+    return {table: data.table(table, table_columns(table, data.columns(table))) for table in TABLE_FILES}
+
+
+def read_appended_rows(data_path, table, offset, tail=b''):
+    """Parse only the complete rows appended to a table's CSV after byte ``offset``.
+
+    ``tail`` is the content expected just before ``offset``; if the file no
+    longer matches it (rewritten or truncated rather than appended to) None
+    is returned. Otherwise returns the new rows and their raw bytes. A row
+    that is still being written is left for the next call.
+    """
+    with open(_source_path(data_path, table), 'rb') as f:
+        header = f.readline()
+        f.seek(max(offset - len(tail), 0))
+        if f.read(len(tail)) != tail:
+            return None
+        appended = f.read()
+    appended = appended[:appended.rfind(b'\n') + 1]
+    columns = table_columns(table, pd.read_csv(io.BytesIO(header)).columns)
+    if not appended.strip():
+        return pd.DataFrame(columns=columns), appended
+    return parse_table(table, io.BytesIO(header + appended), columns)[columns], appended
+
+
+def append_rows(df, rows):
+    """Return ``df`` with ``rows`` appended, keeping categorical columns categorical."""
+    if rows.empty:
+        return df
+    if df.empty:
+        return rows.reset_index(drop=True)
+    combined = pd.concat([df, rows], ignore_index=True)
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and not isinstance(combined[column].dtype, pd.CategoricalDtype):
+            combined[column] = combined[column].astype('category')
+    return combined
+
+
+def build_snapshot(data_path):
+    """Compile the CSV tables in ``data_path`` into a typed snapshot file."""
+    signature = source_signature(data_path)
+    tables = read_csv_tables(data_path)
+
+    snapshot_path = os.path.join(data_path, SNAPSHOT_FILE)
+    tmp_path = f'{snapshot_path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({
+            'version': SNAPSHOT_VERSION,
+            'sources': signature,
+            'tables': tables,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def load_snapshot(data_path):
+    """Return the snapshot tables, or None if the snapshot is missing or stale."""
+    snapshot_path = os.path.join(data_path, SNAPSHOT_FILE)
+    if not os.path.exists(snapshot_path):
+        return None
+
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable snapshot {snapshot_path}: {e}")
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+    if snapshot.get('sources') != source_signature(data_path):
+        return None
+    return snapshot['tables']
+
+
+def load_tables(data_path):
+    """Load the tables from a fresh snapshot, falling back to the CSVs."""
+    tables = load_snapshot(data_path)
+    if tables is not None:
+        print(f"Loaded snapshot from {data_path}")
+        return tables
+    return read_csv_tables(data_path)
+
+
+if __name__ == '__main__':
+    data_path = sys.argv[1] if len(sys.argv) > 1 else 'data'
+    print(f"Wrote {build_snapshot(data_path)}")
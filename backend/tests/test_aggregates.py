@@ -0,0 +1,139 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregates import FighterCube, FightOutcomeCube, add_counts, event_counts
+
+@pytest.fixture
+def events():
+    return pd.DataFrame({
+        'event_id': ['e1', 'e2'],
+        'date': pd.to_datetime(['2019-03-02', '2020-07-11']),
+        'location': ['Las Vegas, Nevada, USA', 'Abu Dhabi, United Arab Emirates'],
+    })
+
+@pytest.fixture
+def fights():
+    return pd.DataFrame({
+        'event_id': ['e1', 'e1', 'e1', 'e2', 'e2', 'e9'],
+        'method': ['KO/TKO', 'Decision', 'KO/TKO', 'Submission', None, 'Decision'],
+        'round': [1, 3, 2, 1, 3, 3],
+        'weight_class': ['Lightweight', 'Lightweight', 'Welterweight', 'Lightweight', None, 'Welterweight'],
+    })
+
+class TestFightOutcomeCube:
+    def test_distributions_match_value_counts(self, fights, events):
+        """Unfiltered distributions equal value_counts over the raw frame."""
+        cube = FightOutcomeCube(fights, events)
+        assert cube.total() == len(fights)
+        for column in ['method', 'round', 'weight_class']:
+            expected = fights[column].value_counts()
+            assert cube.distribution(column).sort_index().to_dict() == expected.sort_index().to_dict()
+        assert cube.distribution('method').index[0] == 'Decision'
+
+    def test_filtered_slices(self, fights, events):
+        """Filters select cells; unknown values and unmatched events select nothing."""
+        cube = FightOutcomeCube(fights, events)
+        assert cube.total(weight_class='Lightweight', year=2019) == 2
+        assert cube.distribution('method', year=2019).to_dict() == {'KO/TKO': 2, 'Decision': 1}
+        assert cube.distribution('year').to_dict() == {2019: 3, 2020: 2}
+        assert cube.total(method='Nope') == 0
+        assert cube.unmatched_events == {'e9'}
+
+    def test_extended_matches_full_build(self, fights, events):
+        """Extending with appended fights gives the same counts as a rebuild."""
+        cube = FightOutcomeCube(fights.iloc[:3], events).extended(fights.iloc[3:].reset_index(drop=True), events)
+        full = FightOutcomeCube(fights, events)
+        assert np.array_equal(cube.keys, full.keys)
+        assert np.array_equal(cube.counts, full.counts)
+        assert cube.distribution('weight_class', year=2020).equals(full.distribution('weight_class', year=2020))
+
+    def test_empty_fights(self, events):
+        """An empty fights table yields an empty cube."""
+        cube = FightOutcomeCube(pd.DataFrame(), events)
+        assert cube.total() == 0
+        assert cube.distribution('method').empty
+
+@pytest.fixture
+def fighters():
+    return pd.DataFrame({
+        'fighter_id': ['a', 'b', 'c', 'd', 'e'],
+        'country': ['Brazil', 'Brazil', 'USA', 'USA', None],
+        'class_weight': ['Lightweight', 'Welterweight', 'Lightweight', 'Lightweight', 'Heavyweight'],
+        'sex': ['M', 'M', 'F', 'M', 'M'],
+        'weight (lbs)': [155.0, 170.0, 155.0, 156.0, 250.0],
+        'wins': [10.0, 2.0, 5.0, 0.0, np.nan],
+        'losses': [2.0, 1.0, 5.0, 0.0, np.nan],
+        'draws': [0.0, 0.0, 1.0, 0.0, np.nan],
+    })
+
+@pytest.fixture
+def metrics():
+    """The metrics table only holds fighters with fights (not d or e)."""
+    return pd.DataFrame({
+        'fighter_id': ['a', 'c', 'b'],
+        'win_rate': [83.3, 45.5, 66.7],
+        'finish_rate': [50.0, 20.0, 0.0],
+        'age': [28.0, 33.0, np.nan],
+    })
+
+class TestFighterCube:
+    def test_grand_total(self, fighters, metrics):
+        """Rolling up every dimension gives the table-wide sums and averages."""
+        total, = FighterCube(fighters, metrics).rollup()
+        assert (total['fighters'], total['wins'], total['fights'], total['rated_fighters']) == (5, 17, 26, 3)
+        assert total['record_win_rate'] == round(17 / 26 * 100, 1)
+        assert total['avg_win_rate'] == round((83.3 + 45.5 + 66.7) / 3, 1)
+        assert total['avg_age'] == 30.5
+
+    def test_rollup_matches_groupby(self, fighters, metrics):
+        """Per-country cells equal a groupby over the raw table; missing values come first as None."""
+        countries = FighterCube(fighters, metrics).rollup(['country'])
+        assert [country['country'] for country in countries] == [None, 'Brazil', 'USA']
+        expected = fighters.groupby('country')['wins'].sum()
+        assert {c['country']: c['wins'] for c in countries[1:]} == expected.astype(int).to_dict()
+
+    def test_drill_down_and_filters(self, fighters, metrics):
+        """Adding a dimension splits cells; filters accept one value or a list."""
+        cube = FighterCube(fighters, metrics)
+        cells = cube.rollup(['country', 'sex'], weight_class='Lightweight')
+        assert [(c['country'], c['sex'], c['fighters']) for c in cells] == [('Brazil', 'M', 1), ('USA', 'F', 1), ('USA', 'M', 1)]
+        assert cube.rollup(activity=['regular', 'veteran'])[0]['fighters'] == 3
+        assert [(c['weight_band'], c['fighters']) for c in cube.rollup(['weight_band'], activity='veteran')] == [('Lightweight', 2)]
+        assert cube.rollup(country='Atlantis') == []
+
+    def test_bands(self, fighters, metrics):
+        """Weight, age and activity bands follow the fighters' numbers."""
+        cube = FighterCube(fighters, metrics)
+        assert {c['weight_band']: c['fighters'] for c in cube.rollup(['weight_band'])} == {
+            'Lightweight': 3, 'Welterweight': 1, 'Heavyweight': 1}
+        assert {c['age_band']: c['fighters'] for c in cube.rollup(['age_band'])} == {None: 3, '26-30': 1, '31-35': 1}
+        assert {c['activity']: c['fighters'] for c in cube.rollup(['activity'])} == {
+            'no_fights': 2, 'regular': 1, 'veteran': 2}
+
+    def test_empty_fighters(self):
+        cube = FighterCube(pd.DataFrame(), pd.DataFrame())
+        assert cube.rollup() == [] and cube.rollup(['country']) == []
+
+class TestEventCounts:
+    def test_add_counts(self, events):
+        """Adding the counts of appended events equals counting everything."""
+        combined = add_counts(event_counts(events.iloc[:1]), event_counts(events.iloc[1:]))
+        full = event_counts(events)
+        assert combined['year'].sort_index().equals(full['year'].sort_index())
+        assert combined['location'].to_dict() == {' USA': 1, ' United Arab Emirates': 1}
+
+    @pytest.mark.parametrize('split', [1, 3, 5])
+    def test_add_counts_breaks_ties_like_a_full_count(self, split):
+        """Tied locations come out in the same order whether counted at once or merged."""
+        locations = ['A, USA', 'B, Canada', 'C, Brazil', 'D, Canada', 'E, USA', 'F, Brazil', 'G, Japan']
+        events = pd.DataFrame({'date': pd.to_datetime(['2020-01-01'] * len(locations)), 'location': locations})
+        combined = add_counts(event_counts(events.iloc[:split]), event_counts(events.iloc[split:]))
+        full = event_counts(events)
+        assert list(full['location'].index) == [' Brazil', ' Canada', ' USA', ' Japan']
+        assert list(combined['location'].index) == list(full['location'].index)
@@ -2,10 +2,12 @@ import pytest
 import json
 import os
 import sys
+import pandas as pd
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import app as app_module
 from app import app
 
 @pytest.fixture
@@ -113,6 +115,30 @@ class TestOtherEndpoints:
             assert 'results' in data
             assert data['query'] == 'test'
 
+    def test_search_fighter_pagination(self, client):
+        """Test the fighter search endpoint with limit and offset."""
+        response = client.get('/api/fighters/search/silva?limit=2&offset=1')
+        assert response.status_code == 200
+        
+        data = json.loads(response.data)
+        if 'error' not in data:
+            assert data['limit'] == 2
+            assert data['offset'] == 1
+            assert len(data['results']) <= 2
+            assert data['total_matches'] >= data['total_found']
+
+    def test_fight_outcomes_filters(self, client):
+        """Test the fight outcomes endpoint with weight class and year filters."""
+        response = client.get('/api/analytics/fight-outcomes?weight_class=Lightweight&year=2019')
+        assert response.status_code == 200
+        
+        data = json.loads(response.data)
+        if 'error' not in data:
+            assert data['filters'] == {'weight_class': 'Lightweight', 'year': 2019}
+            assert set(data['weight_class_distribution']) <= {'Lightweight'}
+            assert set(data['fights_by_year']) <= {'2019'}
+            assert sum(data['fights_by_year'].values()) <= data['total_fights']
+
     def test_dataset_info_endpoint(self, client):
         """Test the dataset info endpoint."""
         response = client.get('/api/dataset/info')
@@ -136,6 +162,254 @@ class TestErrorHandling:
         # Should return 404 for empty search parameter
         assert response.status_code == 404
 
+class TestAdminEndpoints:
+    def test_reload_requires_token(self, client, monkeypatch):
+        """The reload trigger is refused without the configured admin token."""
+        monkeypatch.delenv('ADMIN_TOKEN', raising=False)
+        assert client.post('/api/admin/reload').status_code == 403
+        monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+        assert client.post('/api/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+
+    def test_reload_with_token(self, client, monkeypatch):
+        """A valid token starts a background reload and keeps serving the current version."""
+        monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+        monkeypatch.setattr(app_module.dataset_manager, 'reload_in_background', lambda force=False: None)
+        response = client.post('/api/admin/reload', headers={'X-Admin-Token': 'secret'})
+        assert response.status_code == 202
+        assert json.loads(response.data)['current_version'] == app_module.dataset_manager.current.version
+
+class TestInstrumentationEndpoints:
+    def test_metrics_endpoint(self, client):
+        """Request histograms are exported in the Prometheus text format."""
+        client.get('/api/health')
+        response = client.get('/api/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.data.decode()
+        assert 'ufc_request_duration_seconds_bucket{route="/api/health",method="GET",status="200"' in text
+        assert 'ufc_response_cache_hits_total' in text
+
+    def test_server_timing_header(self, client):
+        """Responses carry a Server-Timing header with the helpers that ran."""
+        response = client.get('/api/overview?server_timing_test=1')
+        assert response.headers['Server-Timing'].startswith('app;dur=')
+        assert 'get_performance_summary;dur=' in response.headers['Server-Timing']
+
+    def test_profile_needs_admin_token(self, client, monkeypatch):
+        """Profiling is only honoured for admin requests."""
+        monkeypatch.setenv('ADMIN_TOKEN', 'secret')
+        assert client.get('/api/health?profile=1').mimetype == 'application/json'
+        response = client.get('/api/health?profile=1', headers={'X-Admin-Token': 'secret'})
+        assert response.mimetype == 'text/plain'
+
+class TestAsgiEntryPoint:
+    def test_inline_requests(self, client):
+        """Health, static files and cached responses are answered on the event loop."""
+        assert app_module.is_inline_request('GET', '/api/health', b'')
+        assert app_module.is_inline_request('GET', '/index.html', b'')
+        assert not app_module.is_inline_request('POST', '/api/admin/reload', b'')
+        
+        assert not app_module.is_inline_request('GET', '/api/dataset/info', b'inline=1')
+        client.get('/api/dataset/info?inline=1')
+        assert app_module.is_inline_request('GET', '/api/dataset/info', b'inline=1')
+
+class TestLeaderboardEndpoint:
+    def test_leaderboard_filters(self, client):
+        """Leaders are sorted by the metric and match every filter."""
+        response = client.get('/api/leaderboards?metric=finish_rate&limit=5&country=Brazil&min_fights=5')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['metric'] == 'finish_rate'
+        assert data['filters'] == {'country': 'Brazil', 'min_fights': 5}
+        leaders = data['leaders']
+        assert len(leaders) <= 5 and len(leaders) <= data['total']
+        assert all(f['country'] == 'Brazil' and f['total_fights'] >= 5 for f in leaders)
+        assert [f['finish_rate'] for f in leaders] == sorted((f['finish_rate'] for f in leaders), reverse=True)
+
+    def test_top_performers_build_on_leaderboards(self, client):
+        """The top performers lists equal the matching leaderboards."""
+        performers = json.loads(client.get('/api/fighters/top-performers').data)
+        board = json.loads(client.get('/api/leaderboards?metric=finish_rate&min_fights=5&limit=15').data)
+        assert performers['by_finish_rate'] == board['leaders']
+
+    def test_unknown_metric(self, client):
+        """An unknown metric is a 400 listing the available ones."""
+        response = client.get('/api/leaderboards?metric=reach')
+        assert response.status_code == 400
+        assert 'win_rate' in json.loads(response.data)['metrics']
+
+class TestResolveEndpoint:
+    def test_resolves_names_across_datasets(self, client):
+        """Names from ufc-master.csv resolve to a fighters.csv fighter_id."""
+        data = json.loads(client.get('/api/fighters/resolve?name=Zhang%20Weili').data)
+        assert data['name'] == 'Weili Zhang'
+        assert data['matched_by'] == 'reordered_name'
+
+    def test_unknown_or_missing_name(self, client):
+        assert client.get('/api/fighters/resolve?name=Nobody%20Atall').status_code == 404
+        assert client.get('/api/fighters/resolve').status_code == 400
+
+class TestFighterRecordEndpoint:
+    def record(self, client, query=''):
+        fighter_id = app_module.dataset_manager.current.fighter_ids.fighter_id('Jon Jones')
+        response = client.get(f'/api/fighters/{fighter_id}/record{query}')
+        assert response.status_code == 200
+        return json.loads(response.data)
+
+    def test_as_of_record_matches_timeline(self, client):
+        """The record as of a date counts the fights in the timeline up to it."""
+        full = self.record(client)
+        data = self.record(client, '?as_of=2012-12-31')
+        assert data['name'] == 'Jon Jones' and data['as_of'] == '2012-12-31'
+        assert all(fight['date'] <= '2012-12-31' for fight in data['fights'])
+        assert data['record']['total_fights'] == len(data['fights']) < full['record']['total_fights']
+        assert data['record']['wins'] == sum(fight['result'] == 'win' for fight in data['fights'])
+
+    def test_since_limits_the_window(self, client):
+        data = self.record(client, '?since=2012-12-31&as_of=2015-12-31')
+        assert all('2012-12-31' < fight['date'] <= '2015-12-31' for fight in data['fights'])
+
+    def test_every_spelling_is_counted(self, client):
+        """A fighter listed under reordered names in ufc-master.csv gets the fights of both."""
+        ds = app_module.dataset_manager.current
+        fighter_id = ds.fighter_ids.fighter_id('Weili Zhang')
+        fight_index = ds.championship_lineage.fight_index
+        expected = len(fight_index.fights_for('Weili Zhang')) + len(fight_index.fights_for('Zhang Weili'))
+        data = json.loads(client.get(f'/api/fighters/{fighter_id}/record').data)
+        assert data['record']['total_fights'] == len(data['fights']) == expected
+        dates = [fight['date'] for fight in data['fights']]
+        assert dates == sorted(dates)
+
+    def test_unknown_fighter_and_bad_date(self, client):
+        assert client.get('/api/fighters/nope/record').status_code == 404
+        fighter_id = app_module.dataset_manager.current.fighter_ids.fighter_id('Jon Jones')
+        assert client.get(f'/api/fighters/{fighter_id}/record?as_of=soon').status_code == 400
+
+class TestCubeEndpoint:
+    def test_rollup_totals_are_consistent(self, client):
+        """Drilling down by a dimension splits the grand total without losing fighters."""
+        total = json.loads(client.get('/api/analytics/cube').data)['cells'][0]
+        by_sex = json.loads(client.get('/api/analytics/cube?by=sex').data)
+        assert sum(cell['fighters'] for cell in by_sex['cells']) == total['fighters']
+        assert by_sex['dimensions']['activity'] == ['no_fights', 'novice', 'regular', 'veteran']
+
+    def test_filters_and_errors(self, client):
+        data = json.loads(client.get('/api/analytics/cube?by=weight_class&sex=F&min_fighters=5').data)
+        assert data['filters'] == {'sex': ['F']}
+        assert all(cell['fighters'] >= 5 for cell in data['cells'])
+        assert client.get('/api/analytics/cube?by=planet').status_code == 400
+
+    def test_international_is_a_cube_lookup(self, client):
+        """The international endpoint reports the cube's per-country numbers."""
+        international = json.loads(client.get('/api/analytics/international').data)
+        cells = {cell['country']: cell for cell in
+                 json.loads(client.get('/api/analytics/cube?by=country').data)['cells']}
+        for country in international['country_performance']:
+            assert country['total_wins'] == cells[country['country']]['wins']
+            assert country['fighter_count'] == cells[country['country']]['fighters']
+
+class TestCompareEndpoint:
+    def test_compare_by_name_and_id(self, client):
+        """Fighters can be given by name or fighter_id; the head-to-head is seen from a's side."""
+        fighter_ids = app_module.dataset_manager.current.fighter_ids
+        data = json.loads(client.get('/api/fighters/compare?a=Conor%20McGregor&b=Khabib%20Nurmagomedov').data)
+        assert data['a']['name'] == 'Conor McGregor'
+        assert data['head_to_head']['b_wins'] == 1
+        assert data['chains']['b_over_a'][0][0]['winner']['name'] == 'Khabib Nurmagomedov'
+        by_id = json.loads(client.get(f"/api/fighters/compare?a={fighter_ids.fighter_id('Khabib Nurmagomedov')}"
+                                      f"&b={fighter_ids.fighter_id('Conor McGregor')}").data)
+        assert by_id['head_to_head']['a_wins'] == 1
+
+    def test_chains_link_up(self, client):
+        """Each chain runs from a to b through consecutive wins, within max_hops."""
+        data = json.loads(client.get('/api/fighters/compare?a=Jon%20Jones&b=Stipe%20Miocic&max_hops=4').data)
+        for chain in data['chains']['a_over_b'] + data['chains']['b_over_a']:
+            assert len(chain) <= 4
+            for link, next_link in zip(chain, chain[1:]):
+                assert link['loser'] == next_link['winner']
+
+    def test_missing_and_unknown_fighters(self, client):
+        assert client.get('/api/fighters/compare?a=Jon%20Jones').status_code == 400
+        assert client.get('/api/fighters/compare?a=Jon%20Jones&b=Nobody%20Atall').status_code == 404
+
+    def test_same_fighter_twice(self, client):
+        fighter_id = app_module.dataset_manager.current.fighter_ids.fighter_id('Jon Jones')
+        assert client.get(f'/api/fighters/compare?a=Jon%20Jones&b={fighter_id}').status_code == 400
+
+    def test_overturned_fight_is_a_no_contest(self, client):
+        """Jones vs Cormier 2 was overturned: one win and one no contest, no draw."""
+        data = json.loads(client.get('/api/fighters/compare?a=Jon%20Jones&b=Daniel%20Cormier').data)['head_to_head']
+        assert (data['a_wins'], data['b_wins'], data['draws'], data['no_contests']) == (1, 0, 0, 1)
+
+class TestRatingsEndpoints:
+    def test_leaderboard(self, client):
+        """Ratings are ranked highest first and filtered by fight count."""
+        data = json.loads(client.get('/api/ratings?min_fights=10&limit=20').data)
+        ratings = [fighter['rating'] for fighter in data['ratings']]
+        assert ratings == sorted(ratings, reverse=True) and len(ratings) == 20
+        assert all(fighter['fights'] >= 10 for fighter in data['ratings'])
+        assert data['filters'] == {'min_fights': 10}
+        assert client.get('/api/ratings?active_since=later').status_code == 400
+
+    def test_fighter_history(self, client):
+        """A fighter's history ends at their current rating."""
+        fighter_id = app_module.dataset_manager.current.fighter_ids.fighter_id('Jon Jones')
+        data = json.loads(client.get(f'/api/ratings/{fighter_id}').data)
+        assert data['name'] == 'Jon Jones' and data['fights'] == len(data['history'])
+        assert data['history'][-1]['rating'] == data['rating']
+        assert client.get('/api/ratings/nope').status_code == 404
+
+class TestPredictionsEndpoint:
+    def test_upcoming_card_is_scored(self, client):
+        """Every bout in upcoming.csv gets a prediction from the trained model."""
+        data = json.loads(client.get('/api/predictions/upcoming').data)
+        upcoming = app_module.dataset_manager.current.upcoming_df
+        assert data['total'] == len(upcoming) == len(data['predictions'])
+        assert data['model']['training_fights'] > 0
+        for bout in data['predictions']:
+            assert 0 < bout['red_win_probability'] < 1
+            assert bout['predicted_winner'] in (bout['red_fighter'], bout['blue_fighter'])
+
+class TestListPagination:
+    def test_unpaged_responses_are_unchanged(self, client):
+        """Without paging arguments the list endpoints keep their default sizes and no pagination key."""
+        data = json.loads(client.get('/api/events/analysis').data)
+        assert len(data['recent_events']) == min(20, data['total_events'])
+        assert 'pagination' not in data
+
+    def test_former_champions_pages(self, client):
+        """Paging through former champions with next_cursor returns the full list."""
+        full = json.loads(client.get('/api/former-champions/analysis').data)['former_champions']
+        seen, url = [], '/api/former-champions/analysis?limit=25'
+        while url:
+            data = json.loads(client.get(url).data)
+            assert data['summary']['total_former_champions'] == len(full)
+            seen += data['former_champions']
+            cursor = data['pagination']['next_cursor']
+            url = f'/api/former-champions/analysis?limit=25&cursor={cursor}' if cursor else None
+        assert seen == full
+
+    def test_fields_projection(self, client):
+        """?fields= keeps only the listed keys of each record."""
+        data = json.loads(client.get('/api/events/analysis?limit=3&fields=title,date').data)
+        assert len(data['recent_events']) == 3
+        assert all(set(event) == {'title', 'date'} for event in data['recent_events'])
+
+    def test_ndjson_stream(self, client):
+        """?format=ndjson streams the list one record per line, uncached."""
+        for _ in range(2):
+            response = client.get('/api/fighters/top-performers?format=ndjson&fields=name')
+            assert response.mimetype == 'application/x-ndjson'
+            records = [json.loads(line) for line in response.data.decode().splitlines()]
+            assert len(records) == int(response.headers['X-Total-Count'])
+            assert all(set(record) == {'name'} for record in records)
+
+    def test_invalid_cursor(self, client):
+        """A malformed cursor is a client error, not a 500."""
+        response = client.get('/api/analytics/advanced?cursor=garbage')
+        assert response.status_code == 400
+        assert 'error' in json.loads(response.data)
+
 class TestDataIntegrity:
     def test_former_champions_data_structure(self, client):
         """Test that former champions data has the expected structure."""
@@ -156,5 +430,47 @@ class TestDataIntegrity:
                 assert isinstance(champion['name'], str)
                 assert isinstance(champion['win_percentage_after_belt_loss'], (int, float))
 
+class TestReadOnlyData:
+    SHARED_FRAMES = ['events_df', 'fighters_df', 'fights_df', 'ufc_master_df', 'fighter_metrics_df']
+    SHARED_OBJECTS = ['corrected_champions', 'post_belt_records']
+    # Query strings for routes with required arguments
+    ROUTE_ARGS = {'/api/fighters/resolve': '?name=Jon%20Jones', '/api/fighters/compare': '?a=Jon%20Jones&b=Stipe%20Miocic'}
+
+    def fingerprint(self):
+        """Capture the shape, dtypes and content of every shared table."""
+        dataset = app_module.dataset_manager.current
+        prints = {}
+        for name in self.SHARED_FRAMES:
+            df = getattr(dataset, name)
+            prints[name] = (
+                list(df.columns),
+                [str(dtype) for dtype in df.dtypes],
+                int(pd.util.hash_pandas_object(df, index=True).sum()) if not df.empty else 0
+            )
+        for name in self.SHARED_OBJECTS:
+            prints[name] = json.dumps(getattr(dataset, name), sort_keys=True, default=str)
+        return prints
+
+    def test_endpoints_do_not_mutate_shared_data(self, client):
+        """No API endpoint may write to the frames shared across workers."""
+        before = self.fingerprint()
+        jon_jones = app_module.dataset_manager.current.fighter_ids.fighter_id('Jon Jones')
+        for rule in app.url_map.iter_rules():
+            if rule.rule.startswith('/api/') and 'GET' in rule.methods:
+                url = rule.rule.replace('<name>', 'silva').replace('<fighter_id>', jon_jones)
+                url += self.ROUTE_ARGS.get(rule.rule, '')
+                assert client.get(url).status_code == 200, url
+        assert self.fingerprint() == before
+
+    def test_shared_arrays_are_read_only(self):
+        """In-place writes to the shared numeric arrays are rejected."""
+        fighters_df = app_module.dataset_manager.current.fighters_df
+        if fighters_df.empty:
+            pytest.skip('data not loaded')
+        with pytest.raises(ValueError):
+            fighters_df['wins'].to_numpy()[0] = -1
+        with pytest.raises(ValueError):
+            app_module.dataset_manager.current.fighter_store.column('win_rate')[0] = 0
+
 if __name__ == '__main__':
     pytest.main([__file__])
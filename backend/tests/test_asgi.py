@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asgi import ThreadPoolASGI
+
+def http_scope(path, method='GET', query_string=b'', headers=()):
+    return {
+        'type': 'http', 'method': method, 'path': path, 'root_path': '', 'query_string': query_string,
+        'headers': list(headers), 'http_version': '1.1', 'scheme': 'http',
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 5000),
+    }
+
+async def call(asgi_app, scope, body=b''):
+    """Run one request through ``asgi_app``; returns (status, headers, body chunks)."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app(scope, receive, send)
+    start = sent[0]
+    chunks = [message['body'] for message in sent[1:] if message['body']]
+    assert sent[-1] == {'type': 'http.response.body', 'body': b''}
+    return start['status'], dict(start['headers']), chunks
+
+@pytest.fixture
+def slow_app():
+    """An app whose /slow view blocks until released, plus an inline /health."""
+    release = threading.Event()
+    app = Flask(__name__)
+
+    @app.route('/slow')
+    def slow():
+        release.wait(5)
+        return jsonify({'slow': True})
+
+    @app.route('/health')
+    def health():
+        return jsonify({'status': 'healthy'})
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return jsonify({'body': request.get_data(as_text=True), 'q': request.args.get('q'),
+                        'token': request.headers.get('X-Token')})
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'{i}\n' for i in range(3)), mimetype='application/x-ndjson')
+
+    asgi_app = ThreadPoolASGI(app, max_threads=2, inline=lambda method, path, query: path == '/health')
+    return asgi_app, release
+
+class TestThreadPoolASGI:
+    def test_inline_requests_are_served_while_the_pool_is_busy(self, slow_app):
+        """A blocked analytics request does not hold up inline requests."""
+        asgi_app, release = slow_app
+
+        async def scenario():
+            slow = asyncio.ensure_future(call(asgi_app, http_scope('/slow')))
+            await asyncio.sleep(0.05)
+            status, _, body = await asyncio.wait_for(call(asgi_app, http_scope('/health')), 1)
+            assert status == 200 and b'healthy' in b''.join(body)
+            assert not slow.done()
+            release.set()
+            status, _, body = await asyncio.wait_for(slow, 5)
+            assert status == 200 and b'"slow":true' in b''.join(body).replace(b' ', b'')
+
+        asyncio.run(scenario())
+
+    def test_request_body_headers_and_query(self, slow_app):
+        """The WSGI environ carries the body, query string and headers."""
+        asgi_app, _ = slow_app
+        scope = http_scope('/echo', method='POST', query_string=b'q=silva',
+                           headers=[(b'x-token', b'abc'), (b'content-type', b'text/plain')])
+        status, headers, body = asyncio.run(call(asgi_app, scope, body=b'hello'))
+        assert status == 200
+        assert headers[b'content-type'] == b'application/json'
+        assert b''.join(body).replace(b' ', b'') == b'{"body":"hello","q":"silva","token":"abc"}\n'
+
+    def test_streamed_bodies_arrive_in_chunks(self, slow_app):
+        """Streaming responses are forwarded chunk by chunk from the pool thread."""
+        asgi_app, _ = slow_app
+        status, _, chunks = asyncio.run(call(asgi_app, http_scope('/stream')))
+        assert status == 200
+        assert chunks == [b'0\n', b'1\n', b'2\n']
+
+    def test_lifespan_runs_startup_callbacks(self):
+        """Startup callbacks run on lifespan.startup."""
+        started = []
+        asgi_app = ThreadPoolASGI(Flask(__name__), on_startup=[lambda: started.append(True)])
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(asgi_app({'type': 'lifespan'}, receive, send))
+        assert started == [True]
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
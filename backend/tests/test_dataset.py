@@ -0,0 +1,188 @@
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import DatasetManager
+
+def write_data(path, n_fights=1):
+    """Write a minimal data/ directory with ``n_fights`` fights."""
+    pd.DataFrame({'event_id': ['e1'], 'title': ['UFC 1'], 'date': ['1993-11-12'],
+                  'location': ['Denver, Colorado, USA']}).to_csv(path / 'events.csv', index=False)
+    pd.DataFrame({'fighter_id': ['f1'], 'name': ['Royce Gracie'], 'birthdate': ['1966-12-12'],
+                  'wins': [3.0], 'losses': [0.0], 'draws': [0.0]}).to_csv(path / 'fighters.csv', index=False)
+    pd.DataFrame({'fight_id': [f'x{i}' for i in range(n_fights)], 'left_fighter_id': ['f1'] * n_fights,
+                  'right_fighter_id': ['f2'] * n_fights}).to_csv(path / 'fights.csv', index=False)
+    pd.DataFrame({'RedFighter': ['Royce Gracie'], 'BlueFighter': ['Gerard Gordeau'], 'Date': ['1993-11-12'],
+                  'Winner': ['Red'], 'TitleBout': [False]}).to_csv(path / 'ufc-master.csv', index=False)
+    (path / 'champions_records.json').write_text(json.dumps([]))
+
+def append_csv(path, name, df):
+    """Append ``df`` to an existing CSV without rewriting it."""
+    df.to_csv(path / name, mode='a', header=False, index=False)
+
+@pytest.fixture
+def manager(tmp_path):
+    write_data(tmp_path)
+    manager = DatasetManager([str(tmp_path)])
+
+    @manager.derive('fight_count')
+    def fight_count(ds):
+        return len(ds.fights_df)
+
+    @manager.derive('fight_count_doubled')
+    def fight_count_doubled(ds):
+        return ds.fight_count * 2
+
+    manager.load()
+    return manager
+
+class TestDatasetManager:
+    def test_load_builds_derived_values(self, manager):
+        """Derived values are computed in order and exposed as attributes."""
+        assert manager.current.loaded
+        assert manager.current.fight_count == 1
+        assert manager.current.fight_count_doubled == 2
+
+    def test_reload_swaps_in_new_version(self, manager, tmp_path):
+        """A data change publishes a new dataset; holders of the old one are unaffected."""
+        old = manager.current
+        write_data(tmp_path, n_fights=3)
+        assert manager.reload() is True
+        assert manager.current is not old
+        assert manager.current.version != old.version
+        assert manager.current.fight_count == 3
+        assert old.fight_count == 1
+
+    def test_reload_without_changes_is_a_no_op(self, manager):
+        """Unchanged files do not trigger a rebuild."""
+        old = manager.current
+        assert manager.reload() is False
+        assert manager.current is old
+
+    def test_failed_reload_keeps_current_dataset(self, manager, tmp_path):
+        """A broken data refresh leaves the previous version in service."""
+        old = manager.current
+        (tmp_path / 'champions_records.json').write_text('{not json')
+        assert manager.reload() is False
+        assert manager.current is old
+        assert manager.last_error
+
+    def test_upcoming_card_is_optional_and_versioned(self, manager, tmp_path):
+        """upcoming.csv is not required, but adding it publishes a new version that loads it."""
+        old = manager.current
+        assert old.upcoming_df.empty
+        pd.DataFrame({'RedFighter': ['Royce Gracie'], 'BlueFighter': ['Ken Shamrock'],
+                      'Date': ['1994-03-11']}).to_csv(tmp_path / 'upcoming.csv', index=False)
+        assert manager.reload() is True
+        assert manager.current.version != old.version
+        assert list(manager.current.upcoming_df['RedFighter']) == ['Royce Gracie']
+
+    def test_malformed_upcoming_card_is_dropped(self, manager, tmp_path, monkeypatch):
+        """A card that cannot be parsed leaves only upcoming_df empty; the history still loads.
+
+        upcoming.csv is not ingested incrementally: appending to it triggers a full build.
+        """
+        pd.DataFrame({'RedFighter': ['Royce Gracie'], 'BlueFighter': ['Ken Shamrock'], 'Date': ['1994-03-11'],
+                      'AgeDif': ['three']}).to_csv(tmp_path / 'upcoming.csv', index=False)
+        assert manager.reload() is True
+        assert manager.current.loaded and manager.current.upcoming_df.empty
+        assert manager.current.fight_count == 1
+
+        pd.DataFrame({'RedFighter': ['Royce Gracie'], 'BlueFighter': ['Ken Shamrock'], 'Date': ['1994-03-11'],
+                      'AgeDif': [3]}).to_csv(tmp_path / 'upcoming.csv', index=False)
+        assert manager.reload() is True
+        assert len(manager.current.upcoming_df) == 1
+        builds = []
+        build = manager.build
+        monkeypatch.setattr(manager, 'build', lambda data_path: builds.append(data_path) or build(data_path))
+        append_csv(tmp_path, 'upcoming.csv', pd.DataFrame({'RedFighter': ['Dan Severn'], 'BlueFighter': ['Oleg Taktarov'],
+                                                          'Date': ['1995-04-07'], 'AgeDif': ['x']}))
+        assert manager.reload() is True
+        assert len(builds) == 1
+        assert manager.current.loaded and manager.current.upcoming_df.empty
+
+    def test_blank_numeric_cells_do_not_empty_the_dataset(self, tmp_path):
+        """A blank integer cell is a missing value, not a failed load."""
+        write_data(tmp_path)
+        pd.DataFrame({'fight_id': ['x0', 'x1'], 'left_fighter_id': ['f1', 'f1'], 'right_fighter_id': ['f2', 'f3'],
+                      'match': [2, None]}).to_csv(tmp_path / 'fights.csv', index=False)
+        pd.DataFrame({'RedFighter': ['Royce Gracie'], 'BlueFighter': ['Gerard Gordeau'], 'Date': ['1993-11-12'],
+                      'Winner': ['Red'], 'TitleBout': [None], 'AgeDif': [None]}).to_csv(tmp_path / 'ufc-master.csv', index=False)
+        manager = DatasetManager([str(tmp_path)])
+        manager.load()
+        assert manager.current.fights_df['match'].isna().tolist() == [False, True]
+        assert len(manager.current.fighters_df) == 1
+
+    def test_missing_data_falls_back_to_empty_dataset(self, tmp_path):
+        """Without data files the app still starts with an empty dataset."""
+        manager = DatasetManager([str(tmp_path / 'missing')])
+        manager.derive('fight_count')(lambda ds: len(ds.fights_df))
+        manager.load()
+        assert not manager.current.loaded
+        assert manager.current.fight_count == 0
+
+class TestIncrementalIngest:
+    @pytest.fixture
+    def manager(self, tmp_path):
+        write_data(tmp_path)
+        manager = DatasetManager([str(tmp_path)])
+        manager.updates = []
+
+        def update_fight_ids(previous, ds, delta):
+            manager.updates.append(len(delta['fights']))
+            return previous + list(delta['fights']['fight_id'])
+
+        manager.derive('fight_ids', tables=['fights'], update=update_fight_ids)(
+            lambda ds: list(ds.fights_df['fight_id']))
+        manager.derive('event_titles', tables=['events'])(lambda ds: list(ds.events_df['title']))
+        manager.load()
+        return manager
+
+    def test_appended_rows_update_derived_values(self, manager, tmp_path):
+        """Only the appended rows are parsed and handed to the update function."""
+        old = manager.current
+        append_csv(tmp_path, 'fights.csv', pd.DataFrame({
+            'fight_id': ['x1', 'x2'], 'left_fighter_id': ['f1', 'f1'], 'right_fighter_id': ['f3', 'f4']}))
+        assert manager.reload() is True
+        assert manager.updates == [2]
+        assert manager.current.fight_ids == ['x0', 'x1', 'x2']
+        assert len(manager.current.fights_df) == 3
+        assert manager.current.event_titles is old.event_titles
+        assert old.fight_ids == ['x0']
+        assert len(old.fights_df) == 1
+
+    def test_incremental_version_matches_full_load(self, manager, tmp_path):
+        """An ingested dataset gets the same version a fresh load would."""
+        append_csv(tmp_path, 'events.csv', pd.DataFrame({
+            'event_id': ['e2'], 'title': ['UFC 2'], 'date': ['1994-03-11'], 'location': ['Denver, Colorado, USA']}))
+        assert manager.reload() is True
+        assert manager.current.event_titles == ['UFC 1', 'UFC 2']
+        assert manager.current.events_df['date'].dt.year.tolist() == [1993, 1994]
+
+        fresh = DatasetManager([str(tmp_path)])
+        fresh.load()
+        assert manager.current.version == fresh.current.version
+
+    def test_partial_row_waits_for_newline(self, manager, tmp_path):
+        """A row still being written is not ingested until it is complete."""
+        with open(tmp_path / 'fights.csv', 'a') as f:
+            f.write('x1,f1,')
+        manager.reload()
+        assert manager.current.fight_ids == ['x0']
+        with open(tmp_path / 'fights.csv', 'a') as f:
+            f.write('f5\n')
+        assert manager.reload() is True
+        assert manager.current.fight_ids == ['x0', 'x1']
+
+    def test_rewritten_file_falls_back_to_full_build(self, manager, tmp_path):
+        """Edits to existing rows are not appends and trigger a full rebuild."""
+        pd.DataFrame({'fight_id': ['y0', 'y1'], 'left_fighter_id': ['f1', 'f1'],
+                      'right_fighter_id': ['f2', 'f2']}).to_csv(tmp_path / 'fights.csv', index=False)
+        assert manager.reload() is True
+        assert manager.updates == []
+        assert manager.current.fight_ids == ['y0', 'y1']
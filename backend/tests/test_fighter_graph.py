@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fighter_graph import FighterGraph
+from fighter_ids import FighterIdIndex
+
+@pytest.fixture
+def fighter_ids():
+    return FighterIdIndex(pd.DataFrame({
+        'fighter_id': ['a', 'b', 'c', 'd', 'e', 'x'],
+        'name': ['Ann', 'Bea', 'Cat', 'Dee', 'Eve', 'Xen'],
+    }))
+
+@pytest.fixture
+def events():
+    return pd.DataFrame({'event_id': ['e1', 'e2', 'e3'],
+                         'date': pd.to_datetime(['2020-01-01', '2021-01-01', '2022-01-01'])})
+
+@pytest.fixture
+def fights():
+    """Ann > Cat > Dee > Bea > Ann, then Ann draws Bea; nobody beats Eve."""
+    return pd.DataFrame([
+        ('e1', 'a', 'c', 'L'),
+        ('e1', 'c', 'd', 'L'),
+        ('e1', 'b', 'a', 'L'),
+        ('e2', 'd', 'b', 'L'),
+        ('e2', 'e', 'c', 'L'),
+        ('e3', 'b', 'e', 'R'),
+        ('e3', 'a', 'b', 'D'),
+        ('e3', 'a', 'x', None),
+    ], columns=['event_id', 'left_fighter_id', 'right_fighter_id', 'winner'])
+
+class TestFighterGraph:
+    def test_head_to_head(self, fighter_ids, fights, events):
+        """Fights between two fighters come back oldest first from the first fighter's side."""
+        graph = FighterGraph(fighter_ids, fights, events)
+        assert len(graph) == 7
+        assert graph.head_to_head(0, 1) == [{'date': '2020-01-01', 'result': 'loss'},
+                                            {'date': '2022-01-01', 'result': 'draw'}]
+        assert graph.head_to_head(1, 0)[0]['result'] == 'win'
+        assert graph.head_to_head(0, 5) == []
+
+    def test_no_contests_are_not_draws(self, fighter_ids, fights, events):
+        """A 'D' with a no-contest method is reported as a no contest, from both sides."""
+        methods = pd.Series('Decision (Split)', index=fights.index)
+        methods.iloc[6] = 'No Contest (Overturned)'
+        graph = FighterGraph(fighter_ids, fights.assign(method=methods), events)
+        assert graph.head_to_head(0, 1)[1] == {'date': '2022-01-01', 'result': 'no_contest'}
+        assert graph.head_to_head(1, 0)[1]['result'] == 'no_contest'
+        counts = graph.compare(0, 1)['head_to_head']
+        assert (counts['a_wins'], counts['b_wins'], counts['draws'], counts['no_contests']) == (0, 1, 0, 1)
+        assert graph.win_chains(0, 1) == FighterGraph(fighter_ids, fights, events).win_chains(0, 1)
+
+    def test_common_opponents(self, fighter_ids, fights, events):
+        graph = FighterGraph(fighter_ids, fights, events)
+        common = graph.common_opponents(0, 4)
+        assert [opponent['name'] for opponent in common] == ['Bea', 'Cat']
+        assert common[1]['a'] == [{'date': '2020-01-01', 'result': 'win'}]
+        assert common[1]['b'] == [{'date': '2021-01-01', 'result': 'win'}]
+
+    def test_win_chains(self, fighter_ids, fights, events):
+        """Chains are the shortest runs of wins and respect max_hops."""
+        graph = FighterGraph(fighter_ids, fights, events)
+        chains = graph.win_chains(0, 1)
+        assert [[link['loser']['name'] for link in chain] for chain in chains] == [['Cat', 'Dee', 'Bea']]
+        assert graph.win_chains(0, 1, max_hops=2) == []
+        assert [len(chain) for chain in graph.win_chains(4, 1)] == [1]
+        assert graph.win_chains(3, 0)[0][-1]['loser']['name'] == 'Ann'
+        assert graph.win_chains(0, 4) == []
+
+    def test_master_fights_fill_gaps(self, fighter_ids, fights, events):
+        """ufc-master.csv fights already in fights.csv are not counted twice."""
+        master = pd.DataFrame({
+            'RedFighter': ['Ann', 'Dee', 'Nobody'],
+            'BlueFighter': ['Cat', 'Eve', 'Ann'],
+            'Date': ['2020-01-02', '2023-05-01', '2023-05-01'],
+            'Winner': ['Red', 'Blue', 'Red'],
+        })
+        graph = FighterGraph(fighter_ids, fights, events, master)
+        assert len(graph) == 8
+        assert graph.head_to_head(4, 3) == [{'date': '2023-05-01', 'result': 'win'}]
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fighter_ids import UNRESOLVED, FighterIdIndex
+
+@pytest.fixture
+def index():
+    """Four fighters, two of them sharing a name."""
+    return FighterIdIndex(pd.DataFrame({
+        'fighter_id': ['f1', 'f2', 'f3', 'f4'],
+        'name': ['José Aldo', 'Weili Zhang', 'Bruno Silva', 'Bruno Silva'],
+        'aka': ['Scarface', 'Magnum', None, 'Bulldog'],
+        'birthdate': pd.to_datetime(['1986-09-09', '1989-08-13', '1989-07-16', '1990-03-13']),
+    }))
+
+class TestFighterIdIndex:
+    def test_normalized_name(self, index):
+        """Accents, case and punctuation do not matter."""
+        assert index.match('jose  ALDO') == (0, 'name')
+        assert index.fighter_id('José Aldo') == 'f1'
+
+    def test_reordered_name_and_aka(self, index):
+        assert index.match('Zhang Weili') == (1, 'reordered_name')
+        assert index.match('Scarface') == (0, 'aka')
+
+    def test_birthdate_disambiguates(self, index):
+        """A shared name only resolves with a birthdate."""
+        assert index.code('Bruno Silva') == UNRESOLVED
+        assert index.match('Bruno Silva', '1990-03-13') == (3, 'birthdate')
+
+    def test_vectorized_codes(self, index):
+        """A column resolves to integer codes, with -1 for unknown and missing names."""
+        codes = index.codes(['Zhang Weili', 'Nobody', None, 'jose aldo', 'Zhang Weili'])
+        assert codes.tolist() == [1, -1, -1, 0, 1]
+        assert index.ids(codes).tolist() == ['f2', None, None, 'f1', 'f2']
+        with_birthdates = index.codes(['Bruno Silva', 'Bruno Silva'], ['1989-07-16', None])
+        assert with_birthdates.tolist() == [2, -1]
@@ -0,0 +1,76 @@
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fighter_metrics import add_fight_appearances, build_fighter_metrics
+from fighter_store import FighterStore
+
+@pytest.fixture
+def fighters():
+    return pd.DataFrame({
+        'fighter_id': ['a', 'b', 'c', 'd'],
+        'name': ['Alpha', 'Bravo', 'Charlie', 'Delta'],
+        'birthdate': pd.to_datetime(['1990-01-01', None, '2000-06-15', '1985-03-03']),
+        'wins': [10.0, 3.0, 0.0, 0.0],
+        'losses': [1.0, 3.0, 2.0, 0.0],
+        'draws': [0.0, 0.0, 0.0, 0.0],
+        'wins_by_ko_tko': [5.0, 1.0, 0.0, 0.0],
+        'wins_by_submission': [3.0, 0.0, 0.0, 0.0],
+        'country': ['Brazil', None, 'Ireland', 'Japan'],
+        'weight (lbs)': [155.0, 170.0, None, 205.0],
+        'height (cm)': [175.0, 180.0, 170.0, 190.0],
+    })
+
+@pytest.fixture
+def fights():
+    return pd.DataFrame({
+        'left_fighter_id': ['a', 'a', 'b'],
+        'right_fighter_id': ['b', 'c', 'c'],
+    })
+
+class TestBuildFighterMetrics:
+    def test_skips_fighters_without_fights(self, fighters, fights):
+        """Fighters with no recorded bouts are not part of the table."""
+        table = build_fighter_metrics(fighters, fights, now=datetime(2024, 1, 1))
+        assert list(table['fighter_id']) == ['a', 'b', 'c']
+
+    def test_metrics_values(self, fighters, fights):
+        """Win rate, finish rate, age, category and fight count are derived per fighter."""
+        table = build_fighter_metrics(fighters, fights, now=datetime(2024, 1, 1))
+        alpha = table.iloc[0]
+        assert alpha['win_rate'] == 90.9
+        assert alpha['finish_rate'] == 80.0
+        assert alpha['age'] == 34
+        assert alpha['category'] == 'Elite'
+        assert alpha['recent_fights'] == 2
+        assert table.iloc[2]['category'] == 'Struggling'
+
+    def test_records_are_json_ready(self, fighters, fights):
+        """Served through FighterStore, missing values become None and ages are plain integers."""
+        store = FighterStore(build_fighter_metrics(fighters, fights, now=datetime(2024, 1, 1)))
+        records = [store.record(row) for row in range(len(store))]
+        bravo = records[1]
+        assert bravo['age'] is None
+        assert bravo['country'] is None
+        assert isinstance(records[0]['age'], int)
+        assert records[2]['weight_lbs'] is None
+
+    def test_empty_input(self, fighters):
+        """An empty fights table yields an empty metrics table."""
+        assert build_fighter_metrics(fighters, pd.DataFrame()).empty
+
+    def test_appended_fights_update_counts(self, fighters, fights):
+        """Counting only appended fights matches rebuilding from all of them."""
+        now = datetime(2024, 1, 1)
+        new_fights = pd.DataFrame({'left_fighter_id': ['c'], 'right_fighter_id': ['a']})
+        table = build_fighter_metrics(fighters, fights, now=now)
+
+        updated = add_fight_appearances(table, new_fights)
+        full = build_fighter_metrics(fighters, pd.concat([fights, new_fights]), now=now)
+        assert updated.equals(full)
+        assert list(table['recent_fights']) == [2, 2, 2]
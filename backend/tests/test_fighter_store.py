@@ -0,0 +1,70 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fighter_metrics import METRIC_COLUMNS, build_fighter_metrics
+from fighter_store import FighterStore
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(7)
+    n = 40
+    wins = rng.integers(0, 20, n).astype(float)
+    fighters = pd.DataFrame({
+        'fighter_id': [f'f{i}' for i in range(n)],
+        'name': [f'Fighter {i}' for i in range(n)],
+        'birthdate': pd.to_datetime(['1990-01-01', None, '1998-06-15', '1985-03-03'] * (n // 4)),
+        'wins': wins,
+        'losses': rng.integers(0, 8, n).astype(float),
+        'draws': np.zeros(n),
+        'wins_by_ko_tko': np.floor(wins / 2),
+        'wins_by_submission': np.floor(wins / 4),
+        'country': ['Brazil', None, 'USA', 'USA'] * (n // 4),
+        'weight (lbs)': [155.0, None, 135.0, 205.0] * (n // 4),
+        'height (cm)': [175.0] * n,
+    })
+    fights = pd.DataFrame({'left_fighter_id': ['f0', 'f1'], 'right_fighter_id': ['f2', 'f3']})
+    return build_fighter_metrics(fighters, fights, now=datetime(2024, 1, 1))
+
+class TestFighterStore:
+    def test_views_match_records(self, table):
+        """Every view holds its table row as Python values: None when missing, whole ages as int."""
+        store = FighterStore(table)
+        records = [{field: None if pd.isna(value) else value for field, value in row.items()}
+                   for row in table.to_dict('records')]
+        for record in records:
+            if record['age'] is not None:
+                record['age'] = int(record['age'])
+        assert len(store) == len(records)
+        views = store.rows(np.arange(len(store)))[:]
+        assert [dict(view) for view in views] == records
+        assert [view.to_dict() for view in views] == records
+        assert isinstance(store.record(0)['age'], int)
+        assert list(store.rows([0])[0]) == METRIC_COLUMNS
+
+    def test_coded_columns(self, table):
+        """Country and category are stored as codes into interned levels."""
+        store = FighterStore(table)
+        assert store.column('country').dtype == np.int32
+        codes = store.column('country')
+        usa = codes == store.levels['country'].index('USA')
+        assert usa.sum() == (table['country'] == 'USA').sum()
+        assert store.rows(np.flatnonzero(codes < 0))[0]['country'] is None
+
+    def test_arrays_are_read_only(self, table):
+        """The shared arrays cannot be written through."""
+        store = FighterStore(table)
+        with pytest.raises(ValueError):
+            store.column('wins')[0] = 99
+
+    def test_empty_table(self):
+        """A store over the empty metrics table has no rows."""
+        store = FighterStore(pd.DataFrame(columns=METRIC_COLUMNS))
+        assert len(store) == 0
+        assert store.rows([])[:10] == []
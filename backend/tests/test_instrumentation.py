@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import BUCKETS, Histogram, Instrumentation
+from response_cache import ResponseCache
+
+@pytest.fixture
+def instrumented_app():
+    """A tiny app with one timed helper, a cached view and profiling allowed per test."""
+    state = {'authorized': False}
+    instrumentation = Instrumentation(authorize_profiling=lambda: state['authorized'])
+    app = Flask(__name__)
+    instrumentation.init_app(app)
+    cache = ResponseCache(lambda: 'v1', bypass=instrumentation.profiling_requested)
+
+    @instrumentation.timed
+    def slow_helper():
+        time.sleep(0.01)
+        return 42
+
+    @app.route('/data')
+    @cache.cached
+    def data():
+        return jsonify({'value': slow_helper()})
+
+    return app.test_client(), instrumentation, state
+
+class TestHistogram:
+    def test_buckets_are_cumulative_in_export(self):
+        """Observations land in the first bucket whose bound they do not exceed."""
+        histogram = Histogram()
+        histogram.observe(0.0004)
+        histogram.observe(0.003)
+        histogram.observe(100)
+        counts, total, count = histogram.snapshot()
+        assert counts[0] == 1
+        assert counts[BUCKETS.index(0.005)] == 1
+        assert counts[-1] == 1
+        assert count == 3
+        assert total == pytest.approx(100.0034)
+
+class TestInstrumentation:
+    def test_server_timing_lists_helpers(self, instrumented_app):
+        """Responses report total and per-helper time; cached responses skip the helpers."""
+        client, _, _ = instrumented_app
+        header = client.get('/data').headers['Server-Timing']
+        assert header.startswith('app;dur=')
+        assert 'slow_helper;dur=' in header
+        assert 'json;dur=' in header
+        assert 'slow_helper' not in client.get('/data').headers['Server-Timing']
+
+    def test_metrics_export(self, instrumented_app):
+        """Route and helper histograms are rendered in the Prometheus text format."""
+        client, instrumentation, _ = instrumented_app
+        client.get('/data')
+        client.get('/data')
+        metrics = instrumentation.render_metrics()
+        assert 'ufc_request_duration_seconds_count{route="/data",method="GET",status="200"} 2' in metrics
+        assert 'ufc_helper_duration_seconds_count{helper="slow_helper"} 1' in metrics
+        assert 'ufc_helper_duration_seconds_bucket{helper="slow_helper",le="0.005"} 0' in metrics
+        assert 'ufc_helper_duration_seconds_bucket{helper="slow_helper",le="+Inf"} 1' in metrics
+
+    def test_profile_requires_authorization(self, instrumented_app):
+        """The profile flag is ignored unless the request is authorized."""
+        client, _, state = instrumented_app
+        assert client.get('/data?profile=1').mimetype == 'application/json'
+
+        state['authorized'] = True
+        response = client.get('/data', headers={'X-Profile': '1'})
+        assert response.mimetype == 'text/plain'
+        assert int(response.headers['X-Profile-Samples']) > 0
+        # Folded stacks: "frame;frame;... count", and the cached view still ran
+        assert 'slow_helper' in response.get_data(as_text=True)
+        line = response.get_data(as_text=True).splitlines()[0]
+        assert line.rsplit(' ', 1)[1].isdigit()
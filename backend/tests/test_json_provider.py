@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_provider
+from json_provider import FastJSONProvider, frame_records, series_dict
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def flask_app(request, monkeypatch):
+    """An app using the fast provider, with and without orjson available."""
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip('orjson is not installed')
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+class TestFastJSONProvider:
+    def test_numpy_and_pandas_values(self, flask_app):
+        """numpy scalars, Series, DataFrames, Timestamps and missing values encode natively."""
+        payload = {
+            'count': np.int64(3),
+            'rate': np.float64(61.5),
+            'flag': np.bool_(True),
+            'array': np.arange(3),
+            'by_year': pd.Series([4, 2], index=[2019, 2020]),
+            'frame': pd.DataFrame({'name': ['A', None], 'age': [30.0, np.nan]}),
+            'when': pd.Timestamp('2020-01-02'),
+            'missing': pd.NaT,
+        }
+        with flask_app.app_context():
+            data = json.loads(flask_app.json.dumps(payload))
+        assert data == {
+            'count': 3,
+            'rate': 61.5,
+            'flag': True,
+            'array': [0, 1, 2],
+            'by_year': {'2019': 4, '2020': 2},
+            'frame': [{'name': 'A', 'age': 30.0}, {'name': None, 'age': None}],
+            'when': '2020-01-02T00:00:00',
+            'missing': None,
+        }
+
+    def test_keys_are_sorted_like_flask(self, flask_app):
+        """Responses keep Flask's sorted keys, so bodies and ETags are stable."""
+        with flask_app.test_request_context():
+            body = jsonify({'b': 1, 'a': {'d': 2, 'c': 3}}).get_data(as_text=True)
+        assert body.replace(' ', '').strip() == '{"a":{"c":3,"d":2},"b":1}'
+
+    def test_explicit_options_use_stdlib(self, flask_app):
+        """Callers passing json.dumps options still get them honoured."""
+        with flask_app.app_context():
+            assert flask_app.json.dumps({'a': 1}, indent=2) == '{\n  "a": 1\n}'
+
+class TestFrameRecords:
+    def test_matches_to_dict_with_none_for_missing(self):
+        """frame_records equals to_dict('records') with missing values as None."""
+        df = pd.DataFrame({
+            'id': [1, 2, 3],
+            'rate': [0.5, np.nan, 1.0],
+            'country': ['USA', None, 'Brazil'],
+            'wins': pd.array([3, None, 1], dtype='Int64'),
+            'date': pd.to_datetime(['2020-01-01', None, '2021-06-01']),
+        })
+        records = frame_records(df)
+        assert records[0] == {'id': 1, 'rate': 0.5, 'country': 'USA', 'wins': 3,
+                              'date': pd.Timestamp('2020-01-01').to_pydatetime()}
+        assert records[1] == {'id': 2, 'rate': None, 'country': None, 'wins': None, 'date': None}
+        assert all(type(record['id']) is int for record in records)
+
+    def test_series_dict(self):
+        """series_dict returns Python keys and values."""
+        result = series_dict(pd.Series(np.array([3, 1]), index=pd.Index([2019, 2020])))
+        assert result == {2019: 3, 2020: 1}
+        assert all(type(key) is int and type(value) is int for key, value in result.items())
@@ -0,0 +1,78 @@
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fighter_metrics import METRIC_COLUMNS, build_fighter_metrics
+from fighter_store import FighterStore
+from leaderboards import Leaderboards
+
+WEIGHT_CLASSES = ['Lightweight', 'Welterweight', None, 'Lightweight', 'Flyweight']
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(11)
+    n = 60
+    wins = rng.integers(0, 20, n).astype(float)
+    fighters = pd.DataFrame({
+        'fighter_id': [f'f{i}' for i in range(n)],
+        'name': [f'Fighter {i}' for i in range(n)],
+        'birthdate': pd.to_datetime(['1990-01-01'] * n),
+        'wins': wins,
+        'losses': rng.integers(0, 8, n).astype(float),
+        'draws': np.zeros(n),
+        'wins_by_ko_tko': np.floor(wins / 2),
+        'wins_by_submission': np.floor(wins / 3),
+        'country': ['Brazil', None, 'USA', 'USA', 'Japan'] * (n // 5),
+        'weight (lbs)': [155.0] * n,
+        'height (cm)': [175.0] * n,
+    })
+    fights = pd.DataFrame({'left_fighter_id': ['f0'], 'right_fighter_id': ['f1']})
+    return build_fighter_metrics(fighters, fights, now=datetime(2024, 1, 1))
+
+@pytest.fixture
+def leaderboards(table):
+    weight_classes = [WEIGHT_CLASSES[int(fighter_id[1:]) % 5] for fighter_id in table['fighter_id']]
+    return Leaderboards(FighterStore(table), weight_classes)
+
+def expected(table, metric, predicate=lambda record: True):
+    """A stable descending sort of the matching records, as the endpoints used to do it."""
+    store = FighterStore(table)
+    records = [store.record(row) for row in range(len(store))]
+    for record in records:
+        record['weight_class'] = WEIGHT_CLASSES[int(record['fighter_id'][1:]) % 5]
+    ranked = sorted((r for r in records if predicate(r)), key=lambda r: r[metric], reverse=True)
+    return [{key: r[key] for key in METRIC_COLUMNS} for r in ranked]
+
+class TestLeaderboards:
+    @pytest.mark.parametrize('metric', ['win_rate', 'finish_rate', 'total_fights', 'ko_tko_wins'])
+    def test_ranking_matches_sort(self, table, leaderboards, metric):
+        """Unfiltered rankings equal a stable descending sort."""
+        assert leaderboards.ranked(metric)[:] == expected(table, metric)
+
+    def test_filters_match_sort(self, table, leaderboards):
+        """Dimension filters and min_fights select the same fighters in the same order."""
+        result = leaderboards.ranked('finish_rate', weight_class='Lightweight', country='USA', min_fights=5)
+        assert result[:] == expected(table, 'finish_rate', lambda r: r['weight_class'] == 'Lightweight'
+                                     and r['country'] == 'USA' and r['total_fights'] >= 5)
+        assert leaderboards.top('wins', 3, category='Elite') == expected(
+            table, 'wins', lambda r: r['category'] == 'Elite')[:3]
+
+    def test_single_filter_is_a_slice(self, leaderboards):
+        """One dimension filter returns a view of the precomputed posting list."""
+        rows = leaderboards.ranked('win_rate', country='Brazil').rows
+        assert rows.base is not None and not rows.flags.writeable
+
+    def test_unknown_values(self, leaderboards):
+        """Unknown filter values match nothing; unknown metrics and dimensions raise."""
+        assert len(leaderboards.ranked('win_rate', country='Atlantis')) == 0
+        assert len(leaderboards.ranked('win_rate', country='USA', weight_class='Atlantis')) == 0
+        with pytest.raises(KeyError):
+            leaderboards.ranked('reach')
+        with pytest.raises(KeyError):
+            leaderboards.ranked('win_rate', stance='Orthodox')
@@ -0,0 +1,139 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lineage
+from lineage import ChampionshipLineage, FightIndex, batch_records_after, build_title_reigns
+
+@pytest.fixture
+def master():
+    """A small lightweight lineage: A -> B -> A, with non-title fights around it."""
+    return pd.DataFrame([
+        ('A', 'X', '2020-01-01', 'Red', True, 'Lightweight'),
+        ('A', 'Y', '2020-06-01', 'Red', True, 'Lightweight'),
+        ('B', 'A', '2021-01-01', 'Red', True, 'Lightweight'),
+        ('A', 'Z', '2021-06-01', 'Blue', False, 'Lightweight'),
+        ('W', 'A', '2022-01-01', 'Blue', False, 'Lightweight'),
+        ('A', 'B', '2022-06-01', 'Red', True, 'Lightweight'),
+        ('B', 'Q', '2023-01-01', 'Draw', False, 'Lightweight'),
+    ], columns=['RedFighter', 'BlueFighter', 'Date', 'Winner', 'TitleBout', 'WeightClass'])
+
+class TestFightIndex:
+    def test_fights_for_is_date_ordered(self, master):
+        """Posting lists are sorted by date regardless of input order."""
+        index = FightIndex(master.iloc[::-1])
+        dates = index.dates[index.fights_for('A')]
+        assert list(dates) == sorted(dates)
+        assert len(index.fights_for('A')) == 6
+
+    def test_record_after(self, master):
+        """Records after a date only count later fights, draws included."""
+        index = FightIndex(master)
+        assert index.record_after('A', '2021-01-01') == (2, 1, 0)
+        assert index.record_after('B', '2021-01-01') == (0, 1, 1)
+        assert index.record_after('Unknown', '2000-01-01') == (0, 0, 0)
+
+    def test_as_of_queries(self, master):
+        """Records, streaks and opponents as of a date only see fights up to it."""
+        index = FightIndex(master)
+        assert index.record_as_of('A', '2021-06-01') == (2, 2, 0)
+        assert index.record_between('A', after='2020-01-01', through='2022-01-01') == (2, 2, 0)
+        assert index.streak_as_of('A', '2021-06-01') == ('loss', 2)
+        assert index.streak_as_of('A') == ('win', 2)
+        assert index.streak_as_of('A', '2019-01-01') == (None, 0)
+        assert index.opponents_before('A', '2021-06-01') == ['X', 'Y', 'B']
+        assert [fight['result'] for fight in index.history('B', after='2021-01-01')] == ['loss', 'draw']
+
+    def test_merged_spellings(self, master):
+        """A fighter listed under two spellings is queried as one posting list in date order."""
+        master.loc[[1, 4], 'RedFighter'] = master.loc[[1, 4], 'RedFighter'].replace('A', 'A2')
+        master.loc[4, 'BlueFighter'] = 'A2'
+        index = FightIndex(master)
+        assert index.record_as_of(['A', 'A2']) == FightIndex(master.replace('A2', 'A')).record_as_of('A') == (4, 2, 0)
+        history = index.history(['A2', 'A'])
+        assert [fight['opponent'] for fight in history] == ['X', 'Y', 'B', 'Z', 'W', 'B']
+        assert [fight['corner'] for fight in history] == ['red', 'red', 'blue', 'red', 'blue', 'red']
+        assert index.streak_as_of(['A', 'A2']) == ('win', 2)
+        assert index.streak_as_of(['A', 'A2'], '2021-06-01') == ('loss', 2)
+        assert index.streak_as_of([], '2021-06-01') == (None, 0)
+
+    @pytest.mark.parametrize('split', [3, 5])
+    def test_extended_matches_full_index(self, master, split):
+        """Appending fights gives the same posting lists as indexing everything."""
+        extended = FightIndex(master.iloc[:split]).extended(master.iloc[split:].reset_index(drop=True))
+        full = FightIndex(master)
+        for name in full.fighters:
+            assert list(extended.dates[extended.fights_for(name)]) == list(full.dates[full.fights_for(name)])
+        assert extended.record_after('A', '2021-01-01') == (2, 1, 0)
+        assert extended.streak_as_of('A') == full.streak_as_of('A')
+
+    def test_extended_with_back_dated_fights(self, master):
+        """Fights older than the index are still placed in date order."""
+        extended = FightIndex(master.iloc[3:]).extended(master.iloc[:3].reset_index(drop=True))
+        dates = extended.dates[extended.fights_for('A')]
+        assert list(dates) == sorted(dates)
+        assert extended.record_after('A', '2021-01-01') == (2, 1, 0)
+
+class TestChampionshipLineage:
+    def test_title_reigns(self, master):
+        """Each change of title holder starts a new reign."""
+        reigns = build_title_reigns(master)
+        assert list(reigns['champion']) == ['A', 'B', 'A']
+        assert list(reigns['title_defenses']) == [1, 0, 0]
+        assert reigns.iloc[0]['lost_to'] == 'B'
+        assert pd.isna(reigns.iloc[2]['lost_date'])
+
+    def test_former_champions_and_records(self, master):
+        """Former champions keep their first title loss and record after it."""
+        lineage = ChampionshipLineage(master)
+        assert list(lineage.former_champions) == ['A', 'B']
+        assert lineage.former_champions['A']['lost_belt_date'] == pd.Timestamp('2021-01-01')
+        records = {r['name']: r for r in lineage.post_reign_records}
+        assert records['A']['wins_after_belt'] == 2
+        assert records['B']['draws_after_belt'] == 1
+
+    def test_extended_lineage(self, master):
+        """Appending the rest of the history gives the same reigns and records."""
+        lineage = ChampionshipLineage(master.iloc[:2]).extended(master.iloc[2:].reset_index(drop=True))
+        full = ChampionshipLineage(master)
+        assert lineage.reigns.equals(full.reigns)
+        assert lineage.post_reign_records == full.post_reign_records
+
+    def test_empty_master(self):
+        """An empty master frame yields no lineage."""
+        lineage = ChampionshipLineage(pd.DataFrame())
+        assert lineage.former_champions == {}
+        assert lineage.post_reign_records == []
+
+
+class TestBatchRecordsAfter:
+    def test_parallel_matches_serial(self, master, monkeypatch):
+        """A process pool answers the same records, in query order."""
+        monkeypatch.setattr(lineage, 'MIN_PARALLEL_QUERIES', 1)
+        index = FightIndex(master)
+        queries = [(name, date) for name in ['A', 'B', 'C', 'unknown'] for date in master['Date']] * 3
+        serial = batch_records_after(index, queries)
+        assert batch_records_after(index, queries, workers=2) == serial
+        assert serial[0] == index.record_after(*queries[0])
+
+    def test_explicit_workers_start_a_pool(self, master, monkeypatch):
+        """Asking for workers runs a pool even for a small batch; leaving it to the batch size does not."""
+        started = []
+        get_context = lineage.multiprocessing.get_context
+
+        def spy(method=None):
+            started.append(method)
+            return get_context(method)
+        monkeypatch.setattr(lineage.multiprocessing, 'get_context', spy)
+        index = FightIndex(master)
+        champions = [{'name': 'A', 'lost_belt_date': '2021-01-01'}, {'name': 'B', 'lost_belt_date': '2022-06-01'}]
+        records = lineage.calculate_post_reign_records(index, champions, workers=2)
+        assert len(started) == 1
+        assert [record['wins_after_belt'] for record in records] == [2, 0]
+        assert records == lineage.calculate_post_reign_records(index, champions)
+        batch_records_after(index, [('A', '2021-01-01')] * 10, workers=None)
+        assert len(started) == 1
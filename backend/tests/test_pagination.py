@@ -0,0 +1,77 @@
+import json
+import os
+import sys
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pagination import (MAX_PAGE_SIZE, PageRequestError, decode_cursor, encode_cursor, ndjson_response,
+                        paginate, parse_page_request, project)
+
+ITEMS = [{'id': i, 'name': f'fighter {i}', 'wins': i * 2} for i in range(25)]
+
+@pytest.fixture
+def client():
+    """A tiny app listing ITEMS the way the list endpoints do."""
+    app = Flask(__name__)
+
+    @app.route('/items')
+    def items():
+        try:
+            page_request = parse_page_request('v1')
+        except PageRequestError as e:
+            return jsonify({'error': str(e)}), 400
+        page, pagination = paginate(ITEMS, page_request, 'v1', default_limit=10)
+        if page_request.ndjson:
+            return ndjson_response(page, pagination, page_request.fields)
+        return jsonify({'items': project(page, page_request.fields), 'pagination': pagination})
+
+    return app.test_client()
+
+class TestPagination:
+    def test_default_limit(self, client):
+        """Without arguments the first default_limit items are returned."""
+        data = json.loads(client.get('/items').data)
+        assert [item['id'] for item in data['items']] == list(range(10))
+        assert data['pagination']['total'] == 25
+        assert data['pagination']['next_cursor'] is not None
+
+    def test_cursor_walks_every_item_once(self, client):
+        """Following next_cursor visits each item exactly once."""
+        seen, url = [], '/items?limit=7'
+        while url:
+            data = json.loads(client.get(url).data)
+            seen += [item['id'] for item in data['items']]
+            cursor = data['pagination']['next_cursor']
+            url = f'/items?limit=7&cursor={cursor}' if cursor else None
+        assert seen == list(range(25))
+
+    def test_limit_is_capped(self, client):
+        """Limits are clamped to [1, MAX_PAGE_SIZE]."""
+        assert json.loads(client.get('/items?limit=0').data)['pagination']['limit'] == 1
+        assert json.loads(client.get('/items?limit=100000').data)['pagination']['limit'] == MAX_PAGE_SIZE
+
+    def test_fields_projection(self, client):
+        """Only the requested (and existing) fields are kept."""
+        data = json.loads(client.get('/items?fields=name,missing&limit=2').data)
+        assert data['items'] == [{'name': 'fighter 0'}, {'name': 'fighter 1'}]
+
+    def test_ndjson_streams_one_record_per_line(self, client):
+        """NDJSON responses stream every remaining item, one JSON document per line."""
+        response = client.get('/items?format=ndjson&offset=20&fields=id')
+        assert response.mimetype == 'application/x-ndjson'
+        assert response.is_streamed
+        lines = response.data.decode().splitlines()
+        assert [json.loads(line) for line in lines] == [{'id': i} for i in range(20, 25)]
+        assert response.headers['X-Total-Count'] == '25'
+        assert 'X-Next-Cursor' not in response.headers
+
+    def test_cursor_from_another_version_is_rejected(self, client):
+        """A cursor only works against the dataset version it was issued for."""
+        assert decode_cursor(encode_cursor('v1', 12), 'v1') == 12
+        with pytest.raises(PageRequestError):
+            decode_cursor(encode_cursor('v0', 12), 'v1')
+        assert client.get(f"/items?cursor={encode_cursor('v0', 12)}").status_code == 400
+        assert client.get('/items?cursor=not-a-cursor!').status_code == 400
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictions import (DIFFERENCE_FEATURES, FEATURES, OutcomeModel, implied_probability, load_outcome_model,
+                         predict_card, train_outcome_model)
+
+@pytest.fixture
+def master():
+    """Synthetic fights where the red corner wins more often the bigger its odds edge and win difference."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    edge = rng.normal(0, 1, n)
+    wins = rng.integers(-5, 6, n)
+    red_wins = rng.random(n) < 1 / (1 + np.exp(-(1.5 * edge - 0.2 * wins)))
+    favourite_odds = -100 - np.round(np.abs(edge) * 150)
+    underdog_odds = 100 + np.round(np.abs(edge) * 130)
+    df = pd.DataFrame({column: rng.integers(-3, 4, n) for column in DIFFERENCE_FEATURES})
+    df['WinDif'] = wins
+    df['RedOdds'] = np.where(edge > 0, favourite_odds, underdog_odds)
+    df['BlueOdds'] = np.where(edge > 0, underdog_odds, favourite_odds)
+    df['RedFighter'] = [f'R{i}' for i in range(n)]
+    df['BlueFighter'] = [f'B{i}' for i in range(n)]
+    df['Date'] = pd.date_range('2010-01-01', periods=n, freq='D')
+    df['WeightClass'] = 'Lightweight'
+    df['TitleBout'] = False
+    df['Winner'] = np.where(red_wins, 'Red', 'Blue')
+    return df
+
+class TestOutcomeModel:
+    def test_implied_probability(self):
+        """Favourites (negative odds) and underdogs convert to probabilities; invalid odds are NaN."""
+        probability = implied_probability([-200, 100, 300, np.nan, 50])
+        assert probability[:3] == pytest.approx([2 / 3, 0.5, 0.25])
+        assert np.isnan(probability[3:]).all()
+
+    def test_training_learns_the_signal(self, master):
+        """The odds edge gets a positive weight and a higher win difference for blue a negative one."""
+        model = train_outcome_model(master)
+        coef = dict(zip(model.features, model.coef))
+        assert coef['OddsLogit'] > 0 and coef['WinDif'] < 0
+        assert model.metrics['holdout_fights'] == 400
+        assert model.metrics['accuracy'] > 0.65
+        assert model.training_fights == len(master)
+
+    def test_missing_features_score_as_the_mean(self, master):
+        """Bouts without odds or stats still get a probability."""
+        model = train_outcome_model(master)
+        card = master.head(3).copy()
+        card.loc[0, ['RedOdds', 'BlueOdds', 'WinDif']] = np.nan
+        probability = model.predict(card)
+        assert np.isfinite(probability).all()
+
+    def test_save_and_load(self, master, tmp_path):
+        """The saved artifact scores exactly like the trained model."""
+        model = train_outcome_model(master)
+        model.save(tmp_path / 'outcome_model.json')
+        loaded = load_outcome_model(str(tmp_path))
+        assert loaded.features == FEATURES
+        assert np.array_equal(loaded.predict(master), model.predict(master))
+        assert load_outcome_model(str(tmp_path / 'missing')) is None
+
+    def test_stale_artifact_is_rejected(self, master):
+        data = train_outcome_model(master).to_dict()
+        data['features'] = data['features'][:-1]
+        with pytest.raises(ValueError):
+            OutcomeModel.from_dict(data)
+
+    def test_predict_card(self, master):
+        """Each bout gets complementary probabilities and the likelier winner."""
+        model = train_outcome_model(master)
+        predictions = predict_card(model, master.head(5))
+        assert [bout['red_fighter'] for bout in predictions] == list(master['RedFighter'].head(5))
+        for bout in predictions:
+            assert bout['red_win_probability'] + bout['blue_win_probability'] == pytest.approx(1)
+            expected = bout['red_fighter'] if bout['red_win_probability'] >= 0.5 else bout['blue_fighter']
+            assert bout['predicted_winner'] == expected
+        assert predict_card(model, master.head(0)) == []
@@ -0,0 +1,117 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ratings import EloRatings, INITIAL_RATING, K_FACTOR
+
+@pytest.fixture
+def events():
+    return pd.DataFrame({
+        'event_id': ['e1', 'e2', 'e3'],
+        'date': pd.to_datetime(['2020-01-01', '2020-06-01', '2021-01-01']),
+    })
+
+@pytest.fixture
+def fights():
+    """Listed main event first, like fights.csv; e1 is a one-night tournament for A."""
+    return pd.DataFrame([
+        ('f3', 'e1', 'A', 'C', 'L', 3),
+        ('f2', 'e1', 'C', 'D', 'L', 2),
+        ('f1', 'e1', 'A', 'B', 'L', 1),
+        ('f5', 'e2', 'B', 'D', 'D', 2),
+        ('f4', 'e2', 'C', 'A', 'R', 1),
+        ('f6', 'e2', 'E', 'F', None, 3),
+        ('f8', 'e3', 'D', 'A', 'L', 2),
+        ('f7', 'e3', 'E', 'B', 'L', 1),
+        ('f9', 'e9', 'A', 'F', 'L', 1),
+    ], columns=['fight_id', 'event_id', 'left_fighter_id', 'right_fighter_id', 'winner', 'match']).assign(
+        left_fighter_name=lambda df: df['left_fighter_id'] + ' Name',
+        right_fighter_name=lambda df: df['right_fighter_id'] + ' Name')
+
+def sequential_ratings(fights, events):
+    """Reference Elo: one fight at a time in (date, match) order."""
+    dates = fights['event_id'].map(events.set_index('event_id')['date'])
+    ordered = fights.assign(date=dates).dropna(subset=['date', 'winner']).sort_values(['date', 'match'])
+    ratings = {}
+    for left, right, winner in zip(ordered['left_fighter_id'], ordered['right_fighter_id'], ordered['winner']):
+        score = {'L': 1.0, 'R': 0.0, 'D': 0.5}[winner]
+        rating_left, rating_right = ratings.get(left, INITIAL_RATING), ratings.get(right, INITIAL_RATING)
+        change = K_FACTOR * (score - 1 / (1 + 10 ** ((rating_right - rating_left) / 400)))
+        ratings[left], ratings[right] = rating_left + change, rating_right - change
+    return ratings
+
+class TestEloRatings:
+    def test_matches_sequential_replay(self, fights, events):
+        """Vectorized waves give the same ratings as a fight-by-fight replay."""
+        ratings = EloRatings(fights, events)
+        expected = sequential_ratings(fights, events)
+        assert set(ratings.codes) == set(expected)
+        for fighter_id, rating in expected.items():
+            assert ratings.ratings[ratings.code(fighter_id)] == pytest.approx(rating)
+
+    def test_unrated_fights(self, fights, events):
+        """No contests and fights at unknown events are left out."""
+        ratings = EloRatings(fights, events)
+        assert len(ratings) == 7
+        assert ratings.code('F') is None
+        assert ratings.unmatched_events == {'e9'}
+
+    def test_no_contests_are_not_rated(self, fights, events):
+        """A 'D' whose method is a no contest (or overturned) is left out; real draws are rated."""
+        methods = pd.Series('KO/TKO', index=fights.index)
+        methods[fights['fight_id'] == 'f5'] = 'No Contest (Overturned by NSAC)'
+        ratings = EloRatings(fights.assign(method=methods), events)
+        assert len(ratings) == 6
+        assert 'f5' not in [fight['fight_id'] for fight in ratings.history(ratings.code('B'))]
+        expected = sequential_ratings(fights[fights['fight_id'] != 'f5'], events)
+        for fighter_id, rating in expected.items():
+            assert ratings.ratings[ratings.code(fighter_id)] == pytest.approx(rating)
+        methods[fights['fight_id'] == 'f5'] = 'Draw (Split)'
+        assert len(EloRatings(fights.assign(method=methods), events)) == 7
+
+    def test_history(self, fights, events):
+        """A fighter's history chains rating_before -> rating across their fights in date order."""
+        ratings = EloRatings(fights, events)
+        history = ratings.history(ratings.code('A'))
+        assert [fight['fight_id'] for fight in history] == ['f1', 'f3', 'f4', 'f8']
+        assert [fight['result'] for fight in history] == ['win', 'win', 'win', 'loss']
+        assert history[0]['rating_before'] == INITIAL_RATING
+        for previous, fight in zip(history, history[1:]):
+            assert fight['rating_before'] == previous['rating']
+        summary = ratings.fighter(ratings.code('A'))
+        assert summary['fights'] == 4 and summary['last_fight'] == '2021-01-01'
+        assert summary['peak_rating'] == max(fight['rating'] for fight in history)
+
+    def test_ranked(self, fights, events):
+        """The leaderboard is sorted by rating and honours its filters."""
+        ratings = EloRatings(fights, events)
+        leaders = ratings.ranked()
+        assert [fighter['rank'] for fighter in leaders[:]] == list(range(1, len(leaders) + 1))
+        values = [fighter['rating'] for fighter in leaders[:]]
+        assert values == sorted(values, reverse=True)
+        assert leaders[0] == leaders[:1][0]
+        assert {fighter['fighter_id'] for fighter in ratings.ranked(min_fights=4)[:]} == {'A'}
+        assert 'C' not in {fighter['fighter_id'] for fighter in ratings.ranked(active_since='2020-12-01')[:]}
+
+    def test_extended_matches_full_build(self, fights, events):
+        """Rating appended fights continues from the stored ratings."""
+        full = EloRatings(fights, events)
+        ratings = EloRatings(fights[fights['event_id'] != 'e3'], events).extended(fights[fights['event_id'] == 'e3'], events)
+        assert len(ratings) == len(full)
+        for fighter_id, code in full.codes.items():
+            assert ratings.ratings[ratings.code(fighter_id)] == pytest.approx(full.ratings[code])
+        assert ratings.history(ratings.code('A')) == full.history(full.code('A'))
+
+    def test_backdated_fights_are_not_extended(self, fights, events):
+        """Fights dated before the last rated fight need a rebuild."""
+        ratings = EloRatings(fights[fights['event_id'] != 'e1'], events)
+        assert ratings.extended(fights[fights['event_id'] == 'e1'], events) is None
+
+    def test_empty_fights(self, events):
+        ratings = EloRatings(pd.DataFrame(), events)
+        assert len(ratings) == 0 and len(ratings.ranked()) == 0
@@ -0,0 +1,113 @@
+import gzip
+import json
+import os
+import sys
+import threading
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import compute_dataset_version
+from response_cache import CachedBody, ResponseCache
+
+@pytest.fixture
+def cached_app():
+    """A tiny app whose single view counts how often it actually runs."""
+    state = {'version': 'v1', 'calls': 0}
+    cache = ResponseCache(lambda: state['version'])
+    app = Flask(__name__)
+
+    @app.route('/data')
+    @cache.cached
+    def data():
+        state['calls'] += 1
+        return jsonify({'calls': state['calls'], 'payload': 'x' * 1000})
+
+    @app.route('/fail')
+    @cache.cached
+    def fail():
+        state['calls'] += 1
+        return jsonify({'error': 'boom'}), 500
+
+    return app.test_client(), state
+
+class TestResponseCache:
+    def test_repeated_requests_are_served_from_cache(self, cached_app):
+        """The view runs once per dataset version and query string."""
+        client, state = cached_app
+        first = client.get('/data')
+        second = client.get('/data')
+        assert first.data == second.data
+        assert state['calls'] == 1
+        client.get('/data?limit=3')
+        assert state['calls'] == 2
+
+    def test_conditional_request_returns_304(self, cached_app):
+        """Clients revalidating with the ETag get an empty 304."""
+        client, _ = cached_app
+        etag = client.get('/data').headers['ETag']
+        response = client.get('/data', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_gzip_variant(self, cached_app):
+        """Clients accepting gzip get the precompressed body."""
+        client, _ = cached_app
+        response = client.get('/data', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data))['calls'] == 1
+
+    def test_new_dataset_version_invalidates(self, cached_app):
+        """Changing the dataset version rebuilds the response and its ETag."""
+        client, state = cached_app
+        old_etag = client.get('/data').headers['ETag']
+        state['version'] = 'v2'
+        response = client.get('/data', headers={'If-None-Match': old_etag})
+        assert response.status_code == 200
+        assert state['calls'] == 2
+
+    def test_store_from_before_a_reload_is_dropped(self):
+        """A response finished with the old version neither evicts nor downgrades the new one."""
+        state = {'version': 'v1'}
+        cache = ResponseCache(lambda: state['version'])
+        old, new = CachedBody(b'old', 'e1', 'application/json'), CachedBody(b'new', 'e2', 'application/json')
+        cache.store('v1', 'a', old)
+        state['version'] = 'v2'
+        cache.store('v2', 'b', new)
+        assert cache.lookup('v2', 'b') is new and cache.lookup('v2', 'a') is None
+        cache.store('v1', 'a', old)
+        assert cache.version == 'v2'
+        assert cache.lookup('v2', 'b') is new and cache.lookup('v1', 'a') is None
+
+    def test_hits_and_misses_are_counted_under_the_lock(self):
+        """Concurrent lookups count every hit and miss exactly once."""
+        cache = ResponseCache(lambda: 'v1')
+        cache.store('v1', 'a', CachedBody(b'a', 'e1', 'application/json'))
+
+        def look_up():
+            for _ in range(1000):
+                cache.lookup('v1', 'a')
+                cache.lookup('v1', 'b')
+        threads = [threading.Thread(target=look_up) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert (cache.hits, cache.misses) == (8000, 8000)
+
+    def test_errors_are_not_cached(self, cached_app):
+        """Only successful responses are cached."""
+        client, state = cached_app
+        assert client.get('/fail').status_code == 500
+        assert client.get('/fail').status_code == 500
+        assert state['calls'] == 2
+
+    def test_dataset_version_tracks_file_content(self, tmp_path):
+        """The dataset version changes when a data file changes."""
+        (tmp_path / 'events.csv').write_text('event_id\n1\n')
+        before = compute_dataset_version(str(tmp_path))
+        assert compute_dataset_version(str(tmp_path)) == before
+        (tmp_path / 'events.csv').write_text('event_id\n1\n2\n')
+        assert compute_dataset_version(str(tmp_path)) != before
@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search import FighterSearchIndex, normalize
+
+@pytest.fixture
+def index():
+    return FighterSearchIndex(pd.DataFrame({
+        'fighter_id': ['1', '2', '3', '4', '5'],
+        'name': ['Anderson Silva', 'Thiago Silva', 'Silvana Gomez Juarez', 'José Aldo', 'Jon Jones'],
+        'aka': ['The Spider', None, None, 'Scarface', 'Bones'],
+        'wins': [34.0, 18.0, 10.0, 31.0, 27.0],
+        'losses': [11.0, 7.0, 5.0, 8.0, 1.0],
+        'draws': [0.0, 0.0, 0.0, 0.0, 0.0],
+    }))
+
+def names(results):
+    return [r['name'] for r in results]
+
+class TestFighterSearchIndex:
+    def test_normalize_folds_accents_and_punctuation(self):
+        """Names are compared accent-insensitively and without punctuation."""
+        assert normalize('  José  ALDO! ') == 'jose aldo'
+        assert normalize(None) == ''
+
+    def test_prefix_ranks_before_substring(self, index):
+        """Name prefixes outrank word prefixes, which outrank plain substrings."""
+        total, results = index.search('silva')
+        assert total == 3
+        assert names(results) == ['Silvana Gomez Juarez', 'Anderson Silva', 'Thiago Silva']
+
+    def test_accent_insensitive_and_aka(self, index):
+        """Accents are folded and nicknames are searchable."""
+        assert names(index.search('jose')[1]) == ['José Aldo']
+        assert names(index.search('spider')[1]) == ['Anderson Silva']
+
+    def test_typo_tolerance(self, index):
+        """Misspelled queries still find the closest names."""
+        assert names(index.search('jon jnoes')[1])[0] == 'Jon Jones'
+        assert index.search('jon jnoes', fuzzy=False)[0] == 0
+
+    def test_limit_and_offset(self, index):
+        """Results are paged with limit/offset while the total stays stable."""
+        total, page = index.search('silva', limit=1, offset=1)
+        assert total == 3
+        assert names(page) == ['Anderson Silva']
+
+    def test_regex_input_is_literal(self, index):
+        """Regex metacharacters are never interpreted."""
+        assert index.search('(a+)+$') == index.search('a')
+        assert index.search('***') == (0, [])
+
+    def test_result_payload(self, index):
+        """Each result carries the record and win rate."""
+        result = index.search('jon jones')[1][0]
+        assert result['record'] == '27.0-1.0-0'
+        assert result['win_rate'] == 96.4
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import SNAPSHOT_FILE, build_snapshot, load_snapshot, load_tables
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A minimal data/ directory with one row per table."""
+    pd.DataFrame({'event_id': ['e1'], 'title': ['UFC 1'], 'date': ['1993-11-12'],
+                  'location': ['Denver, Colorado, USA']}).to_csv(tmp_path / 'events.csv', index=False)
+    pd.DataFrame({'fighter_id': ['f1'], 'name': ['Royce Gracie'], 'birthdate': ['1966-12-12'],
+                  'country': ['Brazil']}).to_csv(tmp_path / 'fighters.csv', index=False)
+    pd.DataFrame({'fight_id': ['x1'], 'left_fighter_id': ['f1'], 'right_fighter_id': ['f2'],
+                  'method': ['Submission']}).to_csv(tmp_path / 'fights.csv', index=False)
+    pd.DataFrame({'RedFighter': ['Royce Gracie'], 'BlueFighter': ['Gerard Gordeau'],
+                  'Date': ['1993-11-12'], 'Winner': ['Red'], 'RedOdds': [-200]}).to_csv(tmp_path / 'ufc-master.csv', index=False)
+    return str(tmp_path)
+
+class TestSnapshot:
+    def test_missing_snapshot_falls_back_to_csv(self, data_dir):
+        """Without a snapshot the CSVs are parsed with dates converted."""
+        assert load_snapshot(data_dir) is None
+        tables = load_tables(data_dir)
+        assert pd.api.types.is_datetime64_any_dtype(tables['events']['date'])
+        assert pd.api.types.is_datetime64_any_dtype(tables['ufc_master']['Date'])
+
+    def test_master_columns_are_pruned(self, data_dir):
+        """Only the ufc-master columns the lineage reads are loaded."""
+        assert list(load_tables(data_dir)['ufc_master'].columns) == ['RedFighter', 'BlueFighter', 'Date', 'Winner']
+
+    def test_fresh_snapshot_is_used(self, data_dir):
+        """A freshly built snapshot is typed and loaded instead of the CSVs."""
+        build_snapshot(data_dir)
+        tables = load_snapshot(data_dir)
+        assert tables is not None
+        assert isinstance(tables['fights']['method'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(tables['fighters']['birthdate'])
+
+    def test_stale_snapshot_is_ignored(self, data_dir):
+        """Touching a source file invalidates the snapshot."""
+        build_snapshot(data_dir)
+        pd.DataFrame({'fight_id': ['x1', 'x2'], 'left_fighter_id': ['f1', 'f1'],
+                      'right_fighter_id': ['f2', 'f3'], 'method': ['Submission', 'KO/TKO']}
+                     ).to_csv(os.path.join(data_dir, 'fights.csv'), index=False)
+        assert load_snapshot(data_dir) is None
+        assert len(load_tables(data_dir)['fights']) == 2
+
+    def test_unreadable_snapshot_is_ignored(self, data_dir):
+        """A corrupt snapshot file falls back to the CSVs."""
+        with open(os.path.join(data_dir, SNAPSHOT_FILE), 'wb') as f:
+            f.write(b'not a pickle')
+        assert load_snapshot(data_dir) is None
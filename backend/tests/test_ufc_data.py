@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ufc_data
+from ufc_data import UFCData
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A data/ directory with a small master table."""
+    pd.DataFrame({'RedFighter': ['A', 'C'], 'BlueFighter': ['B', 'D'],
+                  'Date': ['2020-01-01', '2021-06-05'], 'Winner': ['Red', 'Blue'],
+                  'RedOdds': [-150, 120]}).to_csv(tmp_path / 'ufc-master.csv', index=False)
+    return str(tmp_path)
+
+class TestUFCData:
+    def test_table_converts_dates(self, data_dir):
+        """Tables load lazily, as attributes or by name, with dates parsed."""
+        master = UFCData(data_dir).ufc_master
+        assert list(master.columns) == ['RedFighter', 'BlueFighter', 'Date', 'Winner', 'RedOdds']
+        assert pd.api.types.is_datetime64_any_dtype(master['Date'])
+
+    def test_declared_dtypes(self, data_dir):
+        """Columns are parsed with the dtypes declared in the schema registry."""
+        master = UFCData(data_dir).ufc_master
+        assert isinstance(master['Winner'].dtype, pd.CategoricalDtype)
+        assert master['RedOdds'].dtype == 'float32'
+        assert master['RedFighter'].dtype == object
+
+    def test_column_subset(self, data_dir):
+        """Only the requested columns are parsed and cached, in the requested order."""
+        master = UFCData(data_dir).table('ufc_master', columns=['Winner', 'RedFighter'])
+        assert list(master.columns) == ['Winner', 'RedFighter']
+        cached = sorted(os.listdir(os.path.join(data_dir, '.cache', 'ufc_master')))
+        assert cached == ['RedFighter.pkl', 'Winner.pkl']
+
+    def test_unknown_table_or_column(self, data_dir):
+        data = UFCData(data_dir)
+        with pytest.raises(KeyError):
+            data.table('nope')
+        with pytest.raises(KeyError):
+            data.table('ufc_master', columns=['Nope'])
+
+    def test_disk_cache_is_reused(self, data_dir, monkeypatch):
+        """A second process reads cached columns without parsing the CSV."""
+        expected = UFCData(data_dir).ufc_master
+
+        def no_parse(*args, **kwargs):
+            if kwargs.get('nrows') == 0:
+                return read_csv(*args, **kwargs)
+            raise AssertionError('CSV parsed despite a fresh cache')
+        read_csv = pd.read_csv
+        monkeypatch.setattr(ufc_data.pd, 'read_csv', no_parse)
+        pd.testing.assert_frame_equal(UFCData(data_dir).ufc_master, expected)
+
+    def test_stale_cache_is_ignored(self, data_dir):
+        """Rewriting the CSV invalidates its cached columns."""
+        UFCData(data_dir).ufc_master
+        pd.DataFrame({'RedFighter': ['E'], 'BlueFighter': ['F'], 'Date': ['2022-01-01'],
+                      'Winner': ['Red'], 'RedOdds': [100]}).to_csv(os.path.join(data_dir, 'ufc-master.csv'), index=False)
+        assert list(UFCData(data_dir).ufc_master['RedFighter']) == ['E']
+
+    def test_frames_are_copies(self, data_dir):
+        """Modifying a returned frame does not change later ones."""
+        data = UFCData(data_dir)
+        data.ufc_master.loc[0, 'Winner'] = 'Blue'
+        assert data.ufc_master.loc[0, 'Winner'] == 'Red'
+
+    def test_blank_integer_and_boolean_cells(self, data_dir):
+        """Blank cells in integer and boolean columns parse as missing instead of failing the table."""
+        pd.DataFrame({'RedFighter': ['A', 'C'], 'BlueFighter': ['B', 'D'], 'Date': ['2020-01-01', '2021-06-05'],
+                      'Winner': ['Red', 'Blue'], 'AgeDif': [3, None], 'TitleBout': [True, None]}).to_csv(
+            os.path.join(data_dir, 'ufc-master.csv'), index=False)
+        master = UFCData(data_dir).ufc_master
+        assert master['AgeDif'].dtype == 'Int8' and master['AgeDif'].isna().tolist() == [False, True]
+        assert master['TitleBout'].dtype == 'boolean' and master['TitleBout'].isna().tolist() == [False, True]
@@ -0,0 +1,229 @@
+"""
+Data access for the UFC tables in data/, shared by the backend and the
+analysis scripts.
+
+``UFCData(data_path)`` exposes every table as a lazily loaded DataFrame,
+either as an attribute (``data.fighters``) or through ``data.table(name,
+columns=[...])``. Only the requested columns are parsed, with the dtypes
+declared for them in ``SCHEMAS`` and their date columns converted. Every
+parsed column is kept in memory for the life of the ``UFCData`` object. It
+is also written to a per-column disk cache (``data/.cache/``) keyed by the
+source file's size and modification time, so later processes read it back
+instead of parsing the CSV again.
+"""
+
+import os
+import pickle
+from urllib.parse import quote
+
+import pandas as pd
+
+# table name -> source file in data/
+TABLE_FILES = {
+    'events': 'events.csv',
+    'fighters': 'fighters.csv',
+    'fights': 'fights.csv',
+    'ufc_master': 'ufc-master.csv',
+    'medium_dataset': 'medium_dataset.csv',
+    'fighter_stats': 'fighter_stats.csv',
+    'referees': 'referees.csv',
+    'upcoming': 'upcoming.csv',
+}
+
+# table name -> {column: to_datetime kwargs}
+DATE_COLUMNS = {
+    'events': {'date': {}},
+    'fighters': {'birthdate': {'errors': 'coerce'}},
+    'ufc_master': {'Date': {}},
+    'medium_dataset': {'date': {'format': '%m/%d/%Y', 'errors': 'coerce'}},
+    'referees': {'birthdate': {'errors': 'coerce'}},
+    'upcoming': {'Date': {}},
+}
+
+# Fight statistics shared by ufc-master.csv and upcoming.csv (same layout)
+_MASTER_SCHEMA = {
+    **dict.fromkeys(['RedFighter', 'BlueFighter'], 'object'),
+    **dict.fromkeys(['Location', 'Country', 'Winner', 'WeightClass', 'Gender', 'BlueStance', 'RedStance',
+                     'BetterRank', 'Finish', 'FinishDetails', 'FinishRoundTime'], 'category'),
+    'TitleBout': 'boolean',
+    **dict.fromkeys([f'{corner}{stat}' for corner in ('Red', 'Blue') for stat in (
+        'CurrentLoseStreak', 'CurrentWinStreak', 'Draws', 'LongestWinStreak', 'Losses', 'TotalTitleBouts',
+        'WinsByDecisionMajority', 'WinsByDecisionSplit', 'WinsByDecisionUnanimous', 'WinsByKO',
+        'WinsBySubmission', 'WinsByTKODoctorStoppage', 'Wins', 'Age')], 'Int8'),
+    **dict.fromkeys(['NumberOfRounds', 'LoseStreakDif', 'WinStreakDif', 'LongestWinStreakDif', 'WinDif',
+                     'LossDif', 'TotalTitleBoutDif', 'KODif', 'SubDif', 'AgeDif'], 'Int8'),
+    **dict.fromkeys(['RedTotalRoundsFought', 'BlueTotalRoundsFought', 'TotalRoundDif',
+                     'RedWeightLbs', 'BlueWeightLbs'], 'Int16'),
+    **dict.fromkeys([f'{corner}{stat}' for corner in ('Red', 'Blue') for stat in (
+        'Odds', 'ExpectedValue', 'AvgSigStrLanded', 'AvgSigStrPct', 'AvgSubAtt', 'AvgTDLanded', 'AvgTDPct',
+        'HeightCms', 'ReachCms', 'DecOdds')], 'float32'),
+    **dict.fromkeys(['HeightDif', 'ReachDif', 'SigStrDif', 'AvgSubAttDif', 'AvgTDDif', 'EmptyArena',
+                     'FinishRound', 'TotalFightTimeSecs', 'RSubOdds', 'BSubOdds', 'RKOOdds', 'BKOOdds'], 'float32'),
+    **dict.fromkeys([f'{corner}{division}Rank' for corner in ('R', 'B') for division in (
+        'MatchWC', 'WFlyweight', 'WFeatherweight', 'WStrawweight', 'WBantamweight', 'Heavyweight',
+        'LightHeavyweight', 'Middleweight', 'Welterweight', 'Lightweight', 'Featherweight', 'Bantamweight',
+        'Flyweight', 'PFP')], 'float32'),
+}
+
+# table name -> {column: dtype} passed to read_csv (date columns are in DATE_COLUMNS).
+# The tables the app serves keep float64 numbers so its computed rates are unchanged.
+# Integer and boolean columns use the nullable dtypes, so a blank cell reads as <NA>.
+# Undeclared columns are inferred; a value that does not fit its dtype fails the parse.
+SCHEMAS = {
+    'events': {'event_id': 'object', 'title': 'object', 'location': 'object', 'canceled': 'boolean'},
+    'fighters': {
+        **dict.fromkeys(['fighter_id', 'name', 'aka', 'associations', 'city'], 'object'),
+        **dict.fromkeys(['class_weight', 'country', 'sex'], 'category'),
+        **dict.fromkeys(['wins', 'losses', 'draws', 'wins_by_ko_tko', 'wins_by_submission', 'wins_by_decision',
+                         'wins_by_other', 'losses_by_ko_tko', 'losses_by_submission', 'losses_by_decision',
+                         'losses_by_other', 'weight (lbs)', 'height', 'height (cm)'], 'float64'),
+    },
+    'fights': {
+        **dict.fromkeys(['fight_id', 'event_id', 'left_fighter_id', 'left_fighter_name', 'right_fighter_id',
+                         'right_fighter_name', 'winner_name', 'time', 'referee_id'], 'object'),
+        **dict.fromkeys(['winner', 'method', 'weight_class', 'referee_name'], 'category'),
+        'is_main_event': 'boolean',
+        **dict.fromkeys(['match', 'round'], 'Int8'),
+    },
+    'ufc_master': _MASTER_SCHEMA,
+    'upcoming': _MASTER_SCHEMA,
+    'medium_dataset': {
+        **dict.fromkeys(['event', 'r_fighter', 'b_fighter', 'time'], 'object'),
+        **dict.fromkeys(['location', 'status', 'weight_class', 'method', 'method_detailed'], 'category'),
+        **dict.fromkeys(['r_kd', 'b_kd', 'r_str', 'b_str', 'r_td', 'b_td', 'r_sub', 'b_sub', 'round'], 'float32'),
+    },
+    'fighter_stats': {
+        'name': 'object',
+        'stance': 'category',
+        **dict.fromkeys(['wins', 'losses', 'height', 'weight', 'reach', 'age', 'SLpM', 'sig_str_acc', 'SApM',
+                         'str_def', 'td_avg', 'td_acc', 'td_def', 'sub_avg'], 'float32'),
+    },
+    'referees': {
+        **dict.fromkeys(['referee_id', 'name', 'aka', 'city'], 'object'),
+        'country': 'category',
+        **dict.fromkeys(['n_fights', 'ko_tko', 'submission', 'decision', 'draws', 'no_contests',
+                         'disqualifications'], 'Int16'),
+    },
+}
+
+CACHE_DIR = '.cache'
+CACHE_VERSION = 3
+
+
+def convert_dates(table, df):
+    """Convert ``table``'s date columns present in ``df`` in place and return it."""
+    for column, kwargs in DATE_COLUMNS.get(table, {}).items():
+        if not df.empty and column in df.columns:
+            df[column] = pd.to_datetime(df[column], **kwargs)
+    return df
+
+
+def parse_table(table, source, columns=None):
+    """Parse ``table``'s CSV from ``source`` (a path or buffer) with its declared dtypes.
+
+    Only ``columns`` are parsed when given; they come back in file order.
+    """
+    df = pd.read_csv(source, usecols=columns, dtype=SCHEMAS.get(table))
+    return convert_dates(table, df)
+
+
+class UFCData:
+    """Lazily loaded, cached tables from one data directory.
+
+    ``cache_dir`` defaults to ``.cache`` inside ``data_path``; pass False
+    to disable the disk cache. Cache writes that fail (for example on a
+    read-only data directory) are skipped.
+    """
+
+    def __init__(self, data_path='data', cache_dir=None):
+        self.data_path = data_path
+        self.cache_dir = os.path.join(data_path, CACHE_DIR) if cache_dir is None else cache_dir
+        self.headers = {}
+        self.loaded = {}
+
+    def __getattr__(self, name):
+        if name in TABLE_FILES:
+            return self.table(name)
+        raise AttributeError(name)
+
+    def path(self, table):
+        return os.path.join(self.data_path, TABLE_FILES[table])
+
+    def exists(self, table):
+        return os.path.exists(self.path(table))
+
+    def columns(self, table):
+        """The column names of ``table``, read from the CSV header."""
+        if table not in self.headers:
+            self.headers[table] = list(pd.read_csv(self.path(table), nrows=0).columns)
+        return self.headers[table]
+
+    def table(self, table, columns=None):
+        """``table`` as a new DataFrame, restricted to ``columns`` (in that order) if given.
+
+        Raises KeyError for an unknown table or column.
+        """
+        if table not in TABLE_FILES:
+            raise KeyError(table)
+        header = self.columns(table)
+        if columns is None:
+            columns = header
+        unknown = [column for column in columns if column not in header]
+        if unknown:
+            raise KeyError(f"{table} has no column(s) {', '.join(map(str, unknown))}")
+
+        loaded = self.loaded.setdefault(table, {})
+        missing = [column for column in header if column in columns and column not in loaded]
+        if missing:
+            source = self._source_signature(table)
+            for column in missing:
+                values = self._read_cached(table, column, source)
+                if values is not None:
+                    loaded[column] = values
+            missing = [column for column in missing if column not in loaded]
+        if missing:
+            parsed = parse_table(table, self.path(table), None if missing == header else missing)
+            for column in missing:
+                loaded[column] = parsed[column]
+                self._write_cached(table, column, source, parsed[column])
+
+        if not columns:
+            return pd.DataFrame()
+        # concat copies, so callers may modify the frame without touching the cache
+        return pd.concat([loaded[column] for column in columns], axis=1)
+
+    def _source_signature(self, table):
+        stat = os.stat(self.path(table))
+        return stat.st_size, stat.st_mtime_ns
+
+    def _cache_path(self, table, column):
+        return os.path.join(self.cache_dir, table, f"{quote(str(column), safe='')}.pkl")
+
+    def _read_cached(self, table, column, source):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(table, column), 'rb') as f:
+                cached = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry {table}.{column}: {e}")
+            return None
+        if cached.get('version') != CACHE_VERSION or cached.get('source') != source:
+            return None
+        return cached['values']
+
+    def _write_cached(self, table, column, source, values):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(table, column)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'version': CACHE_VERSION, 'source': source, 'values': values},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
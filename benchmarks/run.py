@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark every backend route and the offline analysis scripts.
+
+Routes are driven through the Flask test client in a fresh interpreter, so
+the reported import/startup time and peak RSS belong to the app alone. Each
+GET route under /api is timed cold (response cache cleared before every
+request, i.e. the full handler runs) and warm (served from the cache). The
+analysis scripts are run as subprocesses against the same data directory.
+
+Results are written as JSON and compared against a stored baseline:
+
+    python benchmarks/run.py                        # compare with benchmarks/baseline.json
+    python benchmarks/run.py --scale 10             # run against 10x synthetic data
+    python benchmarks/run.py --save-baseline        # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+BACKEND_DIR = os.path.join(REPO_DIR, 'backend')
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+SCRIPTS = [
+    'process_champions_history.py',
+    'comprehensive_champions_analysis.py',
+    'improved_analysis.py',
+    'analyze_champions.py',
+]
+
+# Values substituted for URL parameters, and extra query-string variants worth timing
+ROUTE_ARGUMENTS = {'name': 'silva'}
+EXTRA_ROUTES = [
+    '/api/fighters/search/silva?limit=50',
+    '/api/former-champions/top-performers?limit=25',
+    '/api/analytics/fight-outcomes?weight_class=Lightweight&year=2019',
+    '/api/leaderboards?metric=finish_rate&weight_class=Lightweight&min_fights=5',
+    '/api/analytics/cube?by=country,weight_class,sex',
+    '/api/fighters/resolve?name=Jon%20Jones',
+    '/api/fighters/compare?a=Jon%20Jones&b=Stipe%20Miocic&max_hops=4',
+    '/api/fighters/24d7cd4716ab4d72add63829d307f76b/record?as_of=2015-01-01',
+    '/api/ratings?min_fights=5&active_since=2023-01-01',
+    '/api/ratings/24d7cd4716ab4d72add63829d307f76b',
+]
+
+
+def latency_stats(samples):
+    """p50/p95/p99/mean latency (ms) and throughput (req/s) for timings in seconds."""
+    samples = np.asarray(samples, dtype=float)
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+    return {
+        'n': int(len(samples)),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(samples.mean()) * 1000, 3),
+        'throughput_rps': round(len(samples) / float(samples.sum()), 1) if samples.sum() else None,
+    }
+
+
+def peak_rss_mb(usage):
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(usage.ru_maxrss * scale / (1 << 20), 1)
+
+
+def benchmark_routes(requests_per_route):
+    """Runs inside the worker interpreter (cwd = data root): time every API route."""
+    sys.path.insert(0, BACKEND_DIR)
+    start = time.perf_counter()
+    import app as app_module
+    startup_s = time.perf_counter() - start
+
+    flask_app = app_module.app
+    flask_app.config['TESTING'] = True
+    client = flask_app.test_client()
+
+    routes = []
+    for rule in flask_app.url_map.iter_rules():
+        if 'GET' not in rule.methods or not rule.rule.startswith('/api/'):
+            continue
+        if any(argument not in ROUTE_ARGUMENTS for argument in rule.arguments):
+            continue
+        routes.append(rule.build(ROUTE_ARGUMENTS)[1] if rule.arguments else rule.rule)
+    routes = sorted(set(routes)) + EXTRA_ROUTES
+
+    results = {}
+    for route in routes:
+        timings = {'cold': [], 'warm': []}
+        status = None
+        for mode in ('cold', 'warm'):
+            for _ in range(requests_per_route):
+                if mode == 'cold':
+                    app_module.response_cache.clear()
+                t0 = time.perf_counter()
+                response = client.get(route)
+                timings[mode].append(time.perf_counter() - t0)
+                status = response.status_code
+        results[route] = {'status': status, **{mode: latency_stats(t) for mode, t in timings.items()}}
+
+    return {
+        'startup_s': round(startup_s, 3),
+        'peak_rss_mb': peak_rss_mb(resource.getrusage(resource.RUSAGE_SELF)),
+        'dataset_version': app_module.dataset_manager.current.version,
+        'fights': len(app_module.dataset_manager.current.fights_df),
+        'routes': results,
+    }
+
+
+def run_routes(data_root, requests_per_route):
+    """Run the route benchmark in a fresh interpreter rooted at ``data_root``."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', '--requests', str(requests_per_route)],
+        cwd=data_root, check=True, capture_output=True, text=True,
+    ).stdout
+    # The app prints load messages; the report is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_scripts(data_root, runs):
+    """Time each analysis script ``runs`` times in a scratch directory linked to the data."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='ufc-bench-') as scratch:
+        os.symlink(os.path.join(data_root, 'data'), os.path.join(scratch, 'data'))
+        for script in SCRIPTS:
+            timings, peak_rss, status = [], 0.0, 0
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                process = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, script)], cwd=scratch,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                _, status, usage = os.wait4(process.pid, 0)
+                timings.append(time.perf_counter() - t0)
+                peak_rss = max(peak_rss, peak_rss_mb(usage))
+            results[script] = {
+                'exit_status': os.waitstatus_to_exitcode(status),
+                'peak_rss_mb': peak_rss,
+                **latency_stats(timings),
+            }
+    return results
+
+
+def prepare_data_root(data_dir, scale):
+    """Return a directory containing ``data/``, generating synthetic data if scaled."""
+    if scale <= 1:
+        return os.path.dirname(os.path.abspath(data_dir)), None
+    sys.path.insert(0, BENCHMARK_DIR)
+    from synthetic_data import generate
+
+    scratch = tempfile.TemporaryDirectory(prefix=f'ufc-data-{scale}x-')
+    print(f"Generating {scale}x synthetic data...", file=sys.stderr)
+    generate(data_dir, os.path.join(scratch.name, 'data'), scale)
+    return scratch.name, scratch
+
+
+def compare(report, baseline, tolerance):
+    """Return a list of regression messages (p50 slower than baseline by more than ``tolerance``)."""
+    regressions = []
+
+    def check(label, current, previous):
+        if previous and current > previous * (1 + tolerance):
+            regressions.append(f"{label}: {previous:.3f} -> {current:.3f} (+{(current / previous - 1) * 100:.0f}%)")
+
+    check('startup_s', report['startup_s'], baseline.get('startup_s'))
+    for route, stats in report['routes'].items():
+        previous = baseline.get('routes', {}).get(route)
+        if previous:
+            check(f"{route} cold p50_ms", stats['cold']['p50_ms'], previous['cold']['p50_ms'])
+    for script, stats in report['scripts'].items():
+        previous = baseline.get('scripts', {}).get(script)
+        if previous and not stats['exit_status'] and not previous['exit_status']:
+            check(f"{script} p50_ms", stats['p50_ms'], previous['p50_ms'])
+    return regressions
+
+
+def print_report(report):
+    print(f"startup {report['startup_s']:.3f}s, peak RSS {report['peak_rss_mb']} MB, "
+          f"{report['fights']} fights (scale {report['meta']['scale']}x)")
+    print(f"{'route':<68} {'cold p50':>9} {'p95':>9} {'p99':>9} {'warm p50':>9} {'req/s':>9}")
+    for route, stats in report['routes'].items():
+        cold, warm = stats['cold'], stats['warm']
+        print(f"{route:<68} {cold['p50_ms']:>9.2f} {cold['p95_ms']:>9.2f} {cold['p99_ms']:>9.2f} "
+              f"{warm['p50_ms']:>9.2f} {cold['throughput_rps']:>9.1f}")
+    print(f"{'script':<68} {'p50 ms':>9} {'p95':>9} {'p99':>9} {'RSS MB':>9}")
+    for script, stats in report['scripts'].items():
+        failed = f"  (exit {stats['exit_status']})" if stats['exit_status'] else ''
+        print(f"{script:<68} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+              f"{stats['peak_rss_mb']:>9.1f}{failed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the backend routes and analysis scripts.')
+    parser.add_argument('--data', default=os.path.join(REPO_DIR, 'data'), help='source data directory')
+    parser.add_argument('--scale', type=int, default=1, help='replicate the fight tables N times (10-100)')
+    parser.add_argument('--requests', type=int, default=20, help='requests per route and mode')
+    parser.add_argument('--script-runs', type=int, default=3, help='runs per analysis script')
+    parser.add_argument('--skip-scripts', action='store_true', help='only benchmark the routes')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline report to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown before failing')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(benchmark_routes(args.requests)))
+        return 0
+
+    data_root, scratch = prepare_data_root(args.data, args.scale)
+    try:
+        report = run_routes(data_root, args.requests)
+        report['scripts'] = {} if args.skip_scripts else run_scripts(data_root, args.script_runs)
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+
+    report['meta'] = {
+        'scale': args.scale,
+        'requests': args.requests,
+        'script_runs': args.script_runs,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('scale') != args.scale:
+            print(f"Baseline was recorded at scale {baseline.get('meta', {}).get('scale')}x; not comparing")
+            return 0
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
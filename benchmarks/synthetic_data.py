@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Generate a scaled copy of data/ for benchmarking.
+
+fights.csv, ufc-master.csv and medium_dataset.csv are replicated ``factor``
+times. The original date range is split into ``factor`` consecutive slots
+and each copy's dates are compressed into its own slot, so the history
+stays chronological (title lineages keep running from copy to copy) and
+within the range pandas timestamps support; fight ids are re-derived so
+they stay unique. Every other data file is
+copied unchanged. The output is deterministic for a given source and factor.
+
+    python benchmarks/synthetic_data.py 10 /tmp/ufc-data-10x
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+
+import pandas as pd
+
+# file -> (date column, strftime format used in the file)
+SCALED_FILES = {
+    'fights.csv': (None, None),
+    'ufc-master.csv': ('Date', '%Y-%m-%d'),
+    'medium_dataset.csv': ('date', '%m/%d/%Y'),
+}
+SKIPPED_FILES = {'snapshot.pkl'}
+
+
+def _copy_id(fight_id, copy):
+    return hashlib.blake2b(f'{fight_id}:{copy}'.encode(), digest_size=16).hexdigest()
+
+
+def scale_table(df, factor, date_column=None, date_format=None):
+    """Replicate ``df`` ``factor`` times, compressing dates and re-deriving fight ids."""
+    if date_column is not None:
+        dates = pd.to_datetime(df[date_column], format=date_format)
+        start = dates.min()
+        slot = (dates.max() - start + pd.Timedelta(days=1)) / factor
+        compressed = (dates - start) / factor
+
+    copies = []
+    for copy in range(factor):
+        scaled = df.copy()
+        if date_column is not None:
+            scaled[date_column] = (start + slot * copy + compressed).dt.strftime(date_format)
+        if copy and 'fight_id' in scaled.columns:
+            scaled['fight_id'] = [_copy_id(fight_id, copy) for fight_id in df['fight_id']]
+        copies.append(scaled)
+    return pd.concat(copies, ignore_index=True)
+
+
+def generate(source_dir, target_dir, factor):
+    """Write a ``factor``-times scaled copy of ``source_dir`` to ``target_dir``."""
+    os.makedirs(target_dir, exist_ok=True)
+    for name in sorted(os.listdir(source_dir)):
+        source = os.path.join(source_dir, name)
+        target = os.path.join(target_dir, name)
+        if name in SKIPPED_FILES or not os.path.isfile(source):
+            continue
+        if name in SCALED_FILES and factor > 1:
+            date_column, date_format = SCALED_FILES[name]
+            scale_table(pd.read_csv(source), factor, date_column, date_format).to_csv(target, index=False)
+        else:
+            shutil.copy2(source, target)
+    return target_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('factor', type=int, help='how many times to replicate the fight tables')
+    parser.add_argument('target', help='directory to write the scaled data files to')
+    parser.add_argument('--source', default='data', help='data directory to scale (default: data)')
+    args = parser.parse_args()
+
+    generate(args.source, args.target, args.factor)
+    print(f"Wrote {args.factor}x data to {args.target}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,16 +3,21 @@
 Comprehensive analysis to identify ALL former UFC champions and their records after losing their belt.
 """
 
-import pandas as pd
+import argparse
 import json
 from datetime import datetime
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from lineage import MASTER_COLUMNS, FightIndex, build_title_reigns, identify_former_champions, calculate_post_reign_records
+from ufc_data import UFCData
 
 def load_ufc_data():
     """Load the UFC master dataset."""
     print("Loading UFC master dataset...")
-    df = pd.read_csv('data/ufc-master.csv')
-    df['Date'] = pd.to_datetime(df['Date'])
+    df = UFCData('data').table('ufc_master', columns=MASTER_COLUMNS)
     print(f"Loaded {len(df)} fights")
     return df
 
@@ -20,105 +25,47 @@ def identify_all_former_champions(df):
     """Identify ALL former champions from the dataset."""
     print("Identifying all former champions...")
     
-    # Filter for title bouts
-    title_bouts = df[df['TitleBout'] == True].copy()
-    title_bouts = title_bouts.sort_values('Date')
-    
-    print(f"Found {len(title_bouts)} title fights")
+    title_bouts = int((df['TitleBout'] == True).sum())
+    print(f"Found {title_bouts} title fights")
     
     # Track championship lineage by weight class
-    champions_by_weight = {}
-    former_champions = {}
-    
-    for _, fight in title_bouts.iterrows():
-        weight_class = fight['WeightClass']
-        red_fighter = fight['RedFighter']
-        blue_fighter = fight['BlueFighter']
-        winner = fight['Winner']
-        date = fight['Date']
-        
-        # Determine winner and loser
-        if winner == 'Red':
-            winner_name = red_fighter
-            loser_name = blue_fighter
-        elif winner == 'Blue':
-            winner_name = blue_fighter
-            loser_name = red_fighter
-        else:
-            continue  # Skip draws/no contests
-        
-        # Check if this is a title change (someone losing their belt)
-        current_champion = champions_by_weight.get(weight_class)
-        
-        if current_champion and current_champion != winner_name:
-            # Previous champion lost their belt
-            if current_champion not in former_champions:
-                former_champions[current_champion] = {
-                    'name': current_champion,
-                    'weight_class': weight_class,
-                    'lost_belt_date': date,
-                    'lost_to': winner_name,
-                    'title_defenses': 0
-                }
-        
-        # Update current champion
-        champions_by_weight[weight_class] = winner_name
+    reigns = build_title_reigns(df)
+    former_champions = identify_former_champions(reigns)
+    for champion in former_champions.values():
+        champion['title_defenses'] = 0
     
     print(f"Identified {len(former_champions)} former champions")
     return former_champions
 
-def calculate_post_title_records(df, former_champions):
+def calculate_post_title_records(df, former_champions, fight_index=None, workers=1):
     """Calculate records for all former champions after losing their title."""
     print("Calculating post-title records...")
     
+    fight_index = fight_index or FightIndex(df)
     results = []
     
-    for champion_name, champion_data in former_champions.items():
-        lost_belt_date = champion_data['lost_belt_date']
-        
-        # Find all fights after losing the belt
-        post_belt_fights = df[
-            (df['Date'] > lost_belt_date) &
-            ((df['RedFighter'] == champion_name) | (df['BlueFighter'] == champion_name))
-        ].copy()
-        
-        wins = 0
-        losses = 0
-        draws = 0
-        
-        for _, fight in post_belt_fights.iterrows():
-            if fight['RedFighter'] == champion_name:
-                if fight['Winner'] == 'Red':
-                    wins += 1
-                elif fight['Winner'] == 'Blue':
-                    losses += 1
-                else:
-                    draws += 1
-            elif fight['BlueFighter'] == champion_name:
-                if fight['Winner'] == 'Blue':
-                    wins += 1
-                elif fight['Winner'] == 'Red':
-                    losses += 1
-                else:
-                    draws += 1
-        
-        total_fights = wins + losses + draws
+    for champion in calculate_post_reign_records(fight_index, former_champions.values(), workers):
+        wins = champion['wins_after_belt']
+        losses = champion['losses_after_belt']
+        draws = champion['draws_after_belt']
+        total_fights = champion['total_fights_after_belt']
+        lost_belt_date = champion['lost_belt_date']
         win_percentage = round((wins / (wins + losses)) * 100, 1) if (wins + losses) > 0 else 0
         
         # Only include champions who fought after losing their belt
         if total_fights > 0:
             results.append({
-                'name': champion_name,
-                'weight_class': champion_data['weight_class'],
+                'name': champion['name'],
+                'weight_class': champion['weight_class'],
                 'lost_belt_date': lost_belt_date.strftime('%Y-%m-%d'),
-                'lost_to': champion_data['lost_to'],
+                'lost_to': champion['lost_to'],
                 'record_after_belt': f"{wins}-{losses}" + (f"-{draws}" if draws > 0 else ""),
                 'wins_after_belt': wins,
                 'losses_after_belt': losses,
                 'draws_after_belt': draws,
                 'total_fights_after_belt': total_fights,
                 'win_percentage': win_percentage,
-                'title_loss_details': f"Lost {champion_data['weight_class']} title to {champion_data['lost_to']} on {lost_belt_date.strftime('%B %d, %Y')}"
+                'title_loss_details': f"Lost {champion['weight_class']} title to {champion['lost_to']} on {lost_belt_date.strftime('%B %d, %Y')}"
             })
     
     # Sort by win percentage (descending)
@@ -160,7 +107,7 @@ def enhance_with_historical_knowledge(champions_list):
     
     return champions_list
 
-def main():
+def main(workers=1):
     """Main analysis function."""
     print("=== COMPREHENSIVE UFC FORMER CHAMPIONS ANALYSIS ===\n")
     
@@ -171,7 +118,7 @@ def main():
     former_champions = identify_all_former_champions(df)
     
     # Calculate their post-title records
-    champions_with_records = calculate_post_title_records(df, former_champions)
+    champions_with_records = calculate_post_title_records(df, former_champions, workers=workers)
     
     # Enhance with historical knowledge
     final_champions = enhance_with_historical_knowledge(champions_with_records)
@@ -205,4 +152,7 @@ def main():
     return final_champions
 
 if __name__ == "__main__":
-    champions = main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes answering the post-title records (0 = all cores, for batches large enough to pay off)')
+    champions = main(parser.parse_args().workers) 
\ No newline at end of file
@@ -8,6 +8,7 @@ import './App.css';
 ChartJS.register(CategoryScale, LinearScale, BarElement, Title, Tooltip, Legend, ArcElement);
 
 const API_BASE_URL = process.env.NODE_ENV === 'production' ? '/api' : 'http://localhost:5001/api';
+const CHAMPIONS_PAGE_SIZE = 20;
 
 function App() {
   const [activeTab, setActiveTab] = useState('overview');
@@ -42,18 +43,41 @@ function App() {
 
   useEffect(() => {
     if (activeTab === 'performers' && !topPerformers) {
-      fetchData('/fighters/top-performers', setTopPerformers);
+      fetchData('/fighters/top-performers?limit=10', setTopPerformers);
     } else if (activeTab === 'international' && !internationalData) {
       fetchData('/analytics/international', setInternationalData);
     } else if (activeTab === 'events' && !eventsData) {
-      fetchData('/events/analysis', setEventsData);
+      fetchData('/events/analysis?limit=10&fields=title,date,location', setEventsData);
     } else if (activeTab === 'advanced' && !advancedData) {
-      fetchData('/analytics/advanced', setAdvancedData);
+      fetchData('/analytics/advanced?limit=6', setAdvancedData);
     } else if (activeTab === 'former-champions' && !formerChampionsData) {
-      fetchData('/former-champions/analysis', setFormerChampionsData);
+      fetchData(`/former-champions/analysis?limit=${CHAMPIONS_PAGE_SIZE}`, setFormerChampionsData);
     }
   }, [activeTab, topPerformers, internationalData, eventsData, advancedData, formerChampionsData]);
 
+  const loadMoreChampions = async () => {
+    const cursor = formerChampionsData?.pagination?.next_cursor;
+    if (!cursor) return;
+
+    try {
+      setLoading(true);
+      const response = await axios.get(
+        `${API_BASE_URL}/former-champions/analysis?limit=${CHAMPIONS_PAGE_SIZE}&cursor=${encodeURIComponent(cursor)}`
+      );
+      setFormerChampionsData({
+        ...response.data,
+        former_champions: [...formerChampionsData.former_champions, ...response.data.former_champions]
+      });
+      setError(null);
+    } catch (err) {
+      // A reload on the server invalidates the cursor; start again from the first page
+      console.error('Error loading more former champions:', err);
+      await fetchData(`/former-champions/analysis?limit=${CHAMPIONS_PAGE_SIZE}`, setFormerChampionsData);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   const handleSearch = async () => {
     if (!searchQuery.trim()) return;
     
@@ -559,7 +583,7 @@ function App() {
 
         {/* Champions List */}
         <div className="champions-list">
-          <h3>All Former Champions ({champions.length})</h3>
+          <h3>All Former Champions ({champions.length} of {summary?.total_former_champions || champions.length})</h3>
           <div className="fighter-list">
             {champions.map((champion, index) => (
               <div key={index} className="fighter-card champion-card">
@@ -585,6 +609,11 @@ function App() {
               </div>
             ))}
           </div>
+          {formerChampionsData.pagination?.next_cursor && (
+            <button className="load-more-button" onClick={loadMoreChampions} disabled={loading}>
+              {loading ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       </div>
     );
@@ -8,22 +8,27 @@ import json
 from datetime import datetime
 import os
 import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from ufc_data import UFCData
 
 def load_data():
     """Load all relevant UFC data files."""
     data = {}
+    ufc_data = UFCData('data')
     
     # Load medium dataset (seems more reliable for chronological analysis)
-    if os.path.exists('data/medium_dataset.csv'):
+    if ufc_data.exists('medium_dataset'):
         print("Loading medium dataset...")
-        data['fights'] = pd.read_csv('data/medium_dataset.csv')
+        data['fights'] = ufc_data.table('medium_dataset', columns=['event'])
         print(f"Loaded {len(data['fights'])} fights from medium dataset")
     
     # Load events with dates
-    if os.path.exists('data/events.csv'):
+    if ufc_data.exists('events'):
         print("Loading events data...")
-        data['events'] = pd.read_csv('data/events.csv')
-        data['events']['date'] = pd.to_datetime(data['events']['date'])
+        data['events'] = ufc_data.table('events', columns=['title', 'date'])
         print(f"Loaded {len(data['events'])} events")
     
     # Load existing champions records for comparison
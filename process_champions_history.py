@@ -4,15 +4,20 @@ Process complete UFC championship history to identify ALL former champions
 and their verified records after losing their titles.
 """
 
+import argparse
 import json
-import pandas as pd
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from lineage import FightIndex, batch_records_after
+from ufc_data import UFCData
+
 def load_ufc_data():
-    """Load UFC master dataset."""
-    df = pd.read_csv('data/ufc-master.csv')
-    df['Date'] = pd.to_datetime(df['Date'])
-    return df
+    """Load the UFC master dataset columns needed for post-title records."""
+    return UFCData('data').table('ufc_master', columns=['RedFighter', 'BlueFighter', 'Date', 'Winner'])
 
 def get_former_champions_from_history():
     """
@@ -132,38 +137,16 @@ def get_former_champions_from_history():
     
     return former_champions
 
-def calculate_post_title_records(df, former_champions):
+def calculate_post_title_records(df, former_champions, fight_index=None, workers=1):
     """Calculate actual fight records after losing title."""
+    fight_index = fight_index or FightIndex(df)
     results = []
     
-    for champion in former_champions:
+    # Find fights after losing title (spread over `workers` processes when more than one)
+    records = batch_records_after(fight_index, [(c['name'], c['lost_date']) for c in former_champions], workers)
+    
+    for champion, (wins, losses, draws) in zip(former_champions, records):
         name = champion['name']
-        lost_date = pd.to_datetime(champion['lost_date'])
-        
-        # Find fights after losing title
-        post_title_fights = df[
-            (df['Date'] > lost_date) &
-            ((df['RedFighter'] == name) | (df['BlueFighter'] == name))
-        ]
-        
-        wins = losses = draws = 0
-        
-        for _, fight in post_title_fights.iterrows():
-            if fight['RedFighter'] == name:
-                if fight['Winner'] == 'Red':
-                    wins += 1
-                elif fight['Winner'] == 'Blue':
-                    losses += 1
-                else:
-                    draws += 1
-            elif fight['BlueFighter'] == name:
-                if fight['Winner'] == 'Blue':
-                    wins += 1
-                elif fight['Winner'] == 'Red':
-                    losses += 1
-                else:
-                    draws += 1
-        
         total_fights = wins + losses + draws
         
         if total_fights > 0:  # Only include champions who fought after losing title
@@ -190,7 +173,7 @@ def calculate_post_title_records(df, former_champions):
     results.sort(key=lambda x: x['win_percentage'], reverse=True)
     return results
 
-def main():
+def main(workers=1):
     print("Processing complete UFC championship history...")
     
     # Load UFC data
@@ -200,7 +183,7 @@ def main():
     former_champions = get_former_champions_from_history()
     
     # Calculate their post-title records
-    champions_with_records = calculate_post_title_records(df, former_champions)
+    champions_with_records = calculate_post_title_records(df, former_champions, workers=workers)
     
     print(f"Found {len(champions_with_records)} former champions with post-title fights")
     
@@ -218,4 +201,7 @@ def main():
     return champions_with_records
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes answering the post-title records (0 = all cores, for batches large enough to pay off)')
+    main(parser.parse_args().workers) 
\ No newline at end of file
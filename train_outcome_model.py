@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Train the fight outcome model served by /api/predictions/upcoming from ufc-master.csv.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from predictions import HOLDOUT_FRACTION, L2_PENALTY, MODEL_FILE, TRAINING_COLUMNS, train_outcome_model
+from ufc_data import UFCData
+
+def main(data_path='data', holdout_fraction=HOLDOUT_FRACTION, l2=L2_PENALTY):
+    """Train on every decided fight and save the model next to the data."""
+    print("Loading UFC master dataset...")
+    df = UFCData(data_path).table('ufc_master', columns=TRAINING_COLUMNS)
+    print(f"Loaded {len(df)} fights")
+
+    model = train_outcome_model(df, holdout_fraction, l2)
+    metrics = model.metrics
+    if metrics:
+        print(f"Held out the {metrics['holdout_fights']} fights since {metrics['holdout_from']}:")
+        print(f"  accuracy {metrics['accuracy']:.1%}, log loss {metrics['log_loss']:.4f} "
+              f"(odds favourite accuracy {metrics['odds_favourite_accuracy']:.1%})")
+
+    output = os.path.join(data_path, MODEL_FILE)
+    model.save(output)
+    print(f"Trained on {model.training_fights} fights; model saved to '{output}'")
+    return model
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--data', default='data', help='data directory (the model is saved there)')
+    parser.add_argument('--holdout', type=float, default=HOLDOUT_FRACTION,
+                        help='fraction of the most recent fights held out for the reported metrics')
+    parser.add_argument('--l2', type=float, default=L2_PENALTY, help='L2 penalty on the coefficients')
+    args = parser.parse_args()
+    main(args.data, args.holdout, args.l2)